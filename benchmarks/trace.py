@@ -0,0 +1,86 @@
+"""
+Measures how long it takes to trace (and optionally run) very large pipelines.
+
+    python benchmarks/trace.py --components 100000
+    python benchmarks/trace.py --components 100000 --run
+"""
+
+import argparse
+import logging
+import time
+from typing import NamedTuple
+
+import unipipe
+from unipipe import dsl
+
+
+@dsl.component
+def split_name(name: str) -> NamedTuple("Output", first=str, last=str):  # type: ignore
+    names = name.split(" ")
+    return names[0], names[-1]
+
+
+@dsl.component(hardware={"cpus": "1", "memory": "256M"})
+def hello(first_name: str, last_name: str) -> str:
+    return f"Seven blessings, {first_name} of house {last_name}!"
+
+
+@dsl.component
+def count(values: list) -> int:
+    return len(values)
+
+
+def fan_out(components: int):
+    """One component with many readers, which all use attribute access."""
+
+    @dsl.pipeline
+    def pipeline():
+        stark = split_name(name="Ned Stark")
+        greetings = [
+            hello(first_name=stark.first, last_name=stark.last)
+            for _ in range(components - 2)
+        ]
+        return count(values=greetings)
+
+    return pipeline()
+
+
+def chain(components: int):
+    """A long chain, where each component reads the previous one."""
+
+    @dsl.pipeline
+    def pipeline():
+        name = split_name(name="Ned Stark")
+        for _ in range(components - 1):
+            greeting = hello(first_name=name.first, last_name=name.last)
+            name = split_name(name=greeting)
+        return name
+
+    return pipeline()
+
+
+def benchmark(name: str, build, components: int, run: bool) -> None:
+    start = time.perf_counter()
+    pipeline = build(components)
+    elapsed = time.perf_counter() - start
+    per_component = elapsed / len(pipeline.components) * 1e6
+    print(f"{name:>8} trace: {elapsed:8.3f}s ({per_component:.1f} us/component)")
+
+    if run:
+        start = time.perf_counter()
+        unipipe.run(executor="python", pipeline=pipeline)
+        elapsed = time.perf_counter() - start
+        per_component = elapsed / len(pipeline.components) * 1e6
+        print(f"{name:>8}   run: {elapsed:8.3f}s ({per_component:.1f} us/component)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--components", type=int, default=100_000)
+    parser.add_argument("--run", action="store_true")
+    args = parser.parse_args()
+
+    # Component logs would dominate the run times.
+    logging.disable(logging.CRITICAL)
+    benchmark("fan-out", fan_out, args.components, run=args.run)
+    benchmark("chain", chain, args.components // 2, run=args.run)
@@ -20,6 +20,8 @@ def get_version_tag() -> str:
 
 extras_require = {
     "docker": ["docker>=5.0"],
+    "msgpack": ["msgpack>=1.0"],
+    "tables": ["pyarrow>=8.0"],
     "vertex": ["kfp>=1.8", "google-cloud-aiplatform>=1.10"],
     "test": [
         "arrow>=1.2",
@@ -16,7 +16,7 @@ from examples.ex07_nested_pipelines import pipeline as pipeline_07
 from examples.ex08_control_flow import pipeline as pipeline_08
 from examples.ex09_advanced_control_flow import good_pipeline as pipeline_09
 from unipipe import dsl
-from unipipe.backend.kfp import KubeflowPipelinesBackend
+from unipipe.backend.kfp import KubeflowPipelinesBackend, build_table_wrapper_source
 from unipipe.utils.scripts import component_from_script
 
 
@@ -85,3 +85,28 @@ def test_example_11():
         component_fn(["--hello", "kfp-backend"])
 
     _test_build_kfp_pipeline(pipeline_11())
+
+
+DEFAULT_TABLE_SIZE = 4
+
+
+def test_table_components():
+    pa = pytest.importorskip("pyarrow")
+
+    # The default value is a global of this module, so the generated wrapper must
+    # be executed with the globals of the original function.
+    @dsl.component
+    def make_table(size: int = DEFAULT_TABLE_SIZE) -> pa.Table:
+        return pa.table({"x": list(range(size))})
+
+    @dsl.component
+    def table_sum(table: pa.Table) -> int:
+        return sum(table["x"].to_pylist())
+
+    @dsl.pipeline
+    def pipeline():
+        return table_sum(table=make_table())
+
+    source = build_table_wrapper_source(table_sum.__wrapped__)
+    assert "table: Input[Dataset]" in source
+    _test_build_kfp_pipeline(pipeline())
@@ -0,0 +1,90 @@
+import asyncio
+from typing import NamedTuple
+
+import pytest
+
+import unipipe
+from examples.ex01_hello_world import pipeline as pipeline_01
+from examples.ex03_multi_output_components import pipeline as pipeline_03
+from examples.ex07_nested_pipelines import pipeline as pipeline_07
+from examples.ex08_control_flow import pipeline as pipeline_08
+from examples.ex09_advanced_control_flow import bad_pipeline as bad_pipeline_09
+from examples.ex09_advanced_control_flow import good_pipeline as pipeline_09
+from unipipe import dsl
+from unipipe.executor.asynchronous import AsyncExecutor
+
+
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        pipeline_01(),
+        pipeline_03(),
+        pipeline_07(),
+        pipeline_08(),
+        pipeline_09(name="Ned Stark"),
+    ],
+)
+def test_examples(pipeline: dsl.Pipeline):
+    asyncio.run(unipipe.run(pipeline=pipeline, executor="async"))
+
+
+def test_bad_pipeline():
+    with pytest.raises(KeyError):
+        asyncio.run(
+            unipipe.run(pipeline=bad_pipeline_09(name="Ned Stark"), executor="async")
+        )
+
+
+NUM_SIBLINGS = 50
+STARTED = []
+
+
+@dsl.component
+async def _wait_for_siblings(idx: int) -> NamedTuple("Output", idx=int, count=int):  # type: ignore
+    # Times out unless all siblings are awaited concurrently.
+    STARTED.append(idx)
+    for _ in range(100):
+        if len(STARTED) >= NUM_SIBLINGS:
+            break
+        await asyncio.sleep(0.01)
+    return idx, len(STARTED)
+
+
+@dsl.component
+def _total(a: int, b: int) -> int:
+    return a + b
+
+
+@dsl.pipeline
+def _async_pipeline():
+    results = [_wait_for_siblings(idx=i) for i in range(NUM_SIBLINGS)]
+    return _total(a=results[0].count, b=results[-1].idx)
+
+
+def test_concurrent_execution():
+    STARTED.clear()
+    result = asyncio.run(unipipe.run(pipeline=_async_pipeline(), executor="async"))
+    assert result == NUM_SIBLINGS + NUM_SIBLINGS - 1
+
+
+def test_max_workers():
+    STARTED.clear()
+    executor = AsyncExecutor(max_workers=NUM_SIBLINGS // 2)
+    result = asyncio.run(executor.run(_async_pipeline()))
+    # First half of the components are scheduled without waiting on the second half
+    assert result == NUM_SIBLINGS // 2 + NUM_SIBLINGS - 1
+
+
+@dsl.component
+async def _echo(phrase: str) -> str:
+    await asyncio.sleep(0)
+    return phrase
+
+
+def test_python_executor():
+    @dsl.pipeline
+    def pipeline():
+        return _echo(phrase="Winter is coming...")
+
+    result = unipipe.run(pipeline=pipeline(), executor="python")
+    assert result == "Winter is coming..."
@@ -1,8 +1,13 @@
+import json
 import os
+import subprocess
+import sys
 from unittest import mock
 
+import numpy as np
 import pytest
 import torch
+from docker.errors import BuildError, ImageNotFound
 
 import unipipe
 from examples.ex01_hello_world import pipeline as pipeline_01
@@ -15,7 +20,25 @@ from examples.ex07_nested_pipelines import pipeline as pipeline_07
 from examples.ex08_control_flow import pipeline as pipeline_08
 from examples.ex09_advanced_control_flow import bad_pipeline as bad_pipeline_09
 from examples.ex09_advanced_control_flow import good_pipeline as pipeline_09
+from unipipe import dsl
+from unipipe.executor.docker import (
+    BuildOptions,
+    ComponentImage,
+    DockerExecutor,
+    PullPolicy,
+    _buildkit_build,
+    build_dockerfile,
+    get_base_image,
+    get_component_image,
+    get_image_tag,
+    prune_images,
+    read_job_output,
+    write_job,
+)
+from unipipe.utils.cache import ResultCache, get_cache_key
+from unipipe.utils.records import LazyRecord
 from unipipe.utils.scripts import run_script
+from unipipe.utils.serializers import SERIALIZERS, get_serializer
 
 
 @pytest.mark.docker
@@ -67,6 +90,208 @@ def test_example_09():
     unipipe.run(pipeline=pipeline_09(name="Ned Stark"), executor="docker")
 
 
+@pytest.mark.docker
+def test_concurrent_example_09():
+    executor = DockerExecutor(max_workers=4)
+    with pytest.raises(KeyError):
+        unipipe.run(pipeline=bad_pipeline_09(name="Ned Stark"), executor=executor)
+    unipipe.run(pipeline=pipeline_09(name="Ned Stark"), executor=executor)
+
+
+@pytest.mark.docker
+def test_warm_workers():
+    executor = DockerExecutor(warm_workers=True)
+    unipipe.run(pipeline=pipeline_08(), executor=executor)
+    unipipe.run(pipeline=pipeline_09(name="Ned Stark"), executor=executor)
+
+
+def test_image_tag_depends_on_environment():
+    @dsl.component
+    def echo(value: int) -> int:
+        return value
+
+    @dsl.component(packages_to_install=["numpy"])
+    def echo_numpy(value: int) -> int:
+        return value
+
+    @dsl.pipeline
+    def pipeline():
+        return echo(value=1), echo(value=2), echo_numpy(value=3)
+
+    first, second, third = pipeline().components
+    assert get_image_tag(first) == get_image_tag(second)
+    assert get_image_tag(first) != get_image_tag(third)
+    assert get_image_tag(first).startswith("unipipe-component:")
+
+
+def test_base_image_pull_policy():
+    client = mock.MagicMock()
+    assert get_base_image(client, "python:3.9", PullPolicy.IF_NOT_PRESENT)
+    client.images.pull.assert_not_called()
+
+    get_base_image(client, "python:3.9", PullPolicy.ALWAYS)
+    client.images.pull.assert_called_once_with("python", tag="3.9")
+
+    client.images.get.side_effect = ImageNotFound("missing")
+    with pytest.raises(ImageNotFound):
+        get_base_image(client, "python:3.9", PullPolicy.NEVER)
+
+
+def test_dockerfile_layer_order():
+    @dsl.component(packages_to_install=["torch>=1.8"])
+    def echo(value: int) -> int:
+        return value
+
+    @dsl.pipeline
+    def pipeline():
+        return echo(value=1)
+
+    component = pipeline().components[0]
+    wheel = "unipipe-0.0.0-py3-none-any.whl"
+    dockerfile = build_dockerfile(component, wheel=wheel)
+    # Third-party packages are installed before copying 'unipipe', so that changes
+    # to 'unipipe' do not invalidate the package layer.
+    assert dockerfile.index("'torch>=1.8'") < dockerfile.index(f"COPY {wheel}")
+    assert "--mount=type=cache" not in dockerfile
+
+    options = BuildOptions(buildkit=True, wheelhouse="./wheels")
+    dockerfile = build_dockerfile(component, wheel=wheel, options=options)
+    assert "--mount=type=cache,target=/root/.cache/pip" in dockerfile
+    assert "--no-index --find-links" in dockerfile
+
+
+def test_component_image_skips_build():
+    @dsl.component
+    def echo(value: int) -> int:
+        return value
+
+    @dsl.pipeline
+    def pipeline():
+        return echo(value=1)
+
+    component = pipeline().components[0]
+    with mock.patch("unipipe.executor.docker.DockerClient") as client, mock.patch(
+        "unipipe.executor.docker.build_docker_image"
+    ) as build, mock.patch("unipipe.executor.docker.record_image_use"):
+        # Builds are only skipped when asked for.
+        get_component_image(component)
+        build.assert_called_once()
+        build.reset_mock()
+
+        image = get_component_image(component, BuildOptions(skip_builds=True))
+        build.assert_not_called()
+        client.from_env().images.get.assert_called_once_with(component.base_image)
+
+    assert image.tag == component.base_image
+    assert image.environment == {"PYTHONPATH": "/opt/unipipe"}
+
+
+def test_prepare_resolves_each_image_once(tmp_path):
+    @dsl.component
+    def echo(value: int) -> int:
+        return value
+
+    @dsl.component(packages_to_install=["numpy"])
+    def echo_numpy(value: int) -> int:
+        return value
+
+    @dsl.pipeline
+    def pipeline():
+        return echo_numpy(value=echo(value=1))
+
+    pipe = pipeline()
+    first, second = pipe.components
+    cache = ResultCache(root=str(tmp_path))
+    cache.set(get_cache_key(first, {"value": 1}), 1)
+    cache.set(get_cache_key(second, {"value": 1}), 1)
+    executor = DockerExecutor(cache=cache)
+
+    with mock.patch(
+        "unipipe.executor.docker.get_component_image"
+    ) as get_image, mock.patch.object(cache, "get") as get_result:
+        get_image.side_effect = lambda c, options: ComponentImage(tag=c.name)
+        # Cached components with known inputs don't need an image.  Results are
+        # never loaded, so downstream components always get one.
+        executor.prepare(pipe)
+        assert [c.args[0] for c in get_image.call_args_list] == [second]
+        get_result.assert_not_called()
+
+        # Images are only resolved once per run.
+        executor.get_image(second)
+        assert get_image.call_count == 1
+        executor.get_image(first)
+        executor.get_image(first)
+        assert get_image.call_count == 2
+
+
+def test_prune_errors_do_not_hide_run_errors():
+    @dsl.component
+    def echo(value: int) -> int:
+        return value
+
+    @dsl.pipeline
+    def pipeline():
+        return echo(value=1)
+
+    executor = DockerExecutor()
+    with mock.patch.object(executor, "prepare"), mock.patch(
+        "unipipe.executor.docker.build_and_run",
+        side_effect=RuntimeError("component failed"),
+    ), mock.patch(
+        "unipipe.executor.docker.prune_images", side_effect=RuntimeError("no daemon")
+    ), mock.patch.object(
+        executor, "get_image"
+    ):
+        with pytest.raises(RuntimeError, match="component failed"):
+            executor.run(pipeline())
+
+
+def test_buildkit_build_errors(tmp_path):
+    failed = subprocess.CompletedProcess(args=[], returncode=1, stdout="no space left")
+    with mock.patch("subprocess.run", return_value=failed):
+        with pytest.raises(BuildError) as e:
+            _buildkit_build(str(tmp_path), tag="unipipe-component:test", labels={})
+    assert e.value.build_log == [{"stream": "no space left"}]
+
+
+def test_prune_images(tmp_path):
+    index_path = str(tmp_path / "images.json")
+    with open(index_path, "w") as f:
+        json.dump({"unipipe-component:old": 0.0, "unipipe-component:used": 0.0}, f)
+
+    tags = ["unipipe-component:old", "unipipe-component:used", "unipipe-component:new"]
+    with mock.patch(
+        "unipipe.executor.docker._image_index_path", return_value=index_path
+    ), mock.patch("unipipe.executor.docker.DockerClient") as client:
+        client.from_env().images.list.return_value = [mock.Mock(tags=tags)]
+        removed = prune_images(
+            max_images=2, max_age_days=1, keep=["unipipe-component:used"]
+        )
+
+    # Images used by the current run are never removed, and images missing from
+    # the index are treated as just used (they are not old).
+    assert removed == ["unipipe-component:old"]
+    with open(index_path, "r") as f:
+        assert set(json.load(f)) == set(tags[1:])
+
+
+@pytest.mark.parametrize("serializer", list(SERIALIZERS.keys()))
+def test_job_serializers(tmp_path, serializer: str):
+    # Run the generated script on the host, in place of a container.
+    pipeline = pipeline_04(name="Ned Stark")
+    component = pipeline.components[0]
+    _serializer = get_serializer(serializer)
+    job_dir = str(tmp_path)
+    write_job(job_dir, component, component.inputs, _serializer, container_dir=job_dir)
+    root = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)
+    subprocess.run(
+        [sys.executable, os.path.join(job_dir, "main.py")],
+        env={**os.environ, "PYTHONPATH": os.path.abspath(root)},
+        check=True,
+    )
+    assert list(read_job_output(job_dir, _serializer)) == ["Ned", "Stark"]
+
+
 @pytest.mark.docker
 def test_example_11():
     # This will fail, because it doesn't have any PyPI credentials as ENV variables.
@@ -86,3 +311,82 @@ def test_example_11():
             args=["--hello", "world"],
             executor="docker",
         )
+
+
+@dsl.component
+def _identity_array(array: np.ndarray) -> np.ndarray:
+    return array
+
+
+@dsl.component
+def _split_array(array: np.ndarray) -> list:
+    return [array[:2], array[2:4]]
+
+
+def _run_array_job(tmp_path, component: dsl.Component, array):
+    serializer = get_serializer()
+    job_dir, arrays_dir = str(tmp_path / "job"), str(tmp_path / "arrays")
+    os.makedirs(job_dir, exist_ok=True)
+    os.makedirs(arrays_dir, exist_ok=True)
+    write_job(
+        job_dir,
+        component,
+        {"array": array},
+        serializer,
+        container_dir=job_dir,
+        arrays_dir=arrays_dir,
+        container_arrays_dir=arrays_dir,
+    )
+    root = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)
+    subprocess.run(
+        [sys.executable, os.path.join(job_dir, "main.py")],
+        env={**os.environ, "PYTHONPATH": os.path.abspath(root)},
+        check=True,
+    )
+    return read_job_output(job_dir, serializer, arrays_dir=arrays_dir)
+
+
+def test_job_arrays(tmp_path):
+    arrays_dir = tmp_path / "arrays"
+    # Memory-mapped arrays that are passed through are not written again.
+    array = _run_array_job(
+        tmp_path, _identity_array(array=np.zeros(0)), np.arange(10.0)
+    )
+    array = _run_array_job(tmp_path, _identity_array(array=np.zeros(0)), array)
+    assert isinstance(array, np.memmap)
+    assert len(os.listdir(arrays_dir)) == 1
+
+    # Slices of memory-mapped arrays are written to new files.
+    first, second = _run_array_job(tmp_path, _split_array(array=np.zeros(0)), array)
+    np.testing.assert_array_equal(first, [0.0, 1.0])
+    np.testing.assert_array_equal(second, [2.0, 3.0])
+    assert len(os.listdir(arrays_dir)) == 3
+
+
+def test_job_records(tmp_path):
+    # Multi-output results are written one field per file, and loaded lazily.
+    pipeline = pipeline_04(name="Ned Stark")
+    component = pipeline.components[0]
+    serializer = get_serializer()
+    job_dir, arrays_dir = str(tmp_path / "job"), str(tmp_path / "arrays")
+    os.makedirs(job_dir)
+    os.makedirs(arrays_dir)
+    write_job(
+        job_dir,
+        component,
+        component.inputs,
+        serializer,
+        container_dir=job_dir,
+        arrays_dir=arrays_dir,
+        container_arrays_dir=arrays_dir,
+    )
+    root = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)
+    subprocess.run(
+        [sys.executable, os.path.join(job_dir, "main.py")],
+        env={**os.environ, "PYTHONPATH": os.path.abspath(root)},
+        check=True,
+    )
+    record = read_job_output(job_dir, serializer, arrays_dir=arrays_dir)
+    assert isinstance(record, LazyRecord)
+    assert record.last == "Stark"
+    assert list(record) == ["Ned", "Stark"]
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+import unipipe
+from examples.ex01_hello_world import pipeline as pipeline_01
+from examples.ex02_hello_pipeline import pipeline as pipeline_02
+from examples.ex03_multi_output_components import pipeline as pipeline_03
+from examples.ex04_pipeline_arguments import pipeline as pipeline_04
+from examples.ex07_nested_pipelines import pipeline as pipeline_07
+from examples.ex08_control_flow import pipeline as pipeline_08
+from examples.ex09_advanced_control_flow import bad_pipeline as bad_pipeline_09
+from examples.ex09_advanced_control_flow import good_pipeline as pipeline_09
+from unipipe import dsl
+from unipipe.executor.multiprocess import FunctionReference, MultiprocessExecutor
+
+
+def test_example_01():
+    unipipe.run(pipeline=pipeline_01(), executor="multiprocess")
+
+
+def test_example_02():
+    unipipe.run(pipeline=pipeline_02(), executor="multiprocess")
+
+
+def test_example_03():
+    unipipe.run(pipeline=pipeline_03(), executor="multiprocess")
+
+
+def test_example_04():
+    unipipe.run(pipeline=pipeline_04(name="Tyrion Lannister"), executor="multiprocess")
+
+
+def test_example_07():
+    unipipe.run(pipeline=pipeline_07(), executor="multiprocess")
+
+
+def test_example_08():
+    unipipe.run(pipeline=pipeline_08(), executor="multiprocess")
+
+
+def test_example_09():
+    with pytest.raises(KeyError):
+        unipipe.run(pipeline=bad_pipeline_09(name="Ned Stark"), executor="multiprocess")
+    unipipe.run(pipeline=pipeline_09(name="Ned Stark"), executor="multiprocess")
+
+
+@dsl.component
+def _get_pid(idx: int) -> int:
+    return os.getpid()
+
+
+@dsl.pipeline
+def _pid_pipeline():
+    pids = [_get_pid(idx=i) for i in range(2)]
+    return pids[0], pids[1]
+
+
+def test_runs_in_worker_processes():
+    executor = MultiprocessExecutor(max_workers=2)
+    pids = unipipe.run(pipeline=_pid_pipeline(), executor=executor)
+    assert os.getpid() not in pids
+
+
+def test_function_reference():
+    # Functions wrapped by 'dsl.component' resolve to the original function.
+    component = _get_pid(idx=0)
+    reference = FunctionReference.from_func(component.func)
+    assert reference.resolve() is _get_pid.__wrapped__
+
+    # Operators are resolved from their 'MultipleDispatch' registry.
+    component = component + 1
+    reference = FunctionReference.from_func(component.func)
+    assert reference.dispatch_idx is not None
+
+    def local_function(a: int) -> int:
+        return a
+
+    with pytest.raises(TypeError):
+        FunctionReference.from_func(local_function)
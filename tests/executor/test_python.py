@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from typing import NamedTuple
 from unittest import mock
 
 import pytest
@@ -10,11 +13,17 @@ from examples.ex03_multi_output_components import pipeline as pipeline_03
 from examples.ex04_pipeline_arguments import pipeline as pipeline_04
 from examples.ex05_dependency_management import pipeline as pipeline_05
 from examples.ex06_hardware_specs import pipeline as pipeline_06
+from examples.ex07_nested_pipelines import echo, hello
 from examples.ex07_nested_pipelines import pipeline as pipeline_07
+from examples.ex07_nested_pipelines import split_name
 from examples.ex08_control_flow import pipeline as pipeline_08
 from examples.ex09_advanced_control_flow import bad_pipeline as bad_pipeline_09
 from examples.ex09_advanced_control_flow import good_pipeline as pipeline_09
+from unipipe import dsl
+from unipipe.executor.python import PythonExecutor
+from unipipe.utils.records import LazyRecord
 from unipipe.utils.scripts import run_script
+from unipipe.utils.spill import Spiller, SpillingLocals
 
 
 def test_example_01():
@@ -66,3 +75,306 @@ def test_example_11():
     mock_pypi_credentials = {"PYPI_USERNAME": "user", "PYPI_PASSWORD": "pass"}
     with mock.patch.dict(os.environ, mock_pypi_credentials):
         run_script("./examples/ex11_using_scripts.py", args=["--hello", "world"])
+
+
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        pipeline_01(),
+        pipeline_02(),
+        pipeline_03(),
+        pipeline_04(name="Tyrion Lannister"),
+        pipeline_07(),
+        pipeline_08(),
+        pipeline_09(name="Ned Stark"),
+    ],
+)
+def test_concurrent_examples(pipeline: dsl.Pipeline):
+    unipipe.run(pipeline=pipeline, executor=PythonExecutor(max_workers=4))
+
+
+def test_concurrent_bad_pipeline():
+    with pytest.raises(KeyError):
+        unipipe.run(
+            pipeline=bad_pipeline_09(name="Ned Stark"),
+            executor=PythonExecutor(max_workers=4),
+        )
+
+
+BARRIER = threading.Barrier(3, timeout=5.0)
+
+
+@dsl.component
+def _wait_for_siblings(name: str) -> str:
+    # Raises 'BrokenBarrierError' unless all three siblings run concurrently.
+    BARRIER.wait()
+    return name
+
+
+@dsl.component
+def _join(a: str, b: str, c: str) -> NamedTuple("Output", joined=str, count=int):  # type: ignore
+    return " ".join([a, b, c]), 3
+
+
+@dsl.pipeline
+def _concurrent_pipeline():
+    names = [_wait_for_siblings(name=name) for name in ["Jon", "Arya", "Bran"]]
+    joined = _join(a=names[0], b=names[1], c=names[2])
+    return joined.joined
+
+
+def test_concurrent_execution():
+    BARRIER.reset()
+    result = unipipe.run(
+        pipeline=_concurrent_pipeline(), executor=PythonExecutor(max_workers=3)
+    )
+    assert result == "Jon Arya Bran"
+
+
+RUNNING = []
+MAX_RUNNING = []
+LOCK = threading.Lock()
+
+
+def _track_running(name: str) -> str:
+    with LOCK:
+        RUNNING.append(name)
+        MAX_RUNNING.append(len(RUNNING))
+    time.sleep(0.05)
+    with LOCK:
+        RUNNING.remove(name)
+    return name
+
+
+_big_component = dsl.component(_track_running, hardware=dsl.Hardware(cpus=4))
+_small_component = dsl.component(_track_running, hardware=dsl.Hardware(cpus=1))
+
+
+@pytest.mark.parametrize(
+    "component, max_running",
+    [(_big_component, 1), (_small_component, 4)],
+)
+def test_resource_limited_execution(component, max_running: int):
+    @dsl.pipeline
+    def pipeline():
+        for i in range(8):
+            component(name=str(i))
+
+    MAX_RUNNING.clear()
+    executor = PythonExecutor(max_workers=8, resources=dsl.Hardware(cpus=4))
+    unipipe.run(pipeline=pipeline(), executor=executor)
+    assert max(MAX_RUNNING) == max_running
+
+
+@dsl.component
+def _write_artifact(text: str) -> dsl.Artifact:
+    path = dsl.new_artifact_path("text.txt")
+    with open(path, "w") as f:
+        f.write(text)
+    return dsl.Artifact(path)
+
+
+@dsl.component
+def _read_artifact(path: dsl.Artifact) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+@dsl.component
+def _artifact_paths(
+    first: dsl.Artifact, second: dsl.Artifact
+) -> NamedTuple("Output", first=dsl.Artifact, second=str):  # type: ignore
+    return first, second
+
+
+def test_artifacts(tmp_path):
+    @dsl.pipeline
+    def pipeline():
+        first = _write_artifact(text="hello")
+        second = _write_artifact(text="hello")
+        paths = _artifact_paths(first=first, second=second)
+        return _read_artifact(path=first), paths
+
+    pipeline_root = str(tmp_path / "root")
+    text, (first, second) = unipipe.run(
+        executor="python", pipeline=pipeline(), pipeline_root=pipeline_root
+    )
+    assert text == "hello"
+    # Identical artifacts are stored once, in a content-addressed directory.
+    assert first == second
+    assert first.startswith(os.path.join(pipeline_root, "artifacts"))
+    assert os.listdir(os.path.join(pipeline_root, "scratch")) == []
+    # Run journals are opt-in.
+    assert not os.path.exists(os.path.join(pipeline_root, "runs"))
+
+
+RESUME_CALLS = []
+FAILURES = []
+
+
+@dsl.component
+def _count_call(name: str) -> str:
+    RESUME_CALLS.append(name)
+    return name
+
+
+@dsl.component
+def _fail_once(name: str) -> str:
+    if not FAILURES:
+        FAILURES.append(name)
+        raise RuntimeError("Failing on the first try.")
+    return name.upper()
+
+
+def test_resume(tmp_path):
+    @dsl.pipeline
+    def pipeline():
+        return _fail_once(name=_count_call(name="ned"))
+
+    executor = PythonExecutor()
+    with pytest.raises(RuntimeError):
+        executor.run(pipeline(), pipeline_root=str(tmp_path), journal=True)
+    run_id = executor.run_id
+    assert RESUME_CALLS == ["ned"]
+
+    # Finished components are replayed from the journal, not run again.
+    result = executor.run(pipeline(), pipeline_root=str(tmp_path), resume=run_id)
+    assert result == "NED"
+    assert RESUME_CALLS == ["ned"]
+
+    with pytest.raises(ValueError):
+        executor.run(pipeline(), resume=run_id)
+    with pytest.raises(ValueError):
+        executor.run(pipeline(), journal=True)
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_free_results(max_workers):
+    @dsl.pipeline
+    def pipeline():
+        first, last = split_name(name="Tyrion Lannister")
+        stark = split_name(name="Ned Stark")
+        return hello(first_name=first, last_name=stark.last)
+
+    pipe = pipeline()
+    tyrion, stark, greeting = pipe.components
+    executor = PythonExecutor(max_workers=max_workers, pinned=[stark])
+    if max_workers is None:
+        _, _locals = executor.run_pipeline_with_locals(pipe, _locals={})
+    else:
+        _, _locals = executor.run_pipeline_concurrently(pipe, _locals={})
+    # Intermediate results are released once their last reader has finished.
+    assert set(_locals) == {stark.name, greeting.name}
+
+    executor = PythonExecutor(max_workers=max_workers, free_results=False)
+    _, _locals = executor.run_pipeline_with_locals(pipeline(), _locals={})
+    assert len(_locals) == 3
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_memory_budget(max_workers):
+    @dsl.pipeline
+    def pipeline():
+        first, last = split_name(name="Tyrion Lannister")
+        stark = split_name(name="Ned Stark")
+        return hello(first_name=first, last_name=stark.last)
+
+    # All intermediate results are spilled to disk, and loaded again when read.
+    executor = PythonExecutor(max_workers=max_workers, memory_budget=1)
+    result = executor.run(pipeline())
+    assert result == "Seven blessings, Tyrion of house Stark!"
+
+
+class _RecordExecutor(PythonExecutor):
+    """Returns multi-output results as 'LazyRecord', like 'DockerExecutor'."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loaded: list = []
+
+    def run_component(self, component: dsl.Component, **kwargs):
+        result = super().run_component(component, **kwargs)
+        if not hasattr(result, "_fields"):
+            return result
+
+        values = result._asdict()
+
+        def load(name: str):
+            self.loaded.append(name)
+            return values[name]
+
+        record = LazyRecord(result._fields, load=load)
+        return self.check_return_type(component, record)
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_memory_budget_lazy_records(max_workers):
+    @dsl.pipeline
+    def pipeline():
+        first, last = split_name(name="Tyrion Lannister")
+        stark = split_name(name="Ned Stark")
+        return hello(first_name=first, last_name=stark.last)
+
+    # Records are already on disk, so they're never spilled (which would load all
+    # of their fields).
+    executor = _RecordExecutor(max_workers=max_workers, memory_budget=1)
+    result = executor.run(pipeline())
+    assert result == "Seven blessings, Tyrion of house Stark!"
+    assert sorted(executor.loaded) == ["first", "last"]
+
+
+def test_nested_pipeline_scopes():
+    @dsl.pipeline
+    def nested(name: str):
+        first, last = split_name(name=name)
+        return hello(first_name=first, last_name=last)
+
+    @dsl.pipeline
+    def pipeline():
+        stark = split_name(name="Ned Stark")
+        return nested(name=stark.first + " Lannister")
+
+    # Results of the nested pipeline are written to its own scope.
+    pipe = pipeline()
+    _locals: dict = {}
+    executor = PythonExecutor(free_results=False)
+    result, _ = executor.run_pipeline_with_locals(pipe, _locals=_locals)
+    assert result == "Seven blessings, Ned of house Lannister!"
+    assert set(_locals) == {c.name for c in pipe.components}
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_nested_pipeline_scopes_are_released(tmp_path, max_workers):
+    @dsl.pipeline
+    def nested(name: str):
+        first, last = split_name(name=name)
+        return hello(first_name=first, last_name=last)
+
+    @dsl.pipeline
+    def pipeline():
+        return nested(name="Ned Stark")
+
+    spiller = Spiller(budget=2**30, directory=str(tmp_path))
+    _locals = SpillingLocals({}, spiller=spiller)
+    executor = PythonExecutor(max_workers=max_workers, free_results=False)
+    if max_workers is None:
+        executor.run_pipeline_with_locals(pipeline(), _locals=_locals)
+    else:
+        executor.run_pipeline_concurrently(pipeline(), _locals=_locals)
+    # Results of the nested pipeline are no longer counted once it has finished.
+    assert {key[0] for key in spiller._entries} == {id(_locals)}
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_unpack_nested_pipeline(max_workers):
+    @dsl.pipeline
+    def nested(first: str, last: str):
+        return echo(phrase=first), echo(phrase=last)
+
+    @dsl.pipeline
+    def pipeline():
+        first, last = nested(first="Ned", last="Stark")
+        return echo(phrase=first + " " + last)
+
+    executor = PythonExecutor(max_workers=max_workers)
+    assert executor.run(pipeline()) == "Ned Stark"
@@ -30,3 +30,23 @@ def test_greet_cli():
         )
         assert result.exit_code == 0
         assert "Hello, Vertex!" in result.output
+
+
+def test_build_images_cli():
+    runner = CliRunner()
+    local_dir = os.path.abspath(os.path.dirname(__file__))
+    example_path = os.path.join(
+        local_dir, os.pardir, "examples", "ex04_pipeline_arguments.py"
+    )
+
+    report = {"unipipe-component:0123456789abcdef": 1.5}
+    with mock.patch(
+        "unipipe.executor.docker.DockerExecutor.prepare", return_value=report
+    ) as prepare:
+        result = runner.invoke(
+            unipipe,
+            ["build-images", f"{example_path}:pipeline", "--arg", "name=Ned Stark"],
+        )
+    assert result.exit_code == 0
+    assert prepare.call_count == 1
+    assert "unipipe-component:0123456789abcdef" in result.output
@@ -69,3 +69,24 @@ def test_component_init():
 
 def test_pipeline_init():
     _ = pipeline()
+
+
+def test_lightweight_components():
+    split = split_name(name="Ned Stark")
+    other = split_name(name="Arya Stark")
+    # Components have no '__dict__', and share parsed hardware specs.
+    assert not hasattr(split, "__dict__")
+    assert split.hardware is other.hardware
+    assert split.name == other.name == "split-name"
+
+    motto, other_motto = lannister_house_motto(), lannister_house_motto()
+    assert motto.name != other_motto.name
+    assert motto.func() == "A Lannister always pays their debts..."
+
+    first = split.first
+    assert isinstance(first, dsl.LazyAttribute)
+    assert (first.parent, first.key) == (split, "first")
+    assert not isinstance(split, dsl.LazyAttribute)
+    assert isinstance(first + " Stark", dsl.Component)
+    # Type checking the inputs of other components doesn't wrap the function.
+    assert split._wrapped_func is None
@@ -0,0 +1,66 @@
+from collections import ChainMap
+from typing import List
+
+from examples.ex07_nested_pipelines import split_name
+from unipipe import dsl
+from unipipe.utils.accessors import (
+    compile_accessor,
+    get_input_accessors,
+    resolve_inputs,
+)
+
+
+@dsl.component
+def _count(names: List[str]) -> int:
+    return len(names)
+
+
+def test_compile_accessor():
+    @dsl.pipeline
+    def pipeline():
+        tyrion = split_name(name="Tyrion Lannister")
+        stark = split_name(name="Ned Stark")
+        return _count(names=[tyrion.first, stark.last])
+
+    pipe = pipeline()
+    tyrion, stark, count = pipe.components
+    Output = tyrion.return_type
+    _locals = {
+        tyrion.name: Output("Tyrion", "Lannister"),
+        stark.name: Output("Ned", "Stark"),
+    }
+    assert compile_accessor(tyrion)(_locals) == ("Tyrion", "Lannister")
+    assert compile_accessor(stark.last)(_locals) == "Stark"
+    assert resolve_inputs(count, _locals) == {"names": ("Tyrion", "Stark")}
+    # Nested pipelines resolve values from chained scopes.
+    assert compile_accessor(tyrion.first)(ChainMap({}, _locals)) == "Tyrion"
+    # Inputs are only compiled once for each component.
+    assert get_input_accessors(count) is get_input_accessors(count)
+
+
+def test_constant_inputs_are_not_copied():
+    names = ["Tyrion", "Ned"]
+
+    @dsl.pipeline
+    def pipeline():
+        return _count(names=names)
+
+    (count,) = pipeline().components
+    assert resolve_inputs(count, {})["names"] is names
+
+
+def test_compile_accessor_for_nested_pipeline_items():
+    @dsl.pipeline
+    def nested(name: str):
+        split = split_name(name=name)
+        return split.first, split.last
+
+    @dsl.pipeline
+    def pipeline():
+        first, last = nested(name="Ned Stark")
+        return _count(names=[first, last])
+
+    inner, count = pipeline().components
+    # Items are resolved through the nested pipeline's result, in the parent scope.
+    _locals = {inner.name: ("Ned", "Stark")}
+    assert resolve_inputs(count, _locals) == {"names": ("Ned", "Stark")}
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import unipipe
+from unipipe import dsl
+from unipipe.utils.arrays import decode_arrays, encode_arrays
+
+np = pytest.importorskip("numpy")
+
+
+def test_encode_and_decode_arrays(tmp_path):
+    directory = str(tmp_path)
+    value = {"array": np.arange(6.0).reshape(2, 3), "other": (1, "two")}
+    encoded = encode_arrays(value, directory)
+    assert len(os.listdir(directory)) == 1
+
+    decoded = decode_arrays(encoded, directory)
+    assert isinstance(decoded["array"], np.memmap)
+    np.testing.assert_array_equal(decoded["array"], value["array"])
+    assert decoded["other"] == (1, "two")
+
+    # Memory-mapped arrays from the same directory are not written again.
+    encode_arrays(decoded, directory)
+    assert len(os.listdir(directory)) == 1
+
+
+def test_encode_array_views(tmp_path):
+    directory = str(tmp_path)
+    array = decode_arrays(encode_arrays(np.arange(10.0), directory), directory)
+
+    # Views of memory-mapped arrays are written to new files, instead of referencing
+    # the file of the whole array.
+    views = [array[:2], array[2:4], array[::2], array.reshape(2, 5).T]
+    decoded = decode_arrays(encode_arrays(views, directory), directory)
+    for view, value in zip(views, decoded):
+        np.testing.assert_array_equal(value, view)
+    assert len(os.listdir(directory)) == 1 + len(views)
+
+
+@dsl.component
+def make_array(size: int) -> np.ndarray:
+    return np.ones(size)
+
+
+@dsl.component
+def array_sum(array: np.ndarray) -> float:
+    return float(array.sum())
+
+
+def test_array_components():
+    @dsl.pipeline
+    def pipeline():
+        return array_sum(array=make_array(size=5))
+
+    assert unipipe.run(executor="python", pipeline=pipeline()) == 5.0
@@ -0,0 +1,89 @@
+import os
+from typing import Dict, NamedTuple
+
+import pytest
+
+from unipipe.utils.artifacts import Artifact, ArtifactStore, get_artifact_digest
+from unipipe.utils.records import LazyRecord
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_artifact_digest(tmp_path):
+    _write(tmp_path / "a.txt", "hello")
+    _write(tmp_path / "b.txt", "hello")
+    assert get_artifact_digest(str(tmp_path / "a.txt")) == get_artifact_digest(
+        str(tmp_path / "b.txt")
+    )
+
+    os.makedirs(tmp_path / "dir" / "sub")
+    _write(tmp_path / "dir" / "sub" / "x.txt", "x")
+    digest = get_artifact_digest(str(tmp_path / "dir"))
+    _write(tmp_path / "dir" / "sub" / "x.txt", "y")
+    assert get_artifact_digest(str(tmp_path / "dir")) != digest
+
+
+def test_artifact_store(tmp_path):
+    store = ArtifactStore(str(tmp_path / "root"))
+
+    # Artifacts in the scratch directory are moved into the store.
+    scratch = os.path.join(store.scratch_dir, "data.txt")
+    _write(scratch, "data")
+    stored = store.put(scratch)
+    assert not os.path.exists(scratch)
+    assert stored.startswith(store.artifacts_dir)
+    assert os.path.basename(stored) == "data.txt"
+
+    # Identical artifacts are deduplicated.
+    _write(scratch, "data")
+    assert store.put(scratch) == stored
+    assert not os.path.exists(scratch)
+    assert len(os.listdir(store.artifacts_dir)) == 1
+
+    # Anything outside of the scratch directory is copied.
+    os.makedirs(tmp_path / "dataset")
+    _write(tmp_path / "dataset" / "part-0.csv", "a,b")
+    stored_dir = store.put(str(tmp_path / "dataset"))
+    assert os.path.exists(tmp_path / "dataset")
+    assert os.listdir(stored_dir) == ["part-0.csv"]
+    assert store.put(stored_dir) == stored_dir
+
+    with pytest.raises(FileNotFoundError):
+        store.put(str(tmp_path / "missing.txt"))
+
+    store.cleanup()
+    assert not os.path.exists(store.scratch_dir)
+
+
+class Outputs(NamedTuple):
+    data: Artifact
+    metrics: Dict[str, float]
+
+
+def test_store_outputs(tmp_path):
+    store = ArtifactStore(str(tmp_path / "root"))
+    scratch = os.path.join(store.scratch_dir, "data.txt")
+    _write(scratch, "data")
+
+    outputs = store.store_outputs(Outputs(Artifact(scratch), {"loss": 0.1}), Outputs)
+    assert isinstance(outputs, Outputs)
+    assert outputs.data.startswith(store.artifacts_dir)
+    assert outputs.metrics == {"loss": 0.1}
+
+    # Only artifact fields of lazy records are loaded.
+    _write(scratch, "data")
+    values = {"data": Artifact(scratch), "metrics": {"loss": 0.1}}
+    loaded = []
+
+    def load(name: str):
+        loaded.append(name)
+        return values[name]
+
+    record = store.store_outputs(LazyRecord(Outputs._fields, load=load), Outputs)
+    assert isinstance(record, LazyRecord)
+    assert loaded == ["data"]
+    assert record.data == outputs.data
+    assert record.metrics == {"loss": 0.1}
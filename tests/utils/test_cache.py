@@ -0,0 +1,86 @@
+import os
+from typing import NamedTuple
+from unittest import mock
+
+import unipipe
+from examples.ex07_nested_pipelines import hello
+from unipipe import dsl
+from unipipe.executor.python import PythonExecutor
+from unipipe.utils.cache import MISSING, ResultCache, get_cache_key
+
+CALLS = []
+
+
+@dsl.component
+def _split_name(name: str) -> NamedTuple("Output", first=str, last=str):  # type: ignore
+    CALLS.append(name)
+    names = name.split(" ")
+    return names[0], names[-1]
+
+
+def test_get_cache_key():
+    split = _split_name(name="Tyrion Lannister")
+    key = get_cache_key(split, {"name": "Tyrion Lannister"})
+    assert key == get_cache_key(split, {"name": "Tyrion Lannister"})
+    assert key != get_cache_key(split, {"name": "Ned Stark"})
+
+    other = dsl.component(_split_name.__wrapped__, packages_to_install=["requests"])
+    assert key != get_cache_key(other(name="Tyrion Lannister"), split.inputs)
+
+
+def test_result_cache(tmp_path):
+    cache = ResultCache(root=str(tmp_path), max_size=None)
+    assert cache.get("key") is MISSING
+    cache.set("key", ("Tyrion", "Lannister"))
+    assert cache.get("key") == ("Tyrion", "Lannister")
+    cache.set("none", None)
+    assert cache.get("none") is None
+
+    cache.clear()
+    assert cache.get("key") is MISSING
+
+
+def test_result_cache_eviction(tmp_path):
+    cache = ResultCache(root=str(tmp_path), max_size="3K")
+    for i in range(3):
+        cache.set(f"key-{i}", "x" * 800)
+        # Make sure that access times are distinguishable
+        os.utime(os.path.join(tmp_path, f"key-{i}.pkl"), (i, i))
+
+    # Access the oldest entry, so that 'key-1' is now the least recently used.
+    assert cache.get("key-0") is not MISSING
+    cache.set("key-3", "x" * 800)
+    assert cache.get("key-1") is MISSING
+    assert all(cache.get(f"key-{i}") is not MISSING for i in [0, 2, 3])
+
+
+@dsl.pipeline
+def _pipeline():
+    first, last = _split_name(name="Tyrion Lannister")
+    return hello(first_name=first, last_name=last)
+
+
+def test_executor_cache(tmp_path):
+    CALLS.clear()
+    cache = ResultCache(root=str(tmp_path))
+    for executor in [
+        PythonExecutor(cache=cache),
+        PythonExecutor(cache=cache),
+        PythonExecutor(max_workers=2, cache=cache),
+    ]:
+        result = unipipe.run(pipeline=_pipeline(), executor=executor)
+        assert result == "Seven blessings, Tyrion of house Lannister!"
+
+    assert CALLS == ["Tyrion Lannister"]
+
+
+def test_cache_key_computed_once(tmp_path):
+    cache = ResultCache(root=str(tmp_path))
+    for max_workers in [None, 2]:
+        executor = PythonExecutor(max_workers=max_workers, cache=cache)
+        with mock.patch(
+            "unipipe.executor.base.get_cache_key", wraps=get_cache_key
+        ) as get_key:
+            unipipe.run(pipeline=_pipeline(), executor=executor)
+        # Once per component, for both reading and writing the cache.
+        assert get_key.call_count == 2
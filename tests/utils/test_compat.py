@@ -0,0 +1,36 @@
+import ast
+
+import pytest
+
+from unipipe.utils.compat import get_source_segment
+
+SOURCE = """
+def func(
+    a: Dict[str, int], b: int = max(1, 2), *, c=lambda x: x, d: str = {"k": "é"}
+) -> Tuple[int, str]:
+    return a
+"""
+
+
+@pytest.mark.parametrize("end_positions", [True, False])
+def test_get_source_segment(end_positions: bool):
+    node = ast.parse(SOURCE).body[0]
+    assert isinstance(node, ast.FunctionDef)
+    if not end_positions:
+        # Like Python 3.7, which doesn't record the end positions of nodes.
+        for child in ast.walk(node):
+            child.end_lineno = None  # type: ignore
+
+    args = node.args
+    assert [get_source_segment(SOURCE, a) for a in args.args] == [
+        "a: Dict[str, int]",
+        "b: int",
+    ]
+    assert [get_source_segment(SOURCE, a) for a in args.kwonlyargs] == ["c", "d: str"]
+    defaults = [*args.defaults, *args.kw_defaults]
+    assert [get_source_segment(SOURCE, d) for d in defaults if d is not None] == [
+        "max(1, 2)",
+        "lambda x: x",
+        '{"k": "é"}',
+    ]
+    assert get_source_segment(SOURCE, node.returns) == "Tuple[int, str]"
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from unipipe.utils.files import atomic_write
+
+
+def test_atomic_write(tmp_path):
+    path = os.path.join(tmp_path, "data.txt")
+    with atomic_write(path, mode="w") as f:
+        f.write("hello")
+        # Nothing is visible at 'path' until the write finishes.
+        assert not os.path.exists(path)
+    with open(path) as f:
+        assert f.read() == "hello"
+    assert os.listdir(tmp_path) == ["data.txt"]
+
+
+def test_atomic_write_errors(tmp_path):
+    path = os.path.join(tmp_path, "data.bin")
+    with atomic_write(path) as f:
+        f.write(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write(b"new")
+            raise RuntimeError("failed")
+    # The original file is unchanged, and the temporary file is removed.
+    with open(path, "rb") as f:
+        assert f.read() == b"old"
+    assert os.listdir(tmp_path) == ["data.bin"]
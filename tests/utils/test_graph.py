@@ -0,0 +1,79 @@
+from examples.ex07_nested_pipelines import echo, hello, split_name
+from unipipe import dsl
+from unipipe.utils.graph import Liveness, get_dependencies, get_external_references
+
+
+@dsl.pipeline
+def _nested_pipeline(phrase: str) -> str:
+    return echo(phrase=phrase)
+
+
+@dsl.pipeline
+def _pipeline():
+    first, last = split_name(name="Tyrion Lannister")
+    stark = split_name(name="Ned Stark")
+    hello(first_name=first, last_name=stark.last)
+    echoed = _nested_pipeline(phrase=last)
+    with dsl.equal(stark.last, "Stark"):
+        echo(phrase=echoed)
+
+
+def test_get_external_references():
+    pipeline = _pipeline()
+    tyrion, stark, greeting, nested, conditional = pipeline.components
+
+    assert get_external_references(tyrion) == set()
+    assert get_external_references(greeting) == {tyrion.name, stark.name}
+    assert get_external_references(nested) == {tyrion.name}
+    # Nested pipelines are referenced by name, or by their return values.
+    nested_echo = nested.components[0]
+    assert get_external_references(conditional) == {
+        stark.name,
+        nested.name,
+        nested_echo.name,
+    }
+
+
+def test_get_dependencies():
+    pipeline = _pipeline()
+    assert get_dependencies(pipeline.components) == [
+        set(),
+        set(),
+        {0, 1},
+        {0},
+        {1, 3},
+    ]
+
+
+def test_get_dependencies_with_repeated_names():
+    named_split = dsl.component(split_name.__wrapped__, name="split-name")
+
+    @dsl.pipeline
+    def pipeline():
+        first, _ = named_split(name="Tyrion Lannister")
+        echo(phrase=first)
+        named_split(name="Ned Stark")
+
+    # The second 'split-name' overwrites the first, so it must wait for all readers.
+    assert get_dependencies(pipeline().components) == [set(), {0}, {0, 1}]
+
+
+def test_liveness():
+    pipeline = _pipeline()
+    tyrion, stark, greeting, nested, conditional = pipeline.components
+    liveness = Liveness(pipeline)
+    assert liveness.finish(0) == set()
+    assert liveness.finish(1) == set()
+    # Nothing reads the greeting, so it's released right away.
+    assert liveness.finish(2) == {greeting.name}
+    assert liveness.finish(3) == {tyrion.name}
+    nested_echo = nested.components[0]
+    assert liveness.finish(4) == {
+        stark.name,
+        nested.name,
+        nested_echo.name,
+        conditional.name,
+    }
+
+    liveness = Liveness(pipeline, pinned={greeting.name})
+    assert [liveness.finish(i) for i in range(3)] == [set(), set(), set()]
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from unipipe.utils.cache import MISSING
+from unipipe.utils.journal import JOURNAL_FILE, RunJournal
+
+
+def test_run_journal(tmp_path):
+    journal = RunJournal(str(tmp_path))
+    assert journal.get("key") is MISSING
+    journal.record("split-name", "key", ("Ned", "Stark"))
+    assert journal.get("key") == ("Ned", "Stark")
+
+    # Incomplete entries (e.g. from a crash while writing) are ignored.
+    with open(os.path.join(journal.run_dir, JOURNAL_FILE), "a") as f:
+        f.write('{"name": "hello", "key"')
+
+    resumed = RunJournal(str(tmp_path), run_id=journal.run_id)
+    assert len(resumed) == 1
+    assert resumed.get("key") == ("Ned", "Stark")
+
+    with pytest.raises(FileNotFoundError):
+        RunJournal(str(tmp_path), run_id="missing")
@@ -0,0 +1,68 @@
+import pytest
+
+from unipipe import dsl
+from unipipe.utils.resources import (
+    ResourcePool,
+    Resources,
+    host_hardware,
+    parse_cpus,
+    parse_memory,
+)
+
+
+def test_parse_cpus():
+    assert parse_cpus(None) is None
+    assert parse_cpus("4") == 4.0
+    assert parse_cpus(2) == 2.0
+    assert parse_cpus("500m") == 0.5
+
+
+def test_parse_memory():
+    assert parse_memory(None) is None
+    assert parse_memory("1024") == 1024
+    assert parse_memory("512M") == 512 * 10**6
+    assert parse_memory("16G") == 16 * 10**9
+    assert parse_memory("1Gi") == 2**30
+    assert parse_memory("2GB") == 2 * 10**9
+    with pytest.raises(ValueError):
+        parse_memory("16X")
+
+
+def test_host_hardware():
+    hardware = host_hardware()
+    resources = Resources.from_hardware(hardware)
+    assert resources.cpus >= 1
+    assert resources.gpus >= 0
+
+
+def test_resource_pool():
+    pool = ResourcePool(
+        dsl.Hardware(cpus=4, memory="8G", accelerator=dsl.Accelerator(count=2))
+    )
+    big = pool.request(dsl.Hardware(cpus=3, memory="6G"))
+    small = pool.request(dsl.Hardware(memory="1G", accelerator={"count": 1}))
+    assert small == Resources(cpus=1.0, memory=10**9, gpus=1)
+
+    big_allocation = pool.acquire(big)
+    assert big_allocation is not None
+    assert pool.acquire(big) is None
+
+    # Small components are packed around the big one, each with its own GPU.
+    small_allocation = pool.acquire(small)
+    assert small_allocation is not None
+    assert small_allocation.gpu_ids == (0,)
+    assert pool.acquire(small) is None
+
+    pool.release(big_allocation)
+    other_allocation = pool.acquire(small)
+    assert other_allocation is not None
+    assert other_allocation.gpu_ids == (1,)
+
+
+def test_resource_pool_limits_requests():
+    pool = ResourcePool({"cpus": 2})
+    # Requests larger than the total capacity are limited, so they can run alone.
+    request = pool.request(dsl.Hardware(cpus=8, memory="64G"))
+    assert request == Resources(cpus=2.0, memory=64 * 10**9, gpus=0)
+    assert pool.acquire(request) is not None
+    assert pool.acquire(pool.request(dsl.Hardware(cpus="100m"))) is None
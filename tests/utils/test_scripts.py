@@ -11,6 +11,7 @@ from unipipe.utils.scripts import (
     get_component_kwargs_from_docstring,
     get_component_kwargs_from_script,
     get_docstring_from_script,
+    pipeline_from_target,
 )
 
 TEMPDIR = tempfile.TemporaryDirectory()
@@ -120,3 +121,19 @@ def test_component_from_script(script: str, docstring: Optional[str]):
         component_fn = component_from_script(script)
         component = component_fn(args=[])
         assert component.func.__name__ == SCRIPT_NAME
+
+
+def test_pipeline_from_target():
+    local_dir = os.path.abspath(os.path.dirname(__file__))
+    examples_dir = os.path.join(local_dir, os.pardir, os.pardir, "examples")
+
+    path = os.path.join(examples_dir, "ex04_pipeline_arguments.py")
+    pipeline = pipeline_from_target(f"{path}:pipeline", args=["name=Ned Stark"])
+    assert isinstance(pipeline, dsl.Pipeline)
+    assert len(pipeline.components) == 3
+
+    pipeline = pipeline_from_target("examples.ex02_hello_pipeline:pipeline")
+    assert isinstance(pipeline, dsl.Pipeline)
+
+    with pytest.raises(ValueError):
+        pipeline_from_target(f"{path}:pipeline", args=["Ned Stark"])
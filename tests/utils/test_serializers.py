@@ -0,0 +1,91 @@
+from typing import NamedTuple
+from unittest import mock
+
+import pytest
+
+from unipipe.utils.records import LazyRecord
+from unipipe.utils.serializers import (
+    SERIALIZERS,
+    Serializer,
+    dump_record,
+    dump_values,
+    get_serializer,
+    is_encoded_record,
+    load_record,
+    load_values,
+)
+
+VALUES = [
+    "hello",
+    1,
+    0.1 + 0.2,
+    None,
+    [1.5, "two", None],
+    {"key": [1, 2, 3]},
+]
+
+
+@pytest.mark.parametrize("name", list(SERIALIZERS.keys()))
+@pytest.mark.parametrize("value", VALUES)
+def test_serializer_round_trip(tmp_path, name: str, value):
+    if name == "msgpack":
+        pytest.importorskip("msgpack")
+
+    serializer = get_serializer(name)
+    path = str(tmp_path / f"value{serializer.extension}")
+    serializer.dump_file(value, path)
+    assert serializer.load_file(path) == value
+
+
+def test_unknown_serializer():
+    with pytest.raises(ValueError):
+        get_serializer("yaml")
+
+
+def test_serializer_is_abstract():
+    class IncompleteSerializer(Serializer):
+        def dump(self, value, f):
+            pass
+
+    with pytest.raises(TypeError):
+        IncompleteSerializer()  # type: ignore
+
+
+@pytest.mark.parametrize("name", list(SERIALIZERS.keys()))
+def test_dump_and_load_values(tmp_path, name: str):
+    if name == "msgpack":
+        pytest.importorskip("msgpack")
+
+    serializer = get_serializer(name)
+    paths = [f"/data/file-{i}.txt" for i in range(100_000)]
+    values = {"paths": paths, "count": len(paths), "empty": []}
+    dump_values(values, str(tmp_path), serializer=serializer)
+    assert load_values(str(tmp_path), serializer=serializer) == values
+
+
+class _Output(NamedTuple):
+    blob: list
+    size: int
+
+
+def test_dump_and_load_record(tmp_path):
+    serializer = get_serializer()
+    encoded = dump_record(
+        _Output(blob=[0] * 1000, size=1000), str(tmp_path), serializer
+    )
+    assert is_encoded_record(encoded)
+
+    record = load_record(encoded, str(tmp_path), serializer=serializer)
+    assert isinstance(record, LazyRecord)
+    # Only the fields that are accessed are loaded.
+    with mock.patch.object(
+        serializer, "load_file", wraps=serializer.load_file
+    ) as load_file:
+        assert record.size == 1000
+        assert record.size == 1000
+        assert load_file.call_count == 1
+
+    assert record.bind(_Output).materialize() == _Output(blob=[0] * 1000, size=1000)
+    assert tuple(record) == ([0] * 1000, 1000)
+    with pytest.raises(AttributeError):
+        record.missing
@@ -0,0 +1,56 @@
+import functools
+import gc
+import weakref
+from typing import NamedTuple
+
+from examples.ex07_nested_pipelines import hello
+from unipipe.utils.signatures import _SIGNATURES, get_field_types, get_signature
+
+
+class Output(NamedTuple):
+    first: str
+    last: str
+
+
+def split_name(name: "str", sep: str = " ") -> "Output":
+    names = name.split(sep)
+    return Output(names[0], names[-1])
+
+
+def test_get_signature():
+    signature = get_signature(split_name)
+    # Stringified annotations are resolved to types.
+    assert signature.input_types == {"name": str, "sep": str}
+    assert signature.return_type is Output
+    assert signature.has_return
+    assert list(signature.parameters) == ["name", "sep"]
+    assert signature.fields == {"first": str, "last": str}
+    assert get_field_types(Output) is signature.fields
+    assert get_signature(split_name) is signature
+
+    # Wrappers share the signature of the wrapped function.
+    @functools.wraps(split_name)
+    def wrapped(*args, **kwargs):
+        return split_name(*args, **kwargs)
+
+    assert get_signature(wrapped) is signature
+
+
+def test_signatures_are_released():
+    def hello(name: str) -> str:
+        return f"Hello, {name}!"
+
+    get_signature(hello)
+    ref = weakref.ref(hello)
+    assert ref in _SIGNATURES.keyrefs()
+    # The cache doesn't keep functions alive.
+    del hello
+    gc.collect()
+    assert ref() is None
+
+
+def test_component_signature():
+    component = hello(first_name="Ned", last_name="Stark")
+    # Components are wrapped again every time they're traced, but share a signature.
+    other = hello(first_name="Arya", last_name="Stark")
+    assert get_signature(component.func) is get_signature(other.func)
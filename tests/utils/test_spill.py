@@ -0,0 +1,95 @@
+import os
+import threading
+from typing import NamedTuple
+
+import pytest
+
+from unipipe.utils.spill import SpilledValue, Spiller, SpillingLocals, get_size
+from unipipe.utils.tables import read_table, write_table
+
+
+class Output(NamedTuple):
+    first: str
+    last: str
+
+
+def test_get_size():
+    assert get_size([b"x" * 1000]) > 1000
+    assert get_size({"key": b"x" * 1000}) > 1000
+    # Shared items are only counted once.
+    value = b"x" * 1000
+    assert get_size([value, value]) < 2000
+
+
+def test_spilling_locals(tmp_path):
+    spiller = Spiller(budget=2048, directory=str(tmp_path))
+    _locals = SpillingLocals({}, spiller=spiller)
+    _locals["a"] = b"a" * 1000
+    _locals["b"] = Output("Ned", "Stark")
+    _locals["c"] = b"c" * 1000
+    assert spiller.size <= 2048
+
+    # The least recently used result is spilled, and loaded again when it's read.
+    assert isinstance(dict.__getitem__(_locals, "a"), SpilledValue)
+    assert _locals["a"] == b"a" * 1000
+    assert len(os.listdir(tmp_path)) == 1
+
+    _locals["d"] = b"d" * 1000
+    # NamedTuple results are restored with their original type.
+    assert isinstance(dict.__getitem__(_locals, "b"), SpilledValue)
+    assert _locals["b"] == Output("Ned", "Stark")
+    assert isinstance(_locals["b"], Output)
+
+    # Locals of nested pipelines share the same budget.
+    child = SpillingLocals({"e": b"e" * 1000}, spiller=spiller)
+    child["f"] = b"f" * 3000
+    assert spiller.size <= 2048
+    assert child["f"] == b"f" * 3000
+
+    # Released results are removed from disk, without being loaded.
+    del _locals["a"]
+    del _locals["b"]
+    assert _locals.pop("c") == b"c" * 1000
+    spilled = [
+        os.path.basename(v.path)
+        for values in (_locals, child)
+        for v in dict.values(values)
+        if isinstance(v, SpilledValue)
+    ]
+    assert sorted(os.listdir(tmp_path)) == sorted(spilled)
+
+    # Finished scopes are cleared, without loading their spilled results.
+    child.clear()
+    assert not child
+    assert all(key[0] != id(child) for key in spiller._entries)
+    assert len(os.listdir(tmp_path)) == len(spilled) - 1
+
+
+def test_memory_mapped_results(tmp_path):
+    np = pytest.importorskip("numpy")
+    pa = pytest.importorskip("pyarrow")
+
+    path = str(tmp_path / "array.npy")
+    np.save(path, np.zeros(1000))
+    array = np.load(path, mmap_mode="r")
+    write_table(pa.table({"x": list(range(1000))}), str(tmp_path / "table.arrow"))
+    table = read_table(str(tmp_path / "table.arrow"))
+    assert get_size(array) == get_size(array[:10]) == get_size(table) == 0
+
+    # Memory-mapped results are never spilled, since that would read the file.
+    spiller = Spiller(budget=0, directory=str(tmp_path / "spill"))
+    _locals = SpillingLocals({}, spiller=spiller)
+    _locals["array"] = array
+    _locals["both"] = (array, table)
+    assert spiller.size == 0
+    assert _locals["array"] is array
+    assert os.listdir(tmp_path / "spill") == []
+
+
+def test_unpicklable_results_stay_in_memory(tmp_path):
+    spiller = Spiller(budget=0, directory=str(tmp_path))
+    _locals = SpillingLocals({}, spiller=spiller)
+    lock = threading.Lock()
+    _locals["lock"] = lock
+    assert _locals["lock"] is lock
+    assert os.listdir(tmp_path) == []
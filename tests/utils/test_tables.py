@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+import unipipe
+from unipipe import dsl
+from unipipe.utils.annotations import cast_output_type
+from unipipe.utils.arrays import decode_arrays, encode_arrays
+from unipipe.utils.cache import get_cache_key
+
+pa = pytest.importorskip("pyarrow")
+pd = pytest.importorskip("pandas")
+
+
+def test_encode_and_decode_tables(tmp_path):
+    directory = str(tmp_path)
+    table = pa.table({"x": [1, 2, 3], "y": ["a", "b", "c"]})
+    frame = pd.DataFrame({"x": [1.0, 2.0]})
+    encoded = encode_arrays({"table": table, "frame": frame}, directory)
+    assert len(os.listdir(directory)) == 2
+
+    decoded = decode_arrays(encoded, directory)
+    assert decoded["table"].equals(table)
+    pd.testing.assert_frame_equal(decoded["frame"], frame)
+
+    # Arrow tables read from the same directory are not written again.
+    encode_arrays(decoded, directory)
+    assert len(os.listdir(directory)) == 3
+
+
+@dsl.component
+def make_table(size: int) -> pa.Table:
+    return pa.table({"x": list(range(size))})
+
+
+@dsl.component
+def to_frame(table: pa.Table) -> pd.DataFrame:
+    return table.to_pandas()
+
+
+@dsl.component
+def frame_sum(frame: pd.DataFrame) -> int:
+    return int(frame["x"].sum())
+
+
+def test_table_components():
+    @dsl.pipeline
+    def pipeline():
+        return frame_sum(frame=to_frame(table=make_table(size=4)))
+
+    assert unipipe.run(executor="python", pipeline=pipeline()) == 6
+
+
+def test_cast_table_output_type():
+    # DataFrames are converted to Arrow tables (and vice versa), based on the
+    # annotated type.  Tables of the right type are returned as-is.
+    table = pa.table({"x": [1, 2]})
+    assert cast_output_type(table, pa.Table) is table
+    frame = cast_output_type(table, pd.DataFrame)
+    assert isinstance(frame, pd.DataFrame)
+    assert cast_output_type(frame, pa.Table).equals(table)
+
+
+def test_table_cache_key():
+    table = pa.table({"x": [1, 2, 3]})
+    component = to_frame(table=table)
+    key = get_cache_key(component, {"table": table})
+    assert key == get_cache_key(component, {"table": pa.table({"x": [1, 2, 3]})})
+    assert key != get_cache_key(component, {"table": pa.table({"x": [1, 2, 4]})})
@@ -0,0 +1,19 @@
+import os
+import zipfile
+
+from unipipe.utils.wheel import build_unipipe_wheel
+
+
+def test_build_unipipe_wheel(tmp_path):
+    path = build_unipipe_wheel(str(tmp_path))
+    assert os.path.basename(path).endswith("-py3-none-any.whl")
+    # Wheels are reused for the same source code.
+    assert build_unipipe_wheel(str(tmp_path)) == path
+
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+    assert "unipipe/__init__.py" in names
+    assert "unipipe/executor/docker.py" in names
+    assert not any("__pycache__" in name for name in names)
+    dist_info = [n for n in names if n.endswith(".dist-info/RECORD")]
+    assert len(dist_info) == 1
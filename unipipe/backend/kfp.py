@@ -1,22 +1,173 @@
 from __future__ import annotations
 
+import ast
+import hashlib
+import inspect
+import linecache
 import os
-from typing import Any, Dict
+import textwrap
+from typing import Any, Callable, Dict, List, Optional
 
 import kfp.dsl as kfp_dsl
 import kfp.v2.dsl as kfp_v2_dsl
 from kfp.v2.compiler import Compiler
 from kfp.v2.components.component_factory import create_component_from_func
 
-from unipipe.dsl import Component, ConditionalPipeline, LazyAttribute, Pipeline
+from unipipe.dsl import (
+    Component,
+    ConditionalPipeline,
+    LazyAttribute,
+    LazyItem,
+    Pipeline,
+)
 from unipipe.utils.annotations import resolve_annotations
+from unipipe.utils.compat import get_source_segment
+from unipipe.utils.signatures import get_signature
+from unipipe.utils.source import get_component_func_source
+from unipipe.utils.tables import is_dataframe_type, is_table_type
+
+# Name of the output dataset, for components that return a table.
+TABLE_OUTPUT = "output_table"
+
+TABLE_WRAPPER = """
+def {name}({params}){returns}:
+    import pyarrow.parquet
+{imports}
+{function}
+{read_tables}
+    output = {name}({kwargs})
+{write_output}
+"""
+
+
+def build_table_wrapper_source(func: Callable) -> Optional[str]:
+    """Tables are passed between KFP components as Parquet datasets (artifacts),
+    rather than as parameters.  KFP builds the component interface from the function
+    signature, and then runs the function *source* inside the container.  So for
+    components with table inputs or outputs, this generates the source for a wrapper
+    function, which reads/writes the datasets and calls the original function.
+    Returns None if the function doesn't use any tables.
+    """
+    annotations = get_signature(func).annotations
+    table_args = [
+        k for k, t in annotations.items() if k != "return" and is_table_type(t)
+    ]
+    return_type = annotations.get("return")
+    if not (table_args or is_table_type(return_type)):
+        return None
+
+    # Remove the '@dsl.component' decorator.  'unipipe' is not always installed in
+    # the container, and the wrapper takes care of reading/writing values.
+    source = get_component_func_source(func).split("\n", maxsplit=1)[1]
+    node = ast.parse(source).body[0]
+    assert isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+
+    def segment(_node: Optional[ast.AST]) -> str:
+        return "" if _node is None else get_source_segment(source, _node)
+
+    args = node.args
+    defaults: List[Optional[ast.expr]] = [
+        *[None] * (len(args.args) - len(args.defaults)),
+        *args.defaults,
+        *args.kw_defaults,
+    ]
+    # Artifacts can't have default values, so they go first.
+    params = [f"{k}: Input[Dataset]" for k in table_args]
+    if is_table_type(return_type):
+        params.append(f"{TABLE_OUTPUT}: Output[Dataset]")
+    for arg, default in zip([*args.args, *args.kwonlyargs], defaults):
+        if arg.arg in table_args:
+            continue
+        param = segment(arg)
+        if default is not None:
+            param += f" = {segment(default)}"
+        params.append(param)
+
+    imports, types = [], [*annotations.values()]
+    if any(is_table_type(t) and not is_dataframe_type(t) for t in types):
+        imports += ["import pyarrow", "import pyarrow as pa"]
+    if any(is_dataframe_type(t) for t in types):
+        imports += ["import pandas", "import pandas as pd"]
+
+    read_tables = []
+    for k in table_args:
+        read = f"pyarrow.parquet.read_table({k}.path)"
+        if is_dataframe_type(annotations[k]):
+            read += ".to_pandas()"
+        read_tables.append(f"{k} = {read}")
+
+    if is_table_type(return_type):
+        returns = ""
+        if is_dataframe_type(return_type):
+            write_output = [
+                "output = pyarrow.Table.from_pandas(output)",
+                f"pyarrow.parquet.write_table(output, {TABLE_OUTPUT}.path)",
+            ]
+        else:
+            write_output = [f"pyarrow.parquet.write_table(output, {TABLE_OUTPUT}.path)"]
+    else:
+        returns = f" -> {segment(node.returns)}" if node.returns else ""
+        write_output = ["return output"]
+
+    def indent(lines: List[str]) -> str:
+        return textwrap.indent("\n".join(lines), " " * 4)
+
+    return TABLE_WRAPPER.format(
+        name=func.__name__,
+        params=", ".join(params),
+        returns=returns,
+        imports=indent(imports),
+        function=indent([source]),
+        read_tables=indent(read_tables),
+        kwargs=", ".join(f"{k}={k}" for k in annotations if k != "return"),
+        write_output=indent(write_output),
+    ).lstrip()
+
+
+def _wrap_table_component(component: Component) -> Callable:
+    source = build_table_wrapper_source(component.func)
+    if source is None:
+        return resolve_annotations(component.func)
+
+    # KFP reads the function source with 'inspect.getsource', so the generated
+    # source is registered with 'linecache' (like the interactive interpreter).
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+    filename = f"<unipipe-kfp-{component.func.__name__}-{digest}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    # Use the globals of the original function, since 'component.func' may be a
+    # wrapper defined in another module (e.g. 'unipipe.dsl').
+    namespace = {
+        **inspect.unwrap(component.func).__globals__,
+        "Dataset": kfp_v2_dsl.Dataset,
+        "Input": kfp_v2_dsl.Input,
+        "Output": kfp_v2_dsl.Output,
+    }
+    # Don't inherit 'from __future__ import annotations' from this module, since KFP
+    # needs the annotations as types.
+    exec(compile(source, filename, "exec", dont_inherit=True), namespace)
+    return namespace[component.func.__name__]
+
+
+def _get_packages_to_install(component: Component) -> List[str]:
+    packages = list(component.packages_to_install or [])
+    types = get_signature(component.func).annotations.values()
+    required = []
+    if any(is_table_type(t) for t in types):
+        required.append("pyarrow")
+    if any(is_dataframe_type(t) for t in types):
+        required.append("pandas")
+    for requirement in required:
+        if not any(p.lower().startswith(requirement) for p in packages):
+            packages.append(requirement)
+    return packages
 
 
 def build_kubeflow_component(component: Component):
     comp = create_component_from_func(
-        func=resolve_annotations(component.func),
+        func=_wrap_table_component(component),
         base_image=component.base_image or "fkodom/unipipe:latest",
-        packages_to_install=component.packages_to_install,
+        packages_to_install=_get_packages_to_install(component),
         pip_index_urls=component.pip_index_urls,
     )
     comp.name = component.name
@@ -46,6 +197,8 @@ def set_hardware_attributes(container_op: Any, component: Component):
 def resolve_value(_locals: Dict, value: Any) -> Any:
     if isinstance(value, LazyAttribute):
         return _locals[value.parent.name].outputs[value.key]
+    elif isinstance(value, LazyItem):
+        return resolve_value(_locals, value.parent)[value.idx]
     elif isinstance(value, Component):
         return _locals[value.name].output
     elif isinstance(value, Pipeline):
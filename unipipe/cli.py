@@ -1,3 +1,4 @@
+import time
 from typing import Optional, Sequence
 
 import click
@@ -5,6 +6,7 @@ from pydantic import parse_raw_as
 
 from unipipe import dsl
 from unipipe.executor import EXECUTOR_IMPORTS
+from unipipe.utils.scripts import pipeline_from_target
 from unipipe.utils.scripts import run_script as unipipe_run_script
 
 DEFAULT_SEQUENCE = ("None",)
@@ -48,8 +50,8 @@ def validate_hardware(ctx, param, value) -> Optional[dsl.Hardware]:
     default=None,
     type=str,
     help=(
-        "Root directory for storing pipeline artifacts. Currently only used for "
-        "'--executor=vertex'. Default: None"
+        "Root directory for storing pipeline artifacts and run journals. Required "
+        "for '--executor=vertex'. Default: None"
     ),
 )
 @click.option(
@@ -125,3 +127,70 @@ def run_script(
         pip_index_urls=pip_index_urls,
         hardware=hardware,
     )
+
+
+@unipipe.command()
+@click.argument("target", nargs=1)
+@click.option(
+    "-a",
+    "--arg",
+    "args",
+    multiple=True,
+    type=str,
+    help="Pipeline argument, formatted as 'key=value'. Ex: --arg name='Ned Stark'",
+)
+@click.option(
+    "-w",
+    "--max-workers",
+    "max_workers",
+    default=None,
+    type=int,
+    help="Maximum number of concurrent image builds. Default: all at once",
+)
+@click.option(
+    "--pull-policy",
+    "pull_policy",
+    default="IfNotPresent",
+    type=click.Choice(["Always", "IfNotPresent", "Never"]),
+    help="When to pull base images. Default: 'IfNotPresent'",
+)
+@click.option(
+    "--buildkit",
+    "buildkit",
+    is_flag=True,
+    default=False,
+    help="Build images with BuildKit, using the 'docker' CLI.",
+)
+@click.option(
+    "--wheelhouse",
+    "wheelhouse",
+    default=None,
+    type=str,
+    help="Local directory of wheels to install packages from. Default: None",
+)
+def build_images(
+    target: str,
+    args: Sequence[str],
+    max_workers: Optional[int] = None,
+    pull_policy: str = "IfNotPresent",
+    buildkit: bool = False,
+    wheelhouse: Optional[str] = None,
+):
+    """Builds the Docker images for all components of a pipeline, ahead of time.
+
+    TARGET is either a pipeline function ('path/to/file.py:pipeline' or
+    'package.module:pipeline') or a script ('path/to/script.py').
+    """
+    from unipipe.executor.docker import DockerExecutor
+
+    executor = DockerExecutor(
+        pull_policy=pull_policy, buildkit=buildkit, wheelhouse=wheelhouse
+    )
+    start = time.perf_counter()
+    report = executor.prepare(
+        pipeline_from_target(target, args=args), max_workers=max_workers
+    )
+    for tag, seconds in sorted(report.items(), key=lambda x: -x[1]):
+        click.echo(f"{seconds:8.1f}s  {tag}")
+    elapsed = time.perf_counter() - start
+    click.echo(f"Prepared {len(report)} image(s) in {elapsed:.1f}s")
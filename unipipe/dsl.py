@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import logging
+import operator
+import os
+import weakref
 from contextlib import ExitStack, contextmanager
 from enum import Enum
 from functools import partial, wraps
-from inspect import isclass, signature
+from inspect import isclass, iscoroutinefunction
+from itertools import count
 from types import TracebackType
 from typing import (
     Any,
@@ -25,10 +29,28 @@ from pydantic import BaseModel, parse_obj_as
 
 from unipipe.utils import ops
 from unipipe.utils.annotations import infer_type, wrap_cast_output_type
-from unipipe.utils.compat import get_annotations
+from unipipe.utils.arrays import is_ndarray_type
+from unipipe.utils.artifacts import Artifact, new_artifact_path  # noqa: F401
+from unipipe.utils.signatures import get_signature
+from unipipe.utils.tables import is_table_type
 
 ALLOWED_TYPES = (str, int, float, bool, list, tuple, type(None))
-ALLOWED_TYPE_STRINGS = [getattr(t, "__name__", str(t)) for t in ALLOWED_TYPES]
+ALLOWED_TYPE_STRINGS = [
+    *[getattr(t, "__name__", str(t)) for t in ALLOWED_TYPES],
+    "numpy.ndarray",
+    "pyarrow.Table",
+    "pandas.DataFrame",
+]
+
+
+def _is_allowed_type(_type: Type) -> bool:
+    return (
+        issubclass(_type, ALLOWED_TYPES)
+        or is_ndarray_type(_type)
+        or is_table_type(_type)
+    )
+
+
 T_co = TypeVar("T_co", covariant=True)
 
 
@@ -71,6 +93,8 @@ MINIMAL_HARDWARE = Hardware(cpus=1, memory="512M")
 
 
 class _Operable:
+    __slots__ = ()
+
     def __len__(self) -> Component:
         return dispatch_to_component(ops.len_, a=self)
 
@@ -99,31 +123,129 @@ class _Operable:
         return dispatch_to_component(ops.equal, a=self, b=other)
 
 
-class LazyAttribute(BaseModel, _Operable):  # type: ignore
-    parent: Any
-    key: str
+class LazyAttribute(_Operable):
+    """Attribute of a pipeline object (e.g. one field of a 'NamedTuple' component
+    output), which is resolved at runtime.
+    """
+
+    __slots__ = ("parent", "key")
+
+    def __init__(self, parent: Any, key: str) -> None:
+        self.parent = parent
+        self.key = key
+
+    def __eq__(self, other: Any) -> bool:  # type: ignore
+        return isinstance(other, LazyAttribute) and (self.parent, self.key) == (
+            other.parent,
+            other.key,
+        )
+
+    def __str__(self) -> str:  # type: ignore
+        return f"parent={self.parent!r} key={self.key!r}"
+
+    def __repr__(self) -> str:
+        return f"LazyAttribute({self})"
 
 
-class LazyItem(BaseModel, _Operable):  # type: ignore
-    parent: Any
-    idx: int
+class LazyItem(_Operable):
+    """Item of a pipeline's (container) return value, which is resolved at runtime."""
+
+    __slots__ = ("parent", "idx")
+
+    def __init__(self, parent: Any, idx: int) -> None:
+        self.parent = parent
+        self.idx = idx
+
+    def __eq__(self, other: Any) -> bool:  # type: ignore
+        return isinstance(other, LazyItem) and (self.parent, self.idx) == (
+            other.parent,
+            other.idx,
+        )
+
+    def __str__(self) -> str:  # type: ignore
+        return f"parent={self.parent!r} idx={self.idx!r}"
+
+    def __repr__(self) -> str:
+        return f"LazyItem({self})"
+
+
+def _set_root_logging_level(level: int) -> None:
+    logger = logging.getLogger()
+    # 'setLevel' clears the cache of every logger, so skip it when possible.
+    if logger.level != level:
+        logger.setLevel(level)
 
 
 def wrap_logging_info(
     func: Callable, component_name: str, logging_level: int
 ) -> Callable:
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapped(*args, **kwargs):
+            import logging
+
+            _set_root_logging_level(logging_level)
+            result = await func(*args, **kwargs)
+            logging.info("[%s] - %s", component_name, result)
+            return result
+
+        return async_wrapped
+
     @wraps(func)
     def wrapped(*args, **kwargs):
         import logging
 
-        logging.getLogger().setLevel(logging_level)
+        _set_root_logging_level(logging_level)
         result = func(*args, **kwargs)
-        logging.info(f"[{component_name}] - {result}")
+        logging.info("[%s] - %s", component_name, result)
         return result
 
     return wrapped
 
 
+# Hardware specs are parsed once, and the same (read-only) 'Hardware' object is shared
+# by all components with that spec.
+_HARDWARE: Dict[str, Hardware] = {}
+
+
+def parse_hardware(hardware: Optional[Union[Dict, Hardware]]) -> Hardware:
+    if isinstance(hardware, Hardware):
+        return hardware
+    key = repr(hardware) if hardware else ""
+    parsed = _HARDWARE.get(key)
+    if parsed is None:
+        parsed = parse_obj_as(Hardware, hardware) if hardware else Hardware()
+        _HARDWARE[key] = parsed
+    return parsed
+
+
+# Suffixes for default component/pipeline names.  Like 'uuid1()[:8]', but without
+# reading the clock and MAC address for every traced component.
+_NAME_IDS = count(int.from_bytes(os.urandom(4), "little"))
+
+
+def _new_name_id() -> str:
+    return f"{next(_NAME_IDS) & 0xFFFFFFFF:08x}"
+
+
+# Output casting doesn't depend on the component, so functions are only wrapped
+# once (see 'Component.func').
+_CAST_WRAPPERS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_cast_wrapper(func: Callable) -> Callable:
+    try:
+        return _CAST_WRAPPERS[func]
+    except KeyError:
+        wrapped = wrap_cast_output_type(func, _type=get_signature(func).return_type)
+        _CAST_WRAPPERS[func] = wrapped
+        return wrapped
+    except TypeError:
+        # Doesn't support weak references
+        return wrap_cast_output_type(func, _type=get_signature(func).return_type)
+
+
 def _base_image_for_hardware(hardware: Hardware) -> str:
     accelerator = hardware.accelerator
     if accelerator is not None and accelerator.count:
@@ -145,6 +267,23 @@ def get_pip_index_urls(urls: Optional[Sequence[str]]) -> Optional[List[str]]:
 
 
 class Component(_Operable, Generic[T_co]):
+    # Pipelines may contain a very large number of components, so keep them small.
+    __slots__ = (
+        "name",
+        "inputs",
+        "return_type",
+        "logging_level",
+        "packages_to_install",
+        "pip_index_urls",
+        "hardware",
+        "base_image",
+        "serializer",
+        "_func",
+        "_log_name",
+        "_wrapped_func",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         func: Callable,
@@ -156,6 +295,7 @@ class Component(_Operable, Generic[T_co]):
         packages_to_install: Optional[List[str]] = None,
         pip_index_urls: Optional[List[str]] = None,
         hardware: Optional[Union[Dict, Hardware]] = None,
+        serializer: Optional[str] = None,
     ) -> None:
         """
         Args:
@@ -164,69 +304,81 @@ class Component(_Operable, Generic[T_co]):
             inputs: Optional(Dict) A dictionary containing the input values assigned to their parameter names.
         """
         if name is None:
-            uuid = str(uuid1())[:8]
-            name = f"{func.__name__}-{uuid}"
+            name = f"{func.__name__}-{_new_name_id()}"
         inputs = inputs or {}
         logging_level = logging_level or logging.INFO
 
         self.name = name.replace("_", "-")
+        # Logs use the name as given (before replacing '_').
+        self._log_name = name
         self.inputs = inputs
-        self.return_type = get_annotations(func, eval_str=True).get("return")
-        self.func = wrap_logging_info(
-            wrap_cast_output_type(func, _type=self.return_type),
-            component_name=name,
-            logging_level=logging_level,
-        )
+        self.return_type = get_signature(func).return_type
+        self._func = func
+        self._wrapped_func: Optional[Callable] = None
 
         self.logging_level = logging_level
         self.packages_to_install = packages_to_install
         self.pip_index_urls = get_pip_index_urls(pip_index_urls)
-        self.hardware = parse_obj_as(Hardware, hardware) if hardware else Hardware()
+        self.hardware = parse_hardware(hardware)
         self.base_image = base_image or _base_image_for_hardware(self.hardware)
+        # Format for passing values to containers (see "unipipe.utils.serializers")
+        self.serializer = serializer
 
         self.type_check()
         pipeline = PipelineContext().current
         if pipeline is not None:
             pipeline.components.append(self)
 
+    @property
+    def func(self) -> Callable:
+        """The component function, wrapped to cast its output and log the result.
+        Wrappers are only created when the component actually runs.
+        """
+        if self._wrapped_func is None:
+            self._wrapped_func = wrap_logging_info(
+                _get_cast_wrapper(self._func),
+                component_name=self._log_name,
+                logging_level=self.logging_level,
+            )
+        return self._wrapped_func
+
     def type_check(self) -> None:
-        annotations = get_annotations(self.func, eval_str=True)
-        if "return" not in annotations:
+        _signature = get_signature(self._func)
+        annotations = _signature.annotations
+        if not _signature.has_return:
             raise TypeError(
                 f"Must provide a return type annotation for "
-                f"component function {self.func.__name__}()."
+                f"component function {self._func.__name__}()."
             )
-        elif isclass(self.return_type) and not issubclass(
-            self.return_type, ALLOWED_TYPES
-        ):
+        elif isclass(self.return_type) and not _is_allowed_type(self.return_type):
             raise TypeError(
                 f"Found unallowed return type '{self.return_type}' for "
-                f"function {self.func.__name__}(). Types allowed by unipipe: "
+                f"function {self._func.__name__}(). Types allowed by unipipe: "
                 f"[{', '.join(ALLOWED_TYPE_STRINGS)}]"
             )
 
         for key, value in self.inputs.items():
-            if key not in signature(self.func).parameters:
+            if key not in _signature.parameters:
                 # Mimic the behavior when a function is called with an invalid kwarg
                 # name -- TypeError with 'unexpected keyword argument' message.
                 raise TypeError(
-                    f"Component function {self.func.__name__}() received an "
+                    f"Component function {self._func.__name__}() received an "
                     f"unexpected argument '{key}'."
                 )
             elif key not in annotations:
                 raise TypeError(
                     f"Must provide a type annotation for argument '{key}' to "
-                    f"component function {self.func.__name__}()."
+                    f"component function {self._func.__name__}()."
                 )
 
             target_type: Type = annotations[key]
             if hasattr(target_type, "__origin__"):
                 target_type = target_type.__origin__
 
-            if isclass(target_type) and not issubclass(target_type, ALLOWED_TYPES):
+            if isclass(target_type) and not _is_allowed_type(target_type):
                 raise TypeError(
                     f"Found unallowed type '{target_type}' for argument '{key}' "
-                    f"to function {self.func.__name__}(). Types allowed by unipipe: "
+                    f"to function {self._func.__name__}(). Types allowed by unipipe: "
                     f"[{', '.join(ALLOWED_TYPE_STRINGS)}]"
                 )
 
@@ -236,7 +388,7 @@ class Component(_Operable, Generic[T_co]):
             # return type annotation, but pipeline functions are not always.
             if isclass(inferred_type) and not issubclass(inferred_type, target_type):
                 raise TypeError(
-                    f"Component function {self.func.__name__}() expected argument "
+                    f"Component function {self._func.__name__}() expected argument "
                     f"'{key}' with type '{target_type}', but found '{inferred_type}'."
                 )
 
@@ -253,6 +405,9 @@ class Component(_Operable, Generic[T_co]):
         return (self[i] for i in range(self._len()))
 
     def __getattr__(self, key: str) -> LazyAttribute:
+        if key.startswith("__") and key.endswith("__"):
+            # e.g. 'hasattr(component, "__fields__")' from 'isinstance' checks
+            raise AttributeError(key)
         return LazyAttribute(parent=self, key=key)
 
     def __getitem__(self, idx: int) -> LazyAttribute:
@@ -267,8 +422,8 @@ class Component(_Operable, Generic[T_co]):
 
 
 def _process_component_args(func: Callable, *args, **kwargs):
-    sig = signature(func)
-    pos_inputs = {k: a for k, a in zip(sig.parameters.keys(), args)}
+    parameters = get_signature(func).parameters
+    pos_inputs = {k: a for k, a in zip(parameters.keys(), args)}
     for key in pos_inputs.keys():
         if key in kwargs.keys():
             raise ValueError(
@@ -287,6 +442,7 @@ def component(
     packages_to_install: Optional[List[str]] = None,
     pip_index_urls: Optional[List[str]] = None,
     hardware: Optional[Union[Dict, Hardware]] = None,
+    serializer: Optional[str] = None,
 ) -> Callable:
     new_component = partial(
         Component,
@@ -296,6 +452,7 @@ def component(
         packages_to_install=packages_to_install,
         pip_index_urls=pip_index_urls,
         hardware=hardware,
+        serializer=serializer,
     )
 
     if func is None:
@@ -342,8 +499,7 @@ class Pipeline(ExitStack, _Operable, Generic[T_co]):
         """
         super().__init__()
         if name is None:
-            uuid = str(uuid1())[:8]
-            name = f"{self.__class__.__name__.lower()}-{uuid}"
+            name = f"{self.__class__.__name__.lower()}-{_new_name_id()}"
 
         self.name = name.replace("_", "-")  # Cannot use _ in pipeline names
         self.components = components or []
@@ -388,7 +544,9 @@ class Pipeline(ExitStack, _Operable, Generic[T_co]):
         return (self[i] for i in range(self._len()))
 
     def __getitem__(self, idx: int) -> LazyItem:
-        return LazyItem(parent=self.return_value, idx=idx)
+        # Resolved through the pipeline's own name, since the components in its
+        # return value only exist inside the nested pipeline.
+        return LazyItem(parent=self, idx=idx)
 
     def __getattr__(self, key: str) -> LazyAttribute:
         return LazyAttribute(parent=self, key=key)
@@ -415,7 +573,7 @@ def pipeline(
                 with Pipeline(name=name, **kwargs) as p:
                     return_value = func(**inputs)
                     p.return_value = return_value
-                    p.return_type = get_annotations(func, eval_str=True).get("return")
+                    p.return_type = get_signature(func).return_type
                 return p
 
             return wrapped_pipeline
@@ -428,7 +586,7 @@ def pipeline(
             with Pipeline(name=name, **kwargs) as p:
                 return_value = func(**inputs)
                 p.return_value = return_value
-                return_type = get_annotations(func, eval_str=True).get("return")
+                return_type = get_signature(func).return_type
                 p.return_type = return_type or type(return_value)
             return p
 
@@ -482,7 +640,7 @@ def equal(operand1: Any, operand2: Any, name: Optional[str] = None):
     _uuid = uuid1()
     if name is None:
         name = f"equal_{_uuid}"
-    return condition(operand1, operand2, comparator=lambda o1, o2: o1 == o2, name=name)
+    return condition(operand1, operand2, comparator=operator.eq, name=name)
 
 
 @wraps(condition)
@@ -490,7 +648,7 @@ def not_equal(operand1: Any, operand2: Any, name: Optional[str] = None):
     _uuid = uuid1()
     if name is None:
         name = f"equal_{_uuid}"
-    return condition(operand1, operand2, comparator=lambda o1, o2: o1 != o2, name=name)
+    return condition(operand1, operand2, comparator=operator.ne, name=name)
 
 
 @wraps(condition)
@@ -501,7 +659,7 @@ def _depends_on(operand1: _Operable, name: Optional[str] = None):
     return condition(
         operand1,
         operand2=str(_uuid),
-        comparator=lambda o1, o2: o1 != o2,
+        comparator=operator.ne,
         name=name,
     )
 
@@ -13,7 +13,13 @@ class ExecutorImport(BaseModel):
 
 
 EXECUTOR_IMPORTS: Dict[str, ExecutorImport] = {
+    "async": ExecutorImport(
+        module="unipipe.executor.asynchronous", name="AsyncExecutor"
+    ),
     "docker": ExecutorImport(module="unipipe.executor.docker", name="DockerExecutor"),
+    "multiprocess": ExecutorImport(
+        module="unipipe.executor.multiprocess", name="MultiprocessExecutor"
+    ),
     "python": ExecutorImport(module="unipipe.executor.python", name="PythonExecutor"),
     "vertex": ExecutorImport(module="unipipe.executor.vertex", name="VertexExecutor"),
 }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from inspect import iscoroutinefunction
+from typing import Any, Dict, MutableMapping, Optional, Sequence, Tuple, Union
+
+from unipipe.dsl import Component, Pipeline
+from unipipe.executor.base import PipelineFrame
+from unipipe.executor.python import PythonExecutor
+from unipipe.utils.cache import MISSING, ResultCache
+
+
+class AsyncExecutor(PythonExecutor):
+    """Runs all components on a single event loop.  Components defined with
+    'async def' are awaited directly, so any number of them can be in flight at once.
+    Synchronous components run in the event loop's default thread pool.
+
+    Usage:
+        await unipipe.run(executor="async", pipeline=pipeline())
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+        free_results: bool = True,
+        pinned: Optional[Sequence[Union[str, Component, Pipeline]]] = None,
+        memory_budget: Optional[Union[int, str]] = None,
+    ) -> None:
+        """
+        Args:
+            max_workers: Optional(int) Maximum number of components running at the
+                same time.  By default, there is no limit.
+            cache: Optional(ResultCache) On-disk cache of component results.
+            free_results: (bool) Release results as soon as they are no longer
+                needed.  See 'LocalExecutor' for details.
+            pinned: Optional(Sequence[str | Component | Pipeline]) Results that are
+                never released.
+            memory_budget: Optional(int | str) Spill results to disk when they
+                exceed this size.  See 'LocalExecutor' for details.
+        """
+        super().__init__(
+            max_workers=max_workers,
+            cache=cache,
+            free_results=free_results,
+            pinned=pinned,
+            memory_budget=memory_budget,
+        )
+
+    async def run_component_async(self, component: Component, **kwargs):
+        if iscoroutinefunction(component.func):
+            result = await component.func(**kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, partial(component.func, **kwargs))
+
+        return self.check_return_type(component, result)
+
+    async def run_pipeline_async(
+        self, pipeline: Pipeline, _locals: MutableMapping[str, Any]
+    ) -> Tuple[Any, MutableMapping[str, Any]]:
+        root = PipelineFrame(pipeline, _locals, liveness=self.get_liveness(pipeline))
+        tasks: Dict[asyncio.Future, Tuple[PipelineFrame, int, Optional[str]]] = {}
+        frames = [root]
+        semaphore = asyncio.Semaphore(self.max_workers) if self.max_workers else None
+
+        async def run_with_semaphore(component: Component, **kwargs):
+            assert semaphore is not None
+            async with semaphore:
+                return await self.run_component_async(component, **kwargs)
+
+        def submit(frame, idx, component, kwargs):
+            key = self.get_result_key(component, kwargs)
+            cached = self.get_cached_result(component, key)
+            if cached is not MISSING:
+                frame.finish(idx, cached)
+                frames.append(frame)
+                return
+
+            if semaphore is None:
+                coroutine = self.run_component_async(component, **kwargs)
+            else:
+                coroutine = run_with_semaphore(component, **kwargs)
+            tasks[asyncio.ensure_future(coroutine)] = (frame, idx, key)
+
+        try:
+            while True:
+                while frames:
+                    self._advance_frame(frames.pop(), frames, submit)
+                if root.done:
+                    break
+
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    frame, idx, key = tasks.pop(task)
+                    component = frame.pipeline.components[idx]
+                    assert isinstance(component, Component)
+                    result = self.store_artifacts(component, task.result())
+                    self.set_cached_result(component, key, result)
+                    frame.finish(idx, result)
+                    frames.append(frame)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return root.return_value, root.locals
+
+    async def run(
+        self,
+        pipeline: Pipeline,
+        pipeline_root: Optional[str] = None,
+        journal: bool = False,
+        resume: Optional[str] = None,
+    ):
+        with self.open_artifact_store(pipeline_root):
+            with self.open_journal(pipeline_root, journal=journal, resume=resume):
+                with self.open_locals(pipeline.inputs) as _locals:
+                    return_value, _ = await self.run_pipeline_async(
+                        pipeline, _locals=_locals
+                    )
+        return return_value
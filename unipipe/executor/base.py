@@ -1,9 +1,46 @@
 from __future__ import annotations
 
+import logging
+import os
+import shutil
+import tempfile
 from abc import abstractmethod
-from typing import Any, Dict, Optional, Tuple
+from collections import ChainMap, deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Executor as PoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from inspect import isclass
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from unipipe.dsl import Component, ConditionalPipeline, Pipeline
+from unipipe.dsl import Component, ConditionalPipeline, Hardware, Pipeline
+from unipipe.utils.accessors import compile_accessor, resolve_inputs
+from unipipe.utils.artifacts import ARTIFACT_SCRATCH_ENV, ArtifactStore
+from unipipe.utils.cache import MISSING, ResultCache, get_cache_key
+from unipipe.utils.graph import Liveness, get_dependencies
+from unipipe.utils.journal import RunJournal
+from unipipe.utils.records import LazyRecord
+from unipipe.utils.resources import (
+    Allocation,
+    ResourcePool,
+    Resources,
+    parse_memory,
+)
+from unipipe.utils.spill import Spiller, SpillingLocals
 
 
 class Executor:
@@ -12,10 +49,123 @@ class Executor:
         pass
 
 
+def release_locals(_locals: MutableMapping[str, Any], names: Collection[str]) -> None:
+    # Nested pipelines only release results from their own scope.
+    scope = _locals.maps[0] if isinstance(_locals, ChainMap) else _locals
+    for name in names:
+        if name in scope:
+            # 'del' (rather than 'pop') never loads results that were spilled to disk.
+            del scope[name]
+
+
+def release_scope(_locals: MutableMapping[str, Any]) -> None:
+    """Releases all results of a nested pipeline, once it has finished.  Its return
+    value is owned by the parent scope, and nothing else reads from this scope.
+    """
+    scope = _locals.maps[0] if isinstance(_locals, ChainMap) else _locals
+    if isinstance(scope, SpillingLocals):
+        scope.clear()
+
+
+def child_locals(_locals: MutableMapping[str, Any], kwargs: Dict[str, Any]) -> ChainMap:
+    """Locals for a nested pipeline, with the inputs in 'kwargs'.  Results of the
+    nested pipeline are written to a new scope, which is chained to the parent's
+    locals (instead of copying them).
+    """
+    parent = _locals.maps[0] if isinstance(_locals, ChainMap) else _locals
+    scope: Dict[str, Any] = kwargs
+    if isinstance(parent, SpillingLocals):
+        scope = SpillingLocals(kwargs, spiller=parent.spiller)
+    return ChainMap(scope, _locals)
+
+
+class PipelineFrame:
+    """Scheduling state for a single (possibly nested) pipeline, when running
+    components concurrently.  Tracks which components are ready to start, and how
+    many are still unfinished.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        _locals: MutableMapping[str, Any],
+        parent: Optional[Tuple[PipelineFrame, int]] = None,
+        liveness: Optional[Liveness] = None,
+    ) -> None:
+        self.pipeline = pipeline
+        self.locals = _locals
+        self.parent = parent
+        self.liveness = liveness
+
+        dependencies = get_dependencies(pipeline.components)
+        self.waiting = [len(deps) for deps in dependencies]
+        self.dependents: List[List[int]] = [[] for _ in dependencies]
+        for idx, deps in enumerate(dependencies):
+            for dep in deps:
+                self.dependents[dep].append(idx)
+
+        self.ready: Deque[int] = deque(i for i, n in enumerate(self.waiting) if n == 0)
+        self.remaining = len(dependencies)
+        self.return_value: Any = None
+        self.done = False
+
+    def finish(self, idx: int, result: Any) -> None:
+        self.locals[self.pipeline.components[idx].name] = result
+        if self.liveness is not None:
+            release_locals(self.locals, self.liveness.finish(idx))
+        self.remaining -= 1
+        for dependent in self.dependents[idx]:
+            self.waiting[dependent] -= 1
+            if self.waiting[dependent] == 0:
+                self.ready.append(dependent)
+
+
 class LocalExecutor(Executor):
-    @abstractmethod
-    def resolve_local_value(self, _locals: Dict, value: Any) -> Any:
-        pass
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        resources: Optional[Union[Dict, Hardware]] = None,
+        cache: Optional[ResultCache] = None,
+        free_results: bool = True,
+        pinned: Optional[Sequence[Union[str, Component, Pipeline]]] = None,
+        memory_budget: Optional[Union[int, str]] = None,
+    ) -> None:
+        """
+        Args:
+            max_workers: Optional(int) If provided, independent components are run
+                concurrently using a pool with this many workers.  Otherwise, all
+                components are run sequentially, in the order they were traced.
+            resources: Optional(Dict | Hardware) Total hardware available to this
+                executor (e.g. 'host_hardware()' from 'unipipe.utils.resources').
+                If provided, components run concurrently, but each one is only
+                started when its declared 'hardware' fits in the remaining capacity.
+            cache: Optional(ResultCache) If provided, component results are cached
+                on disk.  Components are skipped when their function source, input
+                values and environment match a previous run.
+            free_results: (bool) If True, each result is released as soon as the
+                last component that reads it has finished, so that memory usage is
+                bounded by the results that are still needed.
+            pinned: Optional(Sequence[str | Component | Pipeline]) Results (or their
+                names) that are never released, even when 'free_results=True'.
+            memory_budget: Optional(int | str) Maximum size of the results held in
+                memory, in bytes or as a string like '8G'.  When it's exceeded, the
+                least recently used results are written to a temporary directory,
+                and loaded again when a component reads them.  Results that can't
+                be pickled always stay in memory.
+        """
+        self.max_workers = max_workers
+        self.resources = resources
+        self.cache = cache
+        self.free_results = free_results
+        self.pinned = {p if isinstance(p, str) else p.name for p in pinned or ()}
+        self.memory_budget = parse_memory(memory_budget)
+        self.artifact_store: Optional[ArtifactStore] = None
+        self.journal: Optional[RunJournal] = None
+        # ID of the most recent run with a journal (see 'open_journal').
+        self.run_id: Optional[str] = None
+
+    def resolve_local_value(self, _locals: Mapping[str, Any], value: Any) -> Any:
+        return compile_accessor(value)(_locals)
 
     @abstractmethod
     def run_component(self, component: Component, **kwargs):
@@ -23,27 +173,199 @@ class LocalExecutor(Executor):
 
     @abstractmethod
     def run_conditional_pipeline_with_locals(
-        self, pipeline: ConditionalPipeline, _locals: Dict[str, Any]
+        self, pipeline: ConditionalPipeline, _locals: MutableMapping[str, Any]
     ):
         pass
 
+    def check_return_type(self, component: Component, result: Any) -> Any:
+        return_type = component.return_type
+
+        if isclass(return_type):
+            if issubclass(return_type, tuple):
+                if isinstance(result, LazyRecord):
+                    # Fields were already type-checked when the record was written.
+                    return result.bind(return_type)
+                result = return_type(*result)
+            elif issubclass(return_type, str) and isinstance(result, str):
+                # e.g. 'Artifact' paths, which are plain strings after serialization
+                result = return_type(result)
+            if not isinstance(result, return_type):
+                raise TypeError(
+                    f"Component function {component.func.__name__}() expected a return "
+                    f"value of type '{return_type}', but found '{type(result)}'."
+                )
+
+        return result
+
+    def get_result_key(
+        self, component: Component, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Fingerprint of a component and its inputs, for looking up its result in
+        the journal or cache.  None if neither is used (or the inputs can't be
+        fingerprinted).  Computed once per component, and passed to both
+        'get_cached_result' and 'set_cached_result'.
+        """
+        if self.cache is None and self.journal is None:
+            return None
+        return get_cache_key(component, kwargs)
+
+    def has_cached_result(self, key: Optional[str]) -> bool:
+        """Whether the journal or cache has a result for 'key', without loading it."""
+        if key is None:
+            return False
+        return (self.journal is not None and key in self.journal) or (
+            self.cache is not None and key in self.cache
+        )
+
+    def get_cached_result(self, component: Component, key: Optional[str]) -> Any:
+        if key is None:
+            return MISSING
+
+        if self.journal is not None:
+            result = self.journal.get(key)
+            if result is not MISSING:
+                logging.info(f"[{component.name}] - (resumed) {result}")
+                return self.check_return_type(component, result)
+        if self.cache is None:
+            return MISSING
+
+        result = self.cache.get(key)
+        if result is MISSING:
+            return MISSING
+        logging.info(f"[{component.name}] - (cached) {result}")
+        return self.check_return_type(component, result)
+
+    def set_cached_result(
+        self, component: Component, key: Optional[str], result: Any
+    ) -> None:
+        if key is None:
+            return
+        if self.journal is not None:
+            self.journal.record(component.name, key, result)
+        if self.cache is not None:
+            self.cache.set(key, result)
+
+    def store_artifacts(self, component: Component, result: Any) -> Any:
+        if self.artifact_store is None:
+            return result
+        return self.artifact_store.store_outputs(result, component.return_type)
+
+    @contextmanager
+    def open_artifact_store(self, pipeline_root: Optional[str]) -> Iterator[None]:
+        """Stores artifacts under 'pipeline_root' for the duration of a run.  The
+        scratch directory is exposed through an environment variable, so that
+        'new_artifact_path' also works in worker processes.
+        """
+        if pipeline_root is None:
+            yield
+            return
+
+        self.artifact_store = ArtifactStore(pipeline_root)
+        previous = os.environ.get(ARTIFACT_SCRATCH_ENV)
+        os.environ[ARTIFACT_SCRATCH_ENV] = self.artifact_store.scratch_dir
+        try:
+            yield
+        finally:
+            if previous is None:
+                os.environ.pop(ARTIFACT_SCRATCH_ENV, None)
+            else:
+                os.environ[ARTIFACT_SCRATCH_ENV] = previous
+            self.artifact_store.cleanup()
+            self.artifact_store = None
+
+    @contextmanager
+    def open_journal(
+        self,
+        pipeline_root: Optional[str],
+        journal: bool = False,
+        resume: Optional[str] = None,
+    ) -> Iterator[None]:
+        """Records finished components in a journal under '<pipeline_root>/runs', so
+        that the run can be resumed (with 'resume=run_id') if it fails.  Journals are
+        opt-in (with 'journal=True', or implied by 'resume'), since every result is
+        pickled to disk.
+        """
+        if not journal and resume is None:
+            yield
+            return
+        elif pipeline_root is None:
+            if resume is not None:
+                raise ValueError(
+                    f"Must provide 'pipeline_root' to resume run '{resume}'."
+                )
+            raise ValueError("Must provide 'pipeline_root' to record a run journal.")
+
+        runs_dir = os.path.join(os.path.expanduser(pipeline_root), "runs")
+        self.journal = RunJournal(runs_dir, run_id=resume)
+        self.run_id = self.journal.run_id
+        if resume is None:
+            logging.info(f"Started run '{self.journal.run_id}'")
+        else:
+            logging.info(
+                f"Resuming run '{resume}' ({len(self.journal)} finished components)"
+            )
+        try:
+            yield
+        except BaseException:
+            logging.error(
+                f"Run '{self.journal.run_id}' failed.  Pass this ID as 'resume' to "
+                "continue from where it stopped."
+            )
+            raise
+        finally:
+            self.journal = None
+
+    @contextmanager
+    def open_locals(self, inputs: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Locals for running a pipeline.  With a 'memory_budget', results are
+        spilled to a temporary directory, which is removed when the run finishes.
+        """
+        if self.memory_budget is None:
+            yield inputs
+            return
+
+        spill_dir = tempfile.mkdtemp(prefix="unipipe-spill-")
+        try:
+            yield SpillingLocals(inputs, Spiller(self.memory_budget, spill_dir))
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    def get_liveness(self, pipeline: Pipeline) -> Optional[Liveness]:
+        if not self.free_results:
+            return None
+        return Liveness(pipeline, pinned=self.pinned)
+
+    def evaluate_condition(
+        self, pipeline: ConditionalPipeline, _locals: MutableMapping[str, Any]
+    ) -> bool:
+        operand1 = self.resolve_local_value(_locals, pipeline.condition.operand1)
+        operand2 = self.resolve_local_value(_locals, pipeline.condition.operand2)
+        comparator = pipeline.condition.comparator
+        return comparator(operand1, operand2)
+
     def run_pipeline_with_locals(
-        self, pipeline: Pipeline, _locals: Dict[str, Any]
-    ) -> Tuple[Any, Dict[str, Any]]:
-        for component in pipeline.components:
-            kwargs = {
-                k: self.resolve_local_value(_locals, v)
-                for k, v in component.inputs.items()
-            }
-            __locals = {**_locals, **kwargs}
+        self, pipeline: Pipeline, _locals: MutableMapping[str, Any]
+    ) -> Tuple[Any, MutableMapping[str, Any]]:
+        liveness = self.get_liveness(pipeline)
+        for idx, component in enumerate(pipeline.components):
+            kwargs = resolve_inputs(component, _locals)
             if isinstance(component, ConditionalPipeline):
+                scope = child_locals(_locals, kwargs)
                 result, _ = self.run_conditional_pipeline_with_locals(
-                    component, _locals=__locals
+                    component, _locals=scope
                 )
+                release_scope(scope)
             elif isinstance(component, Pipeline):
-                result, _ = self.run_pipeline_with_locals(component, _locals=__locals)
+                scope = child_locals(_locals, kwargs)
+                result, _ = self.run_pipeline_with_locals(component, _locals=scope)
+                release_scope(scope)
             elif isinstance(component, Component):
-                result = self.run_component(component, **kwargs)
+                key = self.get_result_key(component, kwargs)
+                result = self.get_cached_result(component, key)
+                if result is MISSING:
+                    result = self.run_component(component, **kwargs)
+                    result = self.store_artifacts(component, result)
+                    self.set_cached_result(component, key, result)
             else:
                 raise TypeError(
                     f"Found pipeline component {component} with unexpected type: "
@@ -52,12 +374,185 @@ class LocalExecutor(Executor):
                 )
 
             _locals[component.name] = result
+            if liveness is not None:
+                release_locals(_locals, liveness.finish(idx))
 
         return_value = self.resolve_local_value(_locals, pipeline.return_value)
         return return_value, _locals
 
-    def run(self, pipeline: Pipeline, pipeline_root: Optional[str] = None):
-        return_value, _ = self.run_pipeline_with_locals(
-            pipeline, _locals=pipeline.inputs
-        )
+    def get_pool(self) -> PoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def submit_component(
+        self,
+        pool: PoolExecutor,
+        component: Component,
+        kwargs: Dict[str, Any],
+        allocation: Optional[Allocation] = None,
+    ) -> Future:
+        return pool.submit(self.run_component, component, **kwargs)
+
+    def collect_component(self, component: Component, future: Future) -> Any:
+        return future.result()
+
+    def _advance_frame(
+        self,
+        frame: PipelineFrame,
+        frames: List[PipelineFrame],
+        submit: Callable[[PipelineFrame, int, Component, Dict[str, Any]], None],
+    ) -> None:
+        """Starts all components in 'frame' that are ready to run.  Components are
+        handed to 'submit', and nested pipelines are appended to 'frames'.  When the
+        frame is finished, its parent is appended to 'frames' instead.
+        """
+        while frame.ready:
+            idx = frame.ready.popleft()
+            component = frame.pipeline.components[idx]
+            kwargs = resolve_inputs(component, frame.locals)
+
+            if isinstance(component, Pipeline):
+                __locals = child_locals(frame.locals, kwargs)
+                if isinstance(component, ConditionalPipeline):
+                    if not self.evaluate_condition(component, __locals):
+                        frame.finish(idx, None)
+                        continue
+                frames.append(
+                    PipelineFrame(
+                        component,
+                        __locals,
+                        parent=(frame, idx),
+                        liveness=self.get_liveness(component),
+                    )
+                )
+            elif isinstance(component, Component):
+                submit(frame, idx, component, kwargs)
+            else:
+                raise TypeError(
+                    f"Found pipeline component {component} with unexpected type: "
+                    f"{type(component)}. Valid component types are "
+                    "[Component, ConditionalPipeline, Pipeline]."
+                )
+
+        if frame.remaining == 0 and not frame.done:
+            frame.done = True
+            return_value = self.resolve_local_value(
+                frame.locals, frame.pipeline.return_value
+            )
+            if frame.parent is not None:
+                release_scope(frame.locals)
+                parent, idx = frame.parent
+                parent.finish(idx, return_value)
+                frames.append(parent)
+            else:
+                frame.return_value = return_value
+
+    def run_pipeline_concurrently(
+        self, pipeline: Pipeline, _locals: MutableMapping[str, Any]
+    ) -> Tuple[Any, MutableMapping[str, Any]]:
+        """Runs each component as soon as all of its inputs have been resolved,
+        rather than in trace order.  Nested pipelines are expanded in place, so
+        their components share the same pool of workers.
+        """
+        root = PipelineFrame(pipeline, _locals, liveness=self.get_liveness(pipeline))
+        futures: Dict[
+            Future, Tuple[PipelineFrame, int, Optional[str], Optional[Allocation]]
+        ]
+        futures = {}
+        frames = [root]
+        resources = None if self.resources is None else ResourcePool(self.resources)
+        queued: List[
+            Tuple[PipelineFrame, int, Component, Dict, Optional[str], Resources]
+        ] = []
+
+        with self.get_pool() as pool:
+
+            def start(frame, idx, component, kwargs, key, allocation=None):
+                future = self.submit_component(pool, component, kwargs, allocation)
+                futures[future] = (frame, idx, key, allocation)
+
+            def submit(frame, idx, component, kwargs):
+                key = self.get_result_key(component, kwargs)
+                cached = self.get_cached_result(component, key)
+                if cached is not MISSING:
+                    frame.finish(idx, cached)
+                    frames.append(frame)
+                elif resources is not None:
+                    request = resources.request(component.hardware)
+                    queued.append((frame, idx, component, kwargs, key, request))
+                else:
+                    start(frame, idx, component, kwargs, key)
+
+            def admit():
+                # Start queued components in order, but allow smaller components to
+                # run ahead of larger ones that don't fit yet.
+                assert resources is not None
+                waiting = []
+                for frame, idx, component, kwargs, key, request in queued:
+                    allocation = resources.acquire(request)
+                    if allocation is None:
+                        waiting.append((frame, idx, component, kwargs, key, request))
+                    else:
+                        start(frame, idx, component, kwargs, key, allocation=allocation)
+                queued[:] = waiting
+
+            try:
+                while True:
+                    while frames:
+                        self._advance_frame(frames.pop(), frames, submit)
+                    if resources is not None:
+                        admit()
+                    if root.done:
+                        break
+
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        frame, idx, key, allocation = futures.pop(future)
+                        if resources is not None and allocation is not None:
+                            resources.release(allocation)
+                        component = frame.pipeline.components[idx]
+                        assert isinstance(component, Component)
+                        result = self.collect_component(component, future)
+                        result = self.store_artifacts(component, result)
+                        self.set_cached_result(component, key, result)
+                        frame.finish(idx, result)
+                        frames.append(frame)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return root.return_value, root.locals
+
+    def run(
+        self,
+        pipeline: Pipeline,
+        pipeline_root: Optional[str] = None,
+        journal: bool = False,
+        resume: Optional[str] = None,
+    ):
+        """
+        Args:
+            pipeline: (Pipeline) Traced pipeline to run.
+            pipeline_root: Optional(str) Local directory for artifacts and run
+                journals.
+            journal: (bool) If True, finished components are recorded in a journal
+                under 'pipeline_root', so that a failed run can be resumed.
+            resume: Optional(str) ID of a previous run (under 'pipeline_root') to
+                resume.  Components that finished in that run are not run again.
+                Implies 'journal=True'.
+        """
+        with self.open_artifact_store(pipeline_root):
+            with self.open_journal(pipeline_root, journal=journal, resume=resume):
+                return self.run_pipeline(pipeline)
+
+    def run_pipeline(self, pipeline: Pipeline):
+        with self.open_locals(pipeline.inputs) as _locals:
+            if self.max_workers is None and self.resources is None:
+                return_value, _ = self.run_pipeline_with_locals(
+                    pipeline, _locals=_locals
+                )
+            else:
+                return_value, _ = self.run_pipeline_concurrently(
+                    pipeline, _locals=_locals
+                )
         return return_value
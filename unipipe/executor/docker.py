@@ -1,26 +1,84 @@
+import hashlib
 import json
 import logging
 import os
+import shlex
+import shutil
+import subprocess
 import sys
 import tempfile
-import textwrap
-from inspect import getsource, isclass
-from itertools import dropwhile
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Executor as PoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import Enum
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from docker.client import DockerClient
-from docker.errors import BuildError
+from docker.errors import APIError, BuildError, ImageNotFound
+from docker.models.images import Image
 from docker.types import DeviceRequest
+from docker.utils import parse_repository_tag
+from pydantic import BaseModel
 
-from unipipe.dsl import Component, ConditionalPipeline, LazyAttribute, Pipeline
+import unipipe
+from unipipe.dsl import (
+    Component,
+    ConditionalPipeline,
+    Hardware,
+    Pipeline,
+)
 from unipipe.executor.base import LocalExecutor
-from unipipe.utils.compat import get_annotations
+from unipipe.utils.accessors import resolve_inputs
+from unipipe.utils.annotations import to_builtin
+from unipipe.utils.arrays import decode_arrays, encode_arrays, is_ndarray_type
+from unipipe.utils.artifacts import ARTIFACT_SCRATCH_ENV
+from unipipe.utils.cache import ResultCache, default_cache_root
+from unipipe.utils.compat import get_package_version
+from unipipe.utils.files import atomic_write
+from unipipe.utils.graph import iter_components
+from unipipe.utils.records import materialize_records
+from unipipe.utils.resources import Allocation
+from unipipe.utils.serializers import (
+    Serializer,
+    dump_values,
+    get_serializer,
+    is_encoded_record,
+    load_record,
+)
+from unipipe.utils.signatures import get_signature
+from unipipe.utils.source import get_component_func_source
+from unipipe.utils.tables import is_arrow_table_type, is_dataframe_type
+from unipipe.utils.wheel import (
+    REQUIREMENTS,
+    build_unipipe_wheel,
+    get_source_digest,
+)
 
 if sys.version_info >= (3, 8):
     from typing import TypedDict  # pylint: disable=no-name-in-module
 else:
     from typing_extensions import TypedDict
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
 
 IMPORTS = """
 import typing
@@ -32,98 +90,378 @@ from unipipe.dsl import *
 from unipipe.utils.ops import dispatch
 """
 
+# Array annotations (e.g. 'np.ndarray') are evaluated in the generated script.
+ARRAY_IMPORTS = """
+import numpy
+import numpy as np
+"""
+
+# Likewise for table annotations (e.g. 'pa.Table' or 'pd.DataFrame').
+ARROW_IMPORTS = """
+import pyarrow
+import pyarrow as pa
+"""
+PANDAS_IMPORTS = """
+import pandas
+import pandas as pd
+"""
+
 LOGGING = """
 import logging
 logging.getLogger().setLevel({logging_level})
 """
 
-ARGPARSE_LIST = "argparse_list"
 COMMAND = """
-import argparse
-import ast
-import json
-
-def {argparse_list}(s):
-    data = ast.literal_eval(s)
-    return [str(x) for x in data]
+import asyncio
+import inspect
+import os
 
-parser = argparse.ArgumentParser()
-{arguments}
-args = parser.parse_args()
+from unipipe.utils.arrays import decode_arrays, encode_arrays, is_ndarray_type
+from unipipe.utils.serializers import dump_record, get_serializer, load_values
 
-output = {function_name}(**vars(args))
+serializer = get_serializer({serializer!r})
+kwargs = load_values({inputs_dir!r}, serializer=serializer)
+kwargs = decode_arrays(kwargs, {arrays_dir!r})
+output = {function_name}(**kwargs)
 if isinstance(output, dsl.Component):
-    output = output.func(**vars(args))
+    output = output.func(**kwargs)
+if inspect.iscoroutine(output):
+    output = asyncio.run(output)
+if hasattr(output, "_fields") and os.path.isdir({arrays_dir!r}):
+    # Multi-output results are written one field per file, and loaded lazily.
+    output = dump_record(output, {arrays_dir!r}, serializer)
 
-with open('/app/output.json', "w") as f:
-    json.dump(dict(output=output), f)
+serializer.dump_file(encode_arrays(output, {arrays_dir!r}), {output_path!r})
 """
 
+# Shared directory for '.npy' and Arrow IPC files (see 'unipipe.utils.arrays').
+# Arrays and tables are written once, and memory-mapped by every container that
+# reads them.
+ARRAYS_DIR = "/unipipe/arrays"
 
-def _get_component_func_source(func: Callable) -> str:
-    """Largely copy-pasta from 'kfp.v2'.  De-indents the function source code, and
-    removes any decorators or other code preceding the 'def' statement.  Then,
-    decorate the function with just '@dsl.component', so we can utilize type
-    checking/casting, logging, etc. from the Component class.
-    """
-    # Function may be defined in another function/class. Dedent the source code.
-    lines = textwrap.dedent(getsource(func)).split("\n")
-    lines = list(dropwhile(lambda x: not x.startswith("def"), lines))
-
-    if not lines:
-        raise ValueError(
-            'Failed to dedent and clean up the source of function "{}". '
-            "It is probably not properly indented.".format(func.__name__)
-        )
 
-    return "\n".join(["@dsl.component", *lines])
-
-
-def _get_argparse_argument(name: str, annotation: Type) -> str:
-    if hasattr(annotation, "__name__"):
-        if annotation in (List[str], Tuple[str]):
-            # As of Python 3.10, the List/Tuple classes have a '__name__' property
-            args = f"type={ARGPARSE_LIST}"
-        else:
-            args = f"type={annotation.__name__}"
-    elif hasattr(annotation, "_name"):
-        args = f"type={ARGPARSE_LIST}"
-    else:
-        raise TypeError(f"Could not determine a valid type string for '{annotation}'.")
-
-    return f"parser.add_argument('--{name}', {args})"
-
-
-def build_script(component: Component) -> str:
+def build_script(
+    component: Component,
+    serializer: Optional[str] = None,
+    inputs_dir: str = "/app/inputs",
+    output_path: str = "/app/output.json",
+    arrays_dir: str = ARRAYS_DIR,
+) -> str:
     _logging = LOGGING.format(logging_level=component.logging_level)
-    function = _get_component_func_source(component.func)
-    annotations = get_annotations(component.func, eval_str=True)
-    argument_lines = [
-        _get_argparse_argument(name=k, annotation=v)
-        for k, v in annotations.items()
-        if k != "return"
-    ]
+    function = get_component_func_source(component.func)
     command = COMMAND.format(
-        argparse_list=ARGPARSE_LIST,
-        arguments="\n".join(argument_lines),
+        serializer=get_serializer(serializer).name,
+        inputs_dir=inputs_dir,
+        output_path=output_path,
+        arrays_dir=arrays_dir,
         function_name=component.func.__name__,
     )
-    return "\n".join([IMPORTS, _logging, function, command])
+    imports = IMPORTS
+    annotations = get_signature(component.func).annotations
+    types = [getattr(t, "__origin__", t) for t in annotations.values()]
+    if any(is_ndarray_type(t) for t in types):
+        imports += ARRAY_IMPORTS
+    if any(is_arrow_table_type(t) for t in types):
+        imports += ARROW_IMPORTS
+    if any(is_dataframe_type(t) for t in types):
+        imports += PANDAS_IMPORTS
+    return "\n".join([imports, _logging, function, command])
+
 
+def write_job(
+    job_dir: str,
+    component: Component,
+    arguments: Dict[str, Any],
+    serializer: Serializer,
+    container_dir: str = "/app",
+    arrays_dir: Optional[str] = None,
+    container_arrays_dir: str = ARRAYS_DIR,
+) -> None:
+    """Writes the script and input values for running 'component' to 'job_dir',
+    which is mounted at 'container_dir' inside the container.  Inputs are passed
+    through files (one per argument), so large values never end up in the container
+    command, and lists are encoded/decoded one item at a time.  Arrays and tables
+    are saved to 'arrays_dir' (mounted at 'container_arrays_dir'), unless they are
+    already stored there.  Multi-output results are written there too (one file per
+    field), so that 'read_job_output' can load each field lazily.
+    """
+    output_file = f"output{serializer.extension}"
+    script = build_script(
+        component,
+        serializer=serializer.name,
+        inputs_dir=f"{container_dir}/inputs",
+        output_path=f"{container_dir}/{output_file}",
+        arrays_dir=container_arrays_dir,
+    )
+    with open(os.path.join(job_dir, "main.py"), "w") as f:
+        f.write(script)
+    # Records are only passed as a whole, when a component takes the entire output
+    # of a multi-output component.
+    arguments = to_builtin(arguments)
+    if arrays_dir is not None:
+        arguments = encode_arrays(arguments, arrays_dir)
+    dump_values(arguments, os.path.join(job_dir, "inputs"), serializer=serializer)
+
+
+def read_job_output(
+    job_dir: str, serializer: Serializer, arrays_dir: Optional[str] = None
+) -> Any:
+    output = serializer.load_file(
+        os.path.join(job_dir, f"output{serializer.extension}")
+    )
+    if arrays_dir is not None:
+        if is_encoded_record(output):
+            return load_record(output, arrays_dir, serializer=serializer)
+        output = decode_arrays(output, arrays_dir)
+    return output
 
-# TODO: Once stable release is available in PyPI:
-#   +++ pip install unipipe
-#   --- pip install ./unipipe
 
+# The build context only contains the Dockerfile, a 'unipipe' wheel (built from the
+# local copy of 'unipipe') and an optional wheelhouse -- not the current working
+# directory, which may be arbitrarily large.
+#
+# Layers are ordered from least to most frequently changed.  Third-party packages
+# (including the dependencies of 'unipipe') are installed before copying the
+# 'unipipe' wheel, so that editing 'unipipe' does not reinstall them.
 DOCKERFILE = """
 FROM {base_image}
 
 WORKDIR /app
-COPY ./ ./unipipe
-RUN pip install ./unipipe
-RUN pip install {packages}
+{copy_wheelhouse}
+RUN {pip_cache_mount}pip install {install_options} {packages}
+COPY {wheel} /tmp/
+RUN pip install --no-deps /tmp/{wheel} && rm /tmp/{wheel}
 """
 
+WHEELHOUSE_DIR = "wheelhouse"
+PIP_CACHE_MOUNT = "--mount=type=cache,target=/root/.cache/pip "
+
+
+class PullPolicy(str, Enum):
+    """When to pull base images from their registry (as in Kubernetes)."""
+
+    ALWAYS = "Always"
+    IF_NOT_PRESENT = "IfNotPresent"
+    NEVER = "Never"
+
+
+class BuildOptions(BaseModel):
+    """Options for building component images.
+
+    Attributes:
+        pull_policy: (PullPolicy) When to pull base images.
+        buildkit: (bool) Build with BuildKit (through the 'docker' CLI), and keep
+            pip's download cache in a cache mount that persists across builds.
+        wheelhouse: Optional(str) Local directory of wheels.  If given, packages are
+            installed from it ('--no-index'), so builds work on offline hosts.
+        skip_builds: (bool) Run components without extra packages directly in
+            their base image.  Disabled by default, since the base image must
+            provide the dependencies of 'unipipe'.  See 'get_component_image'.
+    """
+
+    pull_policy: PullPolicy = PullPolicy.IF_NOT_PRESENT
+    buildkit: bool = False
+    wheelhouse: Optional[str] = None
+    skip_builds: bool = False
+
+
+def build_dockerfile(
+    component: Component, wheel: str, options: Optional[BuildOptions] = None
+) -> str:
+    if options is None:
+        options = BuildOptions()
+
+    install_options: List[str] = []
+    copy_wheelhouse = ""
+    if options.wheelhouse is not None:
+        copy_wheelhouse = f"COPY {WHEELHOUSE_DIR} /tmp/{WHEELHOUSE_DIR}"
+        install_options.append(f"--no-index --find-links /tmp/{WHEELHOUSE_DIR}")
+    elif component.pip_index_urls:
+        index_url, *extra_index_urls = component.pip_index_urls
+        install_options.append(f"--index-url {index_url} --trusted-host {index_url}")
+        install_options.extend(
+            [f"--extra-index-url {i} --trusted-host {i}" for i in extra_index_urls]
+        )
+    if not options.buildkit:
+        install_options.append("--no-cache-dir")
+
+    packages = [*(component.packages_to_install or []), *REQUIREMENTS]
+    return DOCKERFILE.format(
+        base_image=component.base_image,
+        copy_wheelhouse=copy_wheelhouse,
+        pip_cache_mount=PIP_CACHE_MOUNT if options.buildkit else "",
+        install_options=" ".join(install_options),
+        packages=" ".join(shlex.quote(p) for p in packages),
+        wheel=wheel,
+    )
+
+
+IMAGE_REPOSITORY = "unipipe-component"
+IMAGE_LABEL = "unipipe.environment"
+BASE_IMAGE_LABEL = "unipipe.base-image-id"
+
+
+def get_environment_digest(component: Component) -> str:
+    """Hash of everything that goes into a component's Docker image.  Components
+    with the same environment share a single image, which is reused across runs.
+    """
+    data = {
+        "base_image": component.base_image,
+        "packages_to_install": component.packages_to_install,
+        "pip_index_urls": component.pip_index_urls,
+        "unipipe": get_package_version("unipipe"),
+        "unipipe_source": get_source_digest(),
+    }
+    encoded = json.dumps(data, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_image_tag(component: Component) -> str:
+    return f"{IMAGE_REPOSITORY}:{get_environment_digest(component)[:16]}"
+
+
+_BUILD_LOCKS: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_BUILD_LOCKS_LOCK = threading.Lock()
+
+
+def _get_build_lock(tag: str) -> threading.Lock:
+    # Components that share an environment may be built concurrently.  Only build
+    # each image once, and make the other threads wait for it.
+    with _BUILD_LOCKS_LOCK:
+        return _BUILD_LOCKS[tag]
+
+
+def _get_image(client: DockerClient, tag: str) -> Optional[Image]:
+    try:
+        return client.images.get(tag)
+    except ImageNotFound:
+        return None
+
+
+def get_base_image(
+    client: DockerClient,
+    base_image: str,
+    pull_policy: PullPolicy = PullPolicy.IF_NOT_PRESENT,
+) -> Image:
+    """Returns the local copy of 'base_image', pulling it first if required by the
+    pull policy.  Image builds never pull, so with 'IfNotPresent' (the default) and
+    'Never', builds from locally available base images do not touch the network.
+    """
+    image = None if pull_policy == PullPolicy.ALWAYS else _get_image(client, base_image)
+    if image is not None:
+        return image
+    elif pull_policy == PullPolicy.NEVER:
+        raise ImageNotFound(
+            f"Base image '{base_image}' is not available locally, and cannot be "
+            f"pulled with pull_policy='{PullPolicy.NEVER.value}'."
+        )
+
+    repository, tag = parse_repository_tag(base_image)
+    logging.info(f"Pulling Docker image: '{base_image}'")
+    return client.images.pull(repository, tag=tag or "latest")
+
+
+def _image_index_path() -> str:
+    return os.path.join(default_cache_root(), "images.json")
+
+
+_IMAGE_INDEX_LOCK = threading.Lock()
+
+
+@contextmanager
+def _lock_image_index() -> Iterator[None]:
+    # The index is shared by every process on the host, so hold a file lock (where
+    # supported) in addition to the lock for threads in this process.
+    path = _image_index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _IMAGE_INDEX_LOCK, open(f"{path}.lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _load_image_index() -> Dict[str, float]:
+    try:
+        with open(_image_index_path(), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_image_index(index: Dict[str, float]):
+    with atomic_write(_image_index_path(), mode="w") as f:
+        json.dump(index, f)
+
+
+def record_image_use(tag: str):
+    """Records when each image was last used, for garbage collection."""
+    with _lock_image_index():
+        index = _load_image_index()
+        index[tag] = time.time()
+        _save_image_index(index)
+
+
+def prune_images(
+    max_images: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+    keep: Collection[str] = (),
+) -> List[str]:
+    """Removes component images built by 'unipipe', starting with the least recently
+    used.  Keeps at most 'max_images' images, and removes images that have not been
+    used in 'max_age_days'.  Images used by existing containers are kept.
+
+    Args:
+        max_images: Optional(int) Maximum number of images to keep.
+        max_age_days: Optional(float) Remove images not used in this many days.
+        keep: (Collection[str]) Tags that are never removed (e.g. the images used
+            by the current run).  They still count towards 'max_images'.
+
+    Returns:
+        List of removed image tags.
+    """
+    client = DockerClient.from_env()
+    with _lock_image_index():
+        index = _load_image_index()
+        tags = [
+            tag
+            for image in client.images.list(filters={"label": IMAGE_LABEL})
+            for tag in image.tags
+            if tag.startswith(f"{IMAGE_REPOSITORY}:")
+        ]
+        now = time.time()
+        # Images missing from the index (e.g. built by an older version, or by a
+        # process that has not recorded them yet) are treated as just used.
+        for tag in tags:
+            index.setdefault(tag, now)
+        # Most recently used first.
+        tags.sort(key=lambda t: (t in keep, index[t]), reverse=True)
+
+        removed = []
+        for i, tag in enumerate(tags):
+            if tag in keep:
+                continue
+            too_many = max_images is not None and i >= max_images
+            too_old = (
+                max_age_days is not None
+                and now - index[tag] > max_age_days * 24 * 60 * 60
+            )
+            if not (too_many or too_old):
+                continue
+            try:
+                client.images.remove(tag, noprune=False)
+                removed.append(tag)
+                index.pop(tag, None)
+            except APIError as e:
+                logging.debug(f"Could not remove Docker image '{tag}': {e}")
+
+        _save_image_index(index)
+
+    return removed
+
 
 def _record_build_logs(logs: Iterable[Dict[str, str]], level: int):
     for line in logs:
@@ -131,52 +469,214 @@ def _record_build_logs(logs: Iterable[Dict[str, str]], level: int):
             logging.log(level=level, msg=line["stream"])
 
 
-def build_docker_image(component: Component, tag: str):
-    base_image = component.base_image
-    logging.info(f"Building Docker image: ('tag={tag}', 'base_image={base_image}')")
+def build_docker_image(
+    component: Component,
+    tag: str,
+    force: bool = False,
+    options: Optional[BuildOptions] = None,
+):
+    if options is None:
+        options = BuildOptions()
+
     client = DockerClient.from_env()
+    with _get_build_lock(tag):
+        image = None if force else _get_image(client, tag)
+        if image is not None and options.pull_policy != PullPolicy.ALWAYS:
+            logging.debug(f"Using existing Docker image: '{tag}'")
+            return tag
 
-    # If no packages listed, just include 'pip' as a placeholder
-    install_options = component.packages_to_install or ["pip"]
-    if component.pip_index_urls:
-        index_url, *extra_index_urls = component.pip_index_urls
-        install_options.append(f"--index-url {index_url} --trusted-host {index_url}")
-        install_options.extend(
-            [f"--extra-index-url {i} --trusted-host {i}" for i in extra_index_urls]
+        # Only rebuild after a pull if the base image actually changed.
+        base_image = get_base_image(client, component.base_image, options.pull_policy)
+        if image is not None and image.labels.get(BASE_IMAGE_LABEL) == base_image.id:
+            logging.debug(f"Using existing Docker image: '{tag}'")
+            return tag
+
+        labels = {IMAGE_LABEL: tag, BASE_IMAGE_LABEL: base_image.id}
+        return _build_docker_image(
+            client, component, tag=tag, labels=labels, options=options
         )
 
-    packages = " ".join(install_options)
-    dockerfile = DOCKERFILE.format(base_image=base_image, packages=packages)
+
+UNIPIPE_SOURCE_DIR = "/opt/unipipe"
+
+
+class ComponentImage(NamedTuple):
+    tag: str
+    # Extra volumes and environment variables for running the image.
+    volumes: Dict[str, Dict[str, str]] = {}
+    environment: Dict[str, str] = {}
+
+
+def needs_build(component: Component) -> bool:
+    return bool(component.packages_to_install or component.pip_index_urls)
+
+
+def get_environment_key(
+    component: Component, options: Optional[BuildOptions] = None
+) -> str:
+    """Components with the same key run in the same image (see
+    'get_component_image'), so each image only needs to be resolved once.
+    """
+    if options is not None and options.skip_builds and not needs_build(component):
+        return component.base_image
+    return get_image_tag(component)
+
+
+def get_component_image(
+    component: Component, options: Optional[BuildOptions] = None
+) -> ComponentImage:
+    """Returns the image to run 'component' in, building it if necessary.
+
+    With 'options.skip_builds', components without extra packages run directly in
+    their base image, and the local copy of 'unipipe' is mounted into the container.
+    This skips the image build entirely (e.g. for all components created by
+    'unipipe.utils.ops').
+    """
+    if options is None:
+        options = BuildOptions()
+
+    if not options.skip_builds or needs_build(component):
+        tag = build_docker_image(
+            component, tag=get_image_tag(component), options=options
+        )
+        record_image_use(tag)
+        return ComponentImage(tag=tag)
+
+    client = DockerClient.from_env()
+    get_base_image(client, component.base_image, options.pull_policy)
+    source_dir = os.path.dirname(os.path.abspath(unipipe.__file__))
+    return ComponentImage(
+        tag=component.base_image,
+        volumes={source_dir: {"bind": f"{UNIPIPE_SOURCE_DIR}/unipipe", "mode": "ro"}},
+        environment={"PYTHONPATH": UNIPIPE_SOURCE_DIR},
+    )
+
+
+def _get_directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(dirpath, filename))
+        for dirpath, _, filenames in os.walk(path)
+        for filename in filenames
+    )
+
+
+def _build_docker_image(
+    client: DockerClient,
+    component: Component,
+    tag: str,
+    labels: Dict[str, str],
+    options: BuildOptions,
+):
+    base_image = component.base_image
+    logging.info(f"Building Docker image: ('tag={tag}', 'base_image={base_image}')")
 
     with tempfile.TemporaryDirectory() as tempdir:
-        dockerfile_path = os.path.join(tempdir, "Dockerfile")
-        with open(dockerfile_path, "w") as f:
-            f.write(dockerfile)
+        wheel_path = build_unipipe_wheel(os.path.join(default_cache_root(), "wheels"))
+        wheel = os.path.basename(wheel_path)
+        shutil.copy(wheel_path, os.path.join(tempdir, wheel))
+        if options.wheelhouse is not None:
+            shutil.copytree(
+                os.path.expanduser(options.wheelhouse),
+                os.path.join(tempdir, WHEELHOUSE_DIR),
+            )
+        with open(os.path.join(tempdir, "Dockerfile"), "w") as f:
+            f.write(build_dockerfile(component, wheel=wheel, options=options))
+
+        context_size = _get_directory_size(tempdir)
+        logging.info(f"Docker build context for '{tag}': {context_size / 1024:.1f} KB")
+        if options.buildkit:
+            _buildkit_build(tempdir, tag=tag, labels=labels)
+            return tag
+
         try:
             _, logs = client.images.build(
-                path="./", dockerfile=dockerfile_path, tag=tag, pull=True, rm=True
+                path=tempdir,
+                dockerfile="Dockerfile",
+                tag=tag,
+                pull=False,
+                rm=True,
+                labels=labels,
             )
-            level = logging.DEBUG
         except BuildError as e:
-            logs = e.build_log
-            level = logging.ERROR
+            _record_build_logs(e.build_log, level=logging.ERROR)
+            raise
 
-    _record_build_logs(logs, level=level)
+    _record_build_logs(logs, level=logging.DEBUG)
     return tag
 
 
+def _buildkit_build(path: str, tag: str, labels: Dict[str, str]):
+    # The Docker SDK only supports the legacy builder, which does not understand
+    # cache mounts.  Use the 'docker' CLI instead.
+    command = ["docker", "build", "--tag", tag, path]
+    for key, value in labels.items():
+        command[2:2] = ["--label", f"{key}={value}"]
+    result = subprocess.run(
+        command,
+        env={**os.environ, "DOCKER_BUILDKIT": "1"},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    if result.returncode != 0:
+        logging.error(result.stdout)
+        raise BuildError(
+            reason=f"'docker build' failed with exit code {result.returncode}",
+            build_log=[{"stream": line} for line in result.stdout.splitlines(True)],
+        )
+    logging.debug(result.stdout)
+
+
 class Volume(TypedDict):
     bind: str
     mode: str
 
 
-def _get_cli_argument(name: str, value: Any) -> str:
-    if isinstance(value, (list, tuple)):
-        arg_strings = [f"'{v}'" for v in value]
-        arg_list_string = "[" + ", ".join(arg_strings) + "]"
-        return f'--{name}="{arg_list_string}"'
+def get_device_ids(
+    component: Component, device_ids: Optional[Sequence[int]] = None
+) -> Tuple[int, ...]:
+    accelerator = component.hardware.accelerator
+    if accelerator is None or not accelerator.count:
+        return ()
+    elif device_ids is None:
+        return tuple(range(int(accelerator.count)))
     else:
-        return f"--{name}='{value}'"
+        return tuple(device_ids)
+
+
+def get_device_requests(
+    component: Component, device_ids: Optional[Sequence[int]] = None
+) -> List[DeviceRequest]:
+    # TODO:
+    #   - Make this logic work for TPUs as well
+    return _get_gpu_device_requests(get_device_ids(component, device_ids=device_ids))
+
+
+def _get_gpu_device_requests(device_ids: Sequence[int]) -> List[DeviceRequest]:
+    if not device_ids:
+        return []
+    return [
+        DeviceRequest(
+            device_ids=[",".join([str(i) for i in device_ids])],
+            capabilities=[["gpu"]],
+        )
+    ]
+
+
+def _default_volumes() -> Dict[str, Union[Dict, Volume]]:
+    volumes: Dict[str, Union[Dict, Volume]] = {}
+    config_path = os.path.expanduser("~/.config/")
+    if os.path.exists(config_path):
+        volumes[config_path] = {"bind": "/root/.config/", "mode": "ro"}
+    return volumes
+
+
+def _print_log_line(component: Component, line: str):
+    # Prefix each line with the component name, since logs from concurrently
+    # running containers are interleaved.
+    line = line.strip()
+    if line:
+        print(f"[{component.name}] {line}")
 
 
 def build_and_run(
@@ -184,122 +684,553 @@ def build_and_run(
     arguments: Optional[Dict[str, Any]] = None,
     volumes: Optional[Dict[str, Union[Dict, Volume]]] = None,
     remove: bool = True,
+    device_ids: Optional[Sequence[int]] = None,
+    build_options: Optional[BuildOptions] = None,
+    serializer: Optional[str] = None,
+    arrays_dir: Optional[str] = None,
+    environment: Optional[Dict[str, str]] = None,
+    image: Optional[ComponentImage] = None,
 ):
     client = DockerClient.from_env()
-    tag = build_docker_image(component, tag=component.name)
+    if image is None:
+        image = get_component_image(component, options=build_options)
     if arguments is None:
         arguments = {}
 
     if volumes is None:
         volumes = {}
 
-    config_path = os.path.expanduser("~/.config/")
-    if os.path.exists(config_path) and config_path not in volumes:
-        volumes[config_path] = {"bind": "/root/.config/", "mode": "ro"}
+    volumes = {**_default_volumes(), **image.volumes, **volumes}
 
+    _serializer = get_serializer(component.serializer or serializer)
     with tempfile.TemporaryDirectory() as tempdir:
-        script_path = os.path.join(tempdir, "main.py")
-        output_json = os.path.join(tempdir, "output.json")
-        script = build_script(component)
-        with open(script_path, "w") as f:
-            f.write(script)
-
-        volumes[tempdir] = {"bind": "/app/", "mode": "rw"}
-        args = " ".join(
-            [_get_cli_argument(name=k, value=v) for k, v in arguments.items()]
+        if arrays_dir is None:
+            arrays_dir = os.path.join(tempdir, "arrays")
+            os.makedirs(arrays_dir)
+        write_job(
+            tempdir, component, arguments, serializer=_serializer, arrays_dir=arrays_dir
         )
+        volumes[tempdir] = {"bind": "/app/", "mode": "rw"}
+        volumes[arrays_dir] = {"bind": ARRAYS_DIR, "mode": "rw"}
 
-        device_requests = []
-        accelerator = component.hardware.accelerator
-        if accelerator is not None and accelerator.count:
-            # TODO:
-            #   - Make this logic work for TPUs as well
-            #   - Allow users to pick specific device IDs?
-            device_ids = list(range(int(accelerator.count)))
-            device_requests.append(
-                DeviceRequest(
-                    device_ids=[",".join([str(i) for i in device_ids])],
-                    capabilities=[["gpu"]],
-                )
-            )
-
+        device_requests = get_device_requests(component, device_ids=device_ids)
+        # NOTE: Containers are removed manually (not with 'remove=True'), so that
+        # 'container.wait()' never races against the Docker daemon removing them.
         container = client.containers.run(
-            image=component.name,
-            command=f"python /app/main.py {args}",
+            image=image.tag,
+            command="python /app/main.py",
+            environment={**image.environment, **(environment or {})},
             volumes=volumes,
-            remove=remove,
             detach=True,
             device_requests=device_requests,
         )
         for line in container.logs(stream=True):
-            line = line.strip()
-            if line:
-                print(line.decode("utf-8"))
+            _print_log_line(component, line.decode("utf-8"))
 
         container.wait()
-        client.images.remove(tag, force=True, noprune=False)
+        if remove:
+            container.remove(force=True)
 
-        with open(output_json, "r") as f:
-            result = json.load(f)["output"]
+        result = read_job_output(tempdir, serializer=_serializer, arrays_dir=arrays_dir)
 
     return result
 
 
-def resolve_value(arguments: Dict, value: Any) -> Any:
-    if isinstance(value, LazyAttribute):
-        return getattr(resolve_value(arguments, value.parent), value.key)
-    elif isinstance(value, Pipeline):
-        if value.name in arguments:
-            return arguments[value.name]
-        return resolve_value(arguments, value.return_value)
-    elif isinstance(value, (tuple, list)):
-        return tuple(resolve_value(arguments, x) for x in value)
-    elif isinstance(value, Component):
-        assert isinstance(arguments, dict)
-        return arguments[value.name]
-    else:
-        return value
+WORKER = """
+import contextlib
+import logging
+import os
+import runpy
+import sys
+import time
+import traceback
+
+JOBS_DIR = "/app/jobs"
+
+while True:
+    ready = sorted(f for f in os.listdir(JOBS_DIR) if f.endswith(".ready"))
+    if not ready:
+        time.sleep({poll_interval})
+        continue
+
+    for name in ready:
+        job_id = name[: -len(".ready")]
+        job_dir = os.path.join(JOBS_DIR, job_id)
+        os.remove(os.path.join(JOBS_DIR, name))
+
+        script_path = os.path.join(job_dir, "main.py")
+        with open(os.path.join(job_dir, "log.txt"), "w") as log:
+            with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                sys.argv = [script_path]
+                try:
+                    runpy.run_path(script_path, run_name="__main__")
+                except BaseException:
+                    traceback.print_exc()
+                # Handlers created during the job still write to its (closed) log.
+                for handler in logging.root.handlers[:]:
+                    logging.root.removeHandler(handler)
+
+        open(os.path.join(JOBS_DIR, job_id + ".done"), "w").close()
+"""
+
+WORKER_POLL_INTERVAL = 0.01
+
+
+class DockerWorker:
+    def __init__(
+        self,
+        image: ComponentImage,
+        device_ids: Sequence[int] = (),
+        arrays_dir: Optional[str] = None,
+        volumes: Optional[Dict[str, Union[Dict, Volume]]] = None,
+        environment: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Long-lived container that runs many component scripts, one at a time.
+        Scripts are run inside the same Python interpreter, so the container start
+        and interpreter startup (including imports of installed packages) are only
+        paid once per worker.
+
+        Jobs are exchanged through a bind-mounted directory: the executor writes the
+        script and its arguments, then marks the job as ready.  The worker marks it
+        as done after writing the output and captured logs.
+
+        Args:
+            image: (ComponentImage) Docker image to run the worker in.
+            device_ids: (Sequence[int]) GPU device IDs to attach to the container.
+            arrays_dir: Optional(str) Shared directory for arrays.  By default, each
+                worker uses its own directory.
+            volumes: Optional(Dict) Additional volumes to mount in the container.
+            environment: Optional(Dict[str, str]) Additional environment variables.
+        """
+        self.tag = image.tag
+        self.device_ids = tuple(device_ids)
+        self._job_count = 0
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.jobs_dir = os.path.join(self._tempdir.name, "jobs")
+        os.makedirs(self.jobs_dir)
+        with open(os.path.join(self._tempdir.name, "worker.py"), "w") as f:
+            f.write(WORKER.format(poll_interval=WORKER_POLL_INTERVAL))
+        if arrays_dir is None:
+            arrays_dir = os.path.join(self._tempdir.name, "arrays")
+            os.makedirs(arrays_dir)
+        self.arrays_dir = arrays_dir
+
+        volumes = {
+            **_default_volumes(),
+            **image.volumes,
+            **(volumes or {}),
+            self._tempdir.name: {"bind": "/app/", "mode": "rw"},
+            arrays_dir: {"bind": ARRAYS_DIR, "mode": "rw"},
+        }
+        client = DockerClient.from_env()
+        self.container = client.containers.run(
+            image=image.tag,
+            command="python /app/worker.py",
+            environment={**image.environment, **(environment or {})},
+            volumes=volumes,
+            detach=True,
+            device_requests=_get_gpu_device_requests(self.device_ids),
+        )
+        self.alive = True
+        logging.debug(f"Started worker container for image '{image.tag}'")
+
+    def _check_alive(self):
+        self.container.reload()
+        if self.container.status not in ("created", "running"):
+            self.alive = False
+            logs = self.container.logs().decode("utf-8")
+            raise RuntimeError(
+                f"Worker container for image '{self.tag}' exited unexpectedly.\n{logs}"
+            )
+
+    def run(
+        self,
+        component: Component,
+        arguments: Dict[str, Any],
+        serializer: Optional[Serializer] = None,
+    ) -> Any:
+        if serializer is None:
+            serializer = get_serializer()
+        self._job_count += 1
+        job_id = str(self._job_count)
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(job_dir)
+        write_job(
+            job_dir,
+            component,
+            arguments,
+            serializer=serializer,
+            container_dir=f"/app/jobs/{job_id}",
+            arrays_dir=self.arrays_dir,
+        )
+        open(os.path.join(self.jobs_dir, f"{job_id}.ready"), "w").close()
+
+        done_path = os.path.join(self.jobs_dir, f"{job_id}.done")
+        last_check = time.time()
+        while not os.path.exists(done_path):
+            time.sleep(WORKER_POLL_INTERVAL)
+            if time.time() - last_check > 1.0:
+                self._check_alive()
+                last_check = time.time()
+
+        with open(os.path.join(job_dir, "log.txt"), "r") as f:
+            logs = f.read()
+        for line in logs.splitlines():
+            _print_log_line(component, line)
+
+        try:
+            result = read_job_output(
+                job_dir, serializer=serializer, arrays_dir=self.arrays_dir
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                f"Component '{component.name}' failed in worker container for image "
+                f"'{self.tag}'.\n{logs}"
+            )
+
+        return result
+
+    def stop(self):
+        try:
+            self.container.remove(force=True)
+        except APIError as e:
+            logging.debug(f"Could not remove worker container: {e}")
+        # Files written by the container may be owned by another user.
+        shutil.rmtree(self._tempdir.name, ignore_errors=True)
+
+
+class DockerWorkerPool:
+    def __init__(
+        self,
+        build_options: Optional[BuildOptions] = None,
+        arrays_dir: Optional[str] = None,
+        volumes: Optional[Dict[str, Union[Dict, Volume]]] = None,
+        environment: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Keeps idle 'DockerWorker' containers for each image (and set of GPUs).
+        A new worker is only started when all existing workers for that image are
+        busy, so the number of workers per image is bounded by 'max_workers'.
+
+        Args:
+            build_options: Optional(BuildOptions) Options for building images.
+            arrays_dir: Optional(str) Directory for arrays, shared by all workers.
+            volumes: Optional(Dict) Additional volumes to mount in each worker.
+            environment: Optional(Dict[str, str]) Additional environment variables.
+        """
+        self.build_options = build_options
+        self.arrays_dir = arrays_dir
+        self.volumes = volumes
+        self.environment = environment
+        self._idle: Dict[Tuple[str, Tuple[int, ...]], List[DockerWorker]] = defaultdict(
+            list
+        )
+        self._workers: List[DockerWorker] = []
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        component: Component,
+        device_ids: Optional[Sequence[int]] = None,
+        image: Optional[ComponentImage] = None,
+    ) -> DockerWorker:
+        if image is None:
+            image = get_component_image(component, options=self.build_options)
+        key = (image.tag, get_device_ids(component, device_ids=device_ids))
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop()
+
+        worker = DockerWorker(
+            image=image,
+            device_ids=key[1],
+            arrays_dir=self.arrays_dir,
+            volumes=self.volumes,
+            environment=self.environment,
+        )
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def release(self, worker: DockerWorker):
+        if not worker.alive:
+            worker.stop()
+            return
+        with self._lock:
+            self._idle[(worker.tag, worker.device_ids)].append(worker)
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._idle.clear()
+        for worker in workers:
+            worker.stop()
 
 
 class DockerExecutor(LocalExecutor):
-    def resolve_local_value(self, _locals: Dict, value: Any) -> Any:
-        if isinstance(value, LazyAttribute):
-            return getattr(resolve_value(_locals, value.parent), value.key)
-        elif isinstance(value, Pipeline):
-            if value.name in _locals:
-                return _locals[value.name]
-            return resolve_value(_locals, value.return_value)
-        elif isinstance(value, (tuple, list)):
-            return tuple(resolve_value(_locals, x) for x in value)
-        elif isinstance(value, Component):
-            assert isinstance(_locals, dict)
-            return _locals[value.name]
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        resources: Optional[Union[Dict, Hardware]] = None,
+        cache: Optional[ResultCache] = None,
+        max_images: Optional[int] = 16,
+        max_image_age_days: Optional[float] = 30,
+        warm_workers: bool = False,
+        pull_policy: Union[str, PullPolicy] = PullPolicy.IF_NOT_PRESENT,
+        buildkit: bool = False,
+        wheelhouse: Optional[str] = None,
+        skip_builds: bool = False,
+        serializer: Optional[str] = None,
+        free_results: bool = True,
+        pinned: Optional[Sequence[Union[str, Component, Pipeline]]] = None,
+        memory_budget: Optional[Union[int, str]] = None,
+    ) -> None:
+        """
+        Args:
+            max_workers: Optional(int) Maximum number of components to build and run
+                at the same time.  Each one builds its own image and runs in its own
+                container, so independent components do not wait on each other.
+                By default, components are run sequentially.
+            resources: Optional(Dict | Hardware) Total hardware available to this
+                executor.  See 'LocalExecutor' for details.  When GPUs are tracked,
+                each container is assigned its own GPU device IDs.
+            cache: Optional(ResultCache) On-disk cache of component results.
+            max_images: Optional(int) Component images are tagged by a digest of
+                their environment (base image, packages, etc.), and reused across
+                runs.  After each run, only the 'max_images' most recently used
+                images are kept.  If None, images are never removed by count.
+            max_image_age_days: Optional(float) After each run, remove images that
+                have not been used in this many days.  If None, images are never
+                removed by age.
+            warm_workers: (bool) If True, keep a long-lived worker container for
+                each image, and run all components that share the image inside it.
+                This avoids container and interpreter startup for every component,
+                which dominates for pipelines with many small steps.  Workers are
+                stopped at the end of the run.
+            pull_policy: (str | PullPolicy) When to pull base images: 'Always',
+                'IfNotPresent' (default) or 'Never'.  With 'Always', component images
+                are only rebuilt if the pulled base image differs from the one they
+                were built from.  With 'Never', base images must already be local.
+            buildkit: (bool) Build images with BuildKit, using the 'docker' CLI.
+                pip's download cache is kept in a BuildKit cache mount, so packages
+                are not downloaded again when an image is rebuilt.
+            wheelhouse: Optional(str) Local directory of wheels to install packages
+                from, instead of a package index.  For hosts without network access.
+            skip_builds: (bool) If True, components that don't install any packages
+                run directly in their base image, with the local 'unipipe' source
+                mounted into the container, instead of building a new image.  The
+                base image must provide the dependencies of 'unipipe' (the default
+                'fkodom/unipipe' images do), so this is disabled by default.
+            serializer: Optional(str) Format for passing inputs and outputs to and
+                from containers: 'json' (default), 'msgpack' or 'pickle'.  Can be
+                overridden for each component, with 'dsl.component(serializer=...)'.
+            free_results: (bool) Release results as soon as they are no longer
+                needed.  See 'LocalExecutor' for details.
+            pinned: Optional(Sequence[str | Component | Pipeline]) Results that are
+                never released.
+            memory_budget: Optional(int | str) Spill results to disk when they
+                exceed this size.  See 'LocalExecutor' for details.
+        """
+        super().__init__(
+            max_workers=max_workers,
+            resources=resources,
+            cache=cache,
+            free_results=free_results,
+            pinned=pinned,
+            memory_budget=memory_budget,
+        )
+        self.max_images = max_images
+        self.max_image_age_days = max_image_age_days
+        self.warm_workers = warm_workers
+        self.serializer = get_serializer(serializer).name
+        self.build_options = BuildOptions(
+            pull_policy=PullPolicy(pull_policy),
+            buildkit=buildkit,
+            wheelhouse=wheelhouse,
+            skip_builds=skip_builds,
+        )
+        self._worker_pool: Optional[DockerWorkerPool] = None
+        # Images resolved during the current run, keyed by 'get_environment_key'.
+        self._images: Dict[str, ComponentImage] = {}
+        self._images_lock = threading.Lock()
+        self._arrays_dir: Optional[str] = None
+        self._volumes: Dict[str, Union[Dict, Volume]] = {}
+        self._environment: Dict[str, str] = {}
+
+    def prepare(
+        self, pipeline: Pipeline, max_workers: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Builds (or pulls) the images for all components in 'pipeline' ahead of
+        time.  Components are deduplicated by environment, and images are built
+        concurrently.  Components whose inputs are known ahead of time, and whose
+        results are already in the cache (or the journal of a resumed run), are
+        skipped.  Resolved images are reused for the rest of the run.
+
+        Args:
+            pipeline: (Pipeline) Traced pipeline to prepare images for.
+            max_workers: Optional(int) Maximum number of concurrent image builds.
+                Defaults to building all images at once.
+
+        Returns:
+            Seconds spent preparing each image, keyed by image tag.
+        """
+        if self.cache is None and self.journal is None:
+            components = iter_components(pipeline)
         else:
-            return value
+            components = self._iter_uncached_components(pipeline)
+
+        environments: Dict[str, Component] = {}
+        for component in components:
+            key = get_environment_key(component, self.build_options)
+            if key not in self._images:
+                environments.setdefault(key, component)
+        if not environments:
+            return {}
+
+        def prepare_image(item: Tuple[str, Component]) -> Tuple[str, float]:
+            key, component = item
+            start = time.perf_counter()
+            image = get_component_image(component, options=self.build_options)
+            with self._images_lock:
+                self._images[key] = image
+            return image.tag, time.perf_counter() - start
+
+        max_workers = max_workers or len(environments)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(prepare_image, environments.items()))
+
+        for tag, seconds in results:
+            logging.info(f"Prepared Docker image '{tag}' in {seconds:.1f}s")
+        return dict(results)
+
+    def _iter_uncached_components(self, pipeline: Pipeline) -> Iterator[Component]:
+        """Yields the components in 'pipeline' that may need to run.  Components
+        that only take constants and pipeline arguments are skipped if their result
+        is in the cache or journal.  Results are never loaded here, so the inputs
+        of all other components are unknown until the run, and they always get an
+        image.
+        """
+        for component in pipeline.components:
+            if isinstance(component, Pipeline):
+                yield from iter_components(component)
+                continue
+            try:
+                kwargs = resolve_inputs(component, pipeline.inputs)
+            except KeyError:
+                # Takes the result of another component.
+                yield component
+                continue
+            if not self.has_cached_result(self.get_result_key(component, kwargs)):
+                yield component
+
+    def get_image(self, component: Component) -> ComponentImage:
+        """Returns the image for 'component', which is resolved (built or pulled)
+        at most once per run.
+        """
+        key = get_environment_key(component, self.build_options)
+        image = self._images.get(key)
+        if image is None:
+            # e.g. the result was expected to be cached, but is not anymore
+            with _get_build_lock(f"resolve:{key}"):
+                image = self._images.get(key)
+                if image is None:
+                    image = get_component_image(component, options=self.build_options)
+                    with self._images_lock:
+                        self._images[key] = image
+        return image
+
+    def run_pipeline(self, pipeline: Pipeline):
+        # Build all images before running anything, so that image builds are not
+        # serialized along the critical path of the pipeline.
+        self._images = {}
+        self.prepare(pipeline, max_workers=self.max_workers)
+        # Arrays are shared by all containers in the run.  (Memory-mapped arrays
+        # returned by the pipeline remain readable after the files are removed.)
+        self._arrays_dir = tempfile.mkdtemp(prefix="unipipe-arrays-")
+        if self.artifact_store is not None:
+            # Mount the artifact store at the same path, so artifact paths are valid
+            # both inside and outside of containers.
+            root = self.artifact_store.root
+            self._volumes = {root: {"bind": root, "mode": "rw"}}
+            self._environment = {ARTIFACT_SCRATCH_ENV: self.artifact_store.scratch_dir}
+        if self.warm_workers:
+            self._worker_pool = DockerWorkerPool(
+                build_options=self.build_options,
+                arrays_dir=self._arrays_dir,
+                volumes=self._volumes,
+                environment=self._environment,
+            )
+        try:
+            # Records are loaded from the arrays directory, which is removed below.
+            return materialize_records(super().run_pipeline(pipeline))
+        finally:
+            shutil.rmtree(self._arrays_dir, ignore_errors=True)
+            self._arrays_dir = None
+            self._volumes, self._environment = {}, {}
+            images, self._images = self._images, {}
+            if self._worker_pool is not None:
+                self._worker_pool.close()
+                self._worker_pool = None
+            if self.max_images is not None or self.max_image_age_days is not None:
+                # Never hide the error from the run (e.g. when the Docker daemon is
+                # unreachable, pruning fails too).
+                try:
+                    prune_images(
+                        max_images=self.max_images,
+                        max_age_days=self.max_image_age_days,
+                        keep=[image.tag for image in images.values()],
+                    )
+                except Exception as e:
+                    logging.warning(f"Could not prune Docker images: {e}")
 
     def run_component(self, component: Component, **kwargs):
-        result = build_and_run(component, kwargs)
-        return_type = get_annotations(component.func, eval_str=True).get("return")
-
-        if isclass(return_type):
-            if issubclass(return_type, tuple):
-                result = return_type(*result)
-            if not isinstance(result, return_type):
-                raise TypeError(
-                    f"Component function {component.func.__name__}() expected a return "
-                    f"value of type '{return_type}', but found '{type(result)}'."
-                )
+        return self.run_component_on_devices(component, kwargs)
 
-        return result
+    def run_component_on_devices(
+        self,
+        component: Component,
+        kwargs: Dict[str, Any],
+        device_ids: Optional[Sequence[int]] = None,
+    ):
+        if self._worker_pool is None:
+            result = build_and_run(
+                component,
+                kwargs,
+                image=self.get_image(component),
+                device_ids=device_ids,
+                build_options=self.build_options,
+                serializer=self.serializer,
+                arrays_dir=self._arrays_dir,
+                volumes=self._volumes,
+                environment=self._environment,
+            )
+        else:
+            worker = self._worker_pool.acquire(
+                component, device_ids=device_ids, image=self.get_image(component)
+            )
+            try:
+                serializer = get_serializer(component.serializer or self.serializer)
+                result = worker.run(component, kwargs, serializer=serializer)
+            finally:
+                self._worker_pool.release(worker)
+
+        return self.check_return_type(component, result)
+
+    def submit_component(
+        self,
+        pool: PoolExecutor,
+        component: Component,
+        kwargs: Dict[str, Any],
+        allocation: Optional[Allocation] = None,
+    ) -> Future:
+        device_ids = None
+        if allocation is not None and allocation.gpu_ids:
+            device_ids = list(allocation.gpu_ids)
+        return pool.submit(self.run_component_on_devices, component, kwargs, device_ids)
 
     def run_conditional_pipeline_with_locals(
-        self, pipeline: ConditionalPipeline, _locals: Dict[str, Any]
+        self, pipeline: ConditionalPipeline, _locals: MutableMapping[str, Any]
     ):
-        operand1 = self.resolve_local_value(_locals, pipeline.condition.operand1)
-        operand2 = self.resolve_local_value(_locals, pipeline.condition.operand2)
-        comparator = pipeline.condition.comparator
-
-        if comparator(operand1, operand2):
+        if self.evaluate_condition(pipeline, _locals):
             return self.run_pipeline_with_locals(pipeline, _locals=_locals)
         else:
             return None, _locals
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Executor as PoolExecutor
+from concurrent.futures import Future, ProcessPoolExecutor
+from importlib import import_module
+from inspect import iscoroutine, unwrap
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+from pydantic import BaseModel
+
+from unipipe.dsl import Component, Hardware, Pipeline, wrap_logging_info
+from unipipe.executor.python import PythonExecutor
+from unipipe.utils.annotations import to_builtin, wrap_cast_output_type
+from unipipe.utils.cache import ResultCache
+from unipipe.utils.ops import MultipleDispatch
+from unipipe.utils.resources import Allocation
+from unipipe.utils.signatures import get_signature
+
+
+class FunctionReference(BaseModel):
+    """Picklable reference to a component function.  Component functions are wrapped
+    in closures (type casting, logging, etc.), which cannot be pickled directly.
+    Instead, worker processes import the function by name and re-wrap it.
+    """
+
+    module: str
+    qualname: str
+    # Position of the function within a 'MultipleDispatch' (e.g. 'unipipe.utils.ops')
+    dispatch_idx: Optional[int] = None
+
+    @classmethod
+    def from_func(cls, func: Callable) -> FunctionReference:
+        func = unwrap(func)
+        reference = cls(module=func.__module__, qualname=func.__qualname__)
+        obj = reference._lookup()
+        if isinstance(obj, MultipleDispatch):
+            idx = next((i for i, f in enumerate(obj.funcs) if f is func), None)
+            reference.dispatch_idx = idx
+
+        if "<locals>" in func.__qualname__ or reference.resolve() is not func:
+            raise TypeError(
+                f"Component function {func.__qualname__}() could not be imported from "
+                f"module '{func.__module__}'. Functions must be defined at the top "
+                "level of a module to run in separate processes."
+            )
+
+        return reference
+
+    def _lookup(self) -> Any:
+        obj: Any = import_module(self.module)
+        for name in self.qualname.split("."):
+            obj = getattr(obj, name, None)
+        return obj
+
+    def resolve(self) -> Optional[Callable]:
+        obj = self._lookup()
+        if isinstance(obj, MultipleDispatch):
+            if self.dispatch_idx is None:
+                return None
+            return obj.funcs[self.dispatch_idx]
+        elif callable(obj):
+            return unwrap(obj)
+        else:
+            return None
+
+
+def run_function_reference(
+    reference: FunctionReference,
+    component_name: str,
+    logging_level: int,
+    kwargs: Dict[str, Any],
+) -> Any:
+    func = reference.resolve()
+    assert func is not None
+    return_type = get_signature(func).return_type
+    func = wrap_logging_info(
+        wrap_cast_output_type(func, _type=return_type),
+        component_name=component_name,
+        logging_level=logging_level,
+    )
+    result = func(**kwargs)
+    if iscoroutine(result):
+        result = asyncio.run(result)
+    return to_builtin(result)
+
+
+class MultiprocessExecutor(PythonExecutor):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        resources: Optional[Union[Dict, Hardware]] = None,
+        cache: Optional[ResultCache] = None,
+        free_results: bool = True,
+        pinned: Optional[Sequence[Union[str, Component, Pipeline]]] = None,
+        memory_budget: Optional[Union[int, str]] = None,
+    ) -> None:
+        """
+        Args:
+            max_workers: Optional(int) Maximum number of worker processes.  Defaults
+                to the number of CPUs on this machine.
+            resources: Optional(Dict | Hardware) Total hardware available to this
+                executor.  See 'LocalExecutor' for details.
+            cache: Optional(ResultCache) On-disk cache of component results.
+            free_results: (bool) Release results as soon as they are no longer
+                needed.  See 'LocalExecutor' for details.
+            pinned: Optional(Sequence[str | Component | Pipeline]) Results that are
+                never released.
+            memory_budget: Optional(int | str) Spill results to disk when they
+                exceed this size.  See 'LocalExecutor' for details.
+        """
+        super().__init__(
+            max_workers=max_workers or os.cpu_count(),
+            resources=resources,
+            cache=cache,
+            free_results=free_results,
+            pinned=pinned,
+            memory_budget=memory_budget,
+        )
+
+    def get_pool(self) -> PoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def submit_component(
+        self,
+        pool: PoolExecutor,
+        component: Component,
+        kwargs: Dict[str, Any],
+        allocation: Optional[Allocation] = None,
+    ) -> Future:
+        return pool.submit(
+            run_function_reference,
+            FunctionReference.from_func(component.func),
+            component_name=component.name,
+            logging_level=component.logging_level,
+            kwargs=to_builtin(kwargs),
+        )
+
+    def collect_component(self, component: Component, future: Future) -> Any:
+        return self.check_return_type(component, future.result())
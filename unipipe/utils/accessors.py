@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import weakref
+from operator import itemgetter
+from typing import Any, Callable, Dict, Mapping, Tuple, Union
+
+from unipipe.dsl import Component, LazyAttribute, LazyItem, Pipeline
+from unipipe.utils.graph import get_references
+
+# Resolves a traced value (e.g. a component input) from an executor's locals.
+Accessor = Callable[[Mapping[str, Any]], Any]
+
+# Components and pipelines can't be hashed (they overload '=='), so keep compiled
+# accessors by ID, and drop them when the component is garbage collected.
+_INPUT_ACCESSORS: Dict[int, Tuple[weakref.ref, Dict[str, Accessor]]] = {}
+
+
+def _constant(value: Any) -> Accessor:
+    return lambda _locals: value
+
+
+def compile_accessor(value: Any) -> Accessor:
+    """Compiles 'value' into a function that resolves it from an executor's locals.
+    Type checks and recursion happen once, here, rather than every time the value
+    is resolved.  Values that don't reference any pipeline objects (including
+    lists and tuples of constants) are returned as-is, without copying them.
+    """
+    if isinstance(value, LazyAttribute):
+        parent, key = compile_accessor(value.parent), value.key
+        return lambda _locals: getattr(parent(_locals), key)
+    elif isinstance(value, LazyItem):
+        parent, idx = compile_accessor(value.parent), value.idx
+        return lambda _locals: parent(_locals)[idx]
+    elif isinstance(value, Pipeline):
+        name, return_value = value.name, compile_accessor(value.return_value)
+
+        def resolve_pipeline(_locals: Mapping[str, Any]) -> Any:
+            if name in _locals:
+                return _locals[name]
+            return return_value(_locals)
+
+        return resolve_pipeline
+    elif isinstance(value, (tuple, list)):
+        if not get_references(value):
+            return _constant(value)
+        items = [compile_accessor(x) for x in value]
+        return lambda _locals: tuple(item(_locals) for item in items)
+    elif isinstance(value, Component):
+        return itemgetter(value.name)
+    else:
+        return _constant(value)
+
+
+def get_input_accessors(component: Union[Component, Pipeline]) -> Dict[str, Accessor]:
+    """Compiled accessors for all inputs of 'component'.  Inputs are fixed when the
+    pipeline is traced, so they are only compiled once for each component.
+    """
+    key = id(component)
+    entry = _INPUT_ACCESSORS.get(key)
+    if entry is not None and entry[0]() is component:
+        return entry[1]
+
+    accessors = {k: compile_accessor(v) for k, v in component.inputs.items()}
+    _INPUT_ACCESSORS[key] = (
+        weakref.ref(component, lambda _: _INPUT_ACCESSORS.pop(key, None)),
+        accessors,
+    )
+    return accessors
+
+
+def resolve_inputs(
+    component: Union[Component, Pipeline], _locals: Mapping[str, Any]
+) -> Dict[str, Any]:
+    return {k: access(_locals) for k, access in get_input_accessors(component).items()}
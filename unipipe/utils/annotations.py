@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import functools
-from inspect import isclass
+from inspect import isclass, iscoroutinefunction
 from typing import Any, Callable, Dict, Type, TypeVar
 
+from unipipe.utils.arrays import get_numpy, is_ndarray_type
 from unipipe.utils.compat import get_annotations
+from unipipe.utils.records import LazyRecord
+from unipipe.utils.signatures import get_field_types
+from unipipe.utils.tables import cast_table, is_table_type
 
 
 def resolve_annotations(obj: Callable) -> Callable:
@@ -24,14 +28,18 @@ def infer_type(obj: Any) -> Type:
     from unipipe.dsl import Component, LazyAttribute, LazyItem, Pipeline
 
     if isinstance(obj, Component):
-        return get_annotations(obj.func, eval_str=True)["return"]
+        # Not 'obj.func', which builds the (lazy) wrapper around the function.
+        return obj.return_type
     elif isinstance(obj, Pipeline):
         return obj.return_type or infer_type(obj.return_value)
     elif isinstance(obj, LazyAttribute):
         parent_type = infer_type(obj.parent)
-        return get_annotations(parent_type, eval_str=True).get(obj.key)
+        return get_field_types(parent_type).get(obj.key)  # type: ignore
     elif isinstance(obj, LazyItem):
-        return infer_type(obj.parent[obj.idx])
+        parent = obj.parent
+        if isinstance(parent, Pipeline):
+            parent = parent.return_value
+        return infer_type(parent[obj.idx])
     else:
         return type(obj)
 
@@ -48,17 +56,46 @@ def cast_output_type(output: Any, _type: Type[_T]) -> _T:
         assert output is None
         return output
     elif isclass(_type) and issubclass(_type, tuple):
-        annotations = get_annotations(_type, eval_str=True)
+        annotations = get_field_types(_type)
         _kwargs = {
             k: cast_output_type(v, annotations[k])
             for k, v in zip(_type._fields, output)  # type: ignore
         }
         return _type(**_kwargs)  # type: ignore
+    elif is_ndarray_type(_type):
+        # Never copies arrays, and keeps memory-mapped arrays memory-mapped (so
+        # they are not written again when passed to another container).
+        return get_numpy().asanyarray(output)  # type: ignore
+    elif is_table_type(_type):
+        return cast_table(output, _type)
     else:
         return _type(output)
 
 
+def to_builtin(value: Any) -> Any:
+    """Converts 'NamedTuple' values (which are usually defined inline, and therefore
+    not picklable) into plain tuples.  Use 'cast_output_type' to convert them back.
+    """
+    if isinstance(value, (tuple, LazyRecord)):
+        return tuple(to_builtin(x) for x in value)
+    elif isinstance(value, list):
+        return [to_builtin(x) for x in value]
+    elif isinstance(value, dict):
+        return {k: to_builtin(v) for k, v in value.items()}
+    else:
+        return value
+
+
 def wrap_cast_output_type(func: Callable, _type: Type[_T]) -> Callable[..., _T]:
+    if iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapped(*args, **kwargs) -> _T:
+            result = await func(*args, **kwargs)
+            return cast_output_type(result, _type)
+
+        return async_wrapped  # type: ignore
+
     @functools.wraps(func)
     def wrapped(*args, **kwargs) -> _T:
         result = func(*args, **kwargs)
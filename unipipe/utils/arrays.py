@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+from typing import Any, Optional
+from uuid import uuid4
+
+from unipipe.utils.tables import decode_table, encode_table, is_encoded_table, is_table
+
+# Placeholder for arrays that were written to '.npy' files, when component values
+# are serialized (e.g. passed to or from Docker containers).
+ARRAY_MARKER = "__unipipe_ndarray__"
+
+
+def get_numpy() -> Optional[Any]:
+    """Returns the 'numpy' module, if it has already been imported.  Arrays can only
+    exist after 'numpy' is imported, so there's no need to import it here (which
+    would slow down 'import unipipe' for everyone).
+    """
+    return sys.modules.get("numpy")
+
+
+def is_ndarray(value: Any) -> bool:
+    numpy = get_numpy()
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def is_ndarray_type(_type: Any) -> bool:
+    numpy = get_numpy()
+    return numpy is not None and _type is numpy.ndarray
+
+
+def is_memory_mapped_array(array: Any) -> bool:
+    """Whether 'array' (or the array it's a view of) is memory-mapped from a file."""
+    numpy = get_numpy()
+    while array is not None:
+        if (numpy is not None and isinstance(array, numpy.memmap)) or isinstance(
+            array, mmap.mmap
+        ):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def _is_file_array(array: Any, directory: str) -> bool:
+    """Whether 'array' is the entire array memory-mapped from a '.npy' file in
+    'directory'.  Views of memory-mapped arrays (slices, transposes, etc.) keep the
+    'filename' of the original array, so they have to be written to a new file.
+    """
+    numpy = get_numpy()
+    filename = getattr(array, "filename", None)
+    if (
+        numpy is None
+        or filename is None
+        or not isinstance(array, numpy.memmap)
+        # Views have the array they were taken from as their base.
+        or not isinstance(array.base, mmap.mmap)
+        or not array.flags.c_contiguous
+        or os.path.dirname(os.path.realpath(filename)) != os.path.realpath(directory)
+    ):
+        return False
+
+    read_header = {
+        (1, 0): numpy.lib.format.read_array_header_1_0,
+        (2, 0): numpy.lib.format.read_array_header_2_0,
+    }
+    try:
+        with open(filename, "rb") as f:
+            version = numpy.lib.format.read_magic(f)
+            if version not in read_header:
+                return False
+            shape, fortran_order, dtype = read_header[version](f)
+            offset = f.tell()
+    except (OSError, ValueError):
+        return False
+    return (
+        not fortran_order
+        and shape == array.shape
+        and dtype == array.dtype
+        and array.offset == offset
+    )
+
+
+def encode_arrays(value: Any, directory: str) -> Any:
+    """Replaces arrays in 'value' (including inside tuples, lists and dicts) with
+    references to '.npy' files in 'directory'.  Arrays that are already memory-mapped
+    from (an entire) file in 'directory' are not written again.  Tables are written to Arrow IPC files
+    (see 'unipipe.utils.tables').
+    """
+    if is_ndarray(value):
+        if _is_file_array(value, directory):
+            name = os.path.basename(value.filename)
+        else:
+            numpy = get_numpy()
+            assert numpy is not None
+            name = f"{uuid4().hex}.npy"
+            numpy.save(os.path.join(directory, name), value, allow_pickle=False)
+        return {ARRAY_MARKER: name}
+    elif is_table(value):
+        return encode_table(value, directory)
+    elif isinstance(value, tuple):
+        return tuple(encode_arrays(x, directory) for x in value)
+    elif isinstance(value, list):
+        return [encode_arrays(x, directory) for x in value]
+    elif isinstance(value, dict):
+        return {k: encode_arrays(v, directory) for k, v in value.items()}
+    else:
+        return value
+
+
+def decode_arrays(value: Any, directory: str) -> Any:
+    """Inverse of 'encode_arrays'.  Arrays and Arrow tables are memory-mapped
+    (read-only), so they are not copied into memory until they are actually read.
+    """
+    if isinstance(value, dict):
+        if set(value.keys()) == {ARRAY_MARKER}:
+            import numpy
+
+            path = os.path.join(directory, value[ARRAY_MARKER])
+            return numpy.load(path, mmap_mode="r", allow_pickle=False)
+        elif is_encoded_table(value):
+            return decode_table(value, directory)
+        return {k: decode_arrays(v, directory) for k, v in value.items()}
+    elif isinstance(value, tuple):
+        return tuple(decode_arrays(x, directory) for x in value)
+    elif isinstance(value, list):
+        return [decode_arrays(x, directory) for x in value]
+    else:
+        return value
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from inspect import isclass
+from typing import Any
+from uuid import uuid4
+
+from unipipe.utils.signatures import get_field_types, is_named_tuple_type
+
+# Directory where components should create artifacts (see 'new_artifact_path').  Set
+# by the executor for the duration of a run, so that it also reaches containers and
+# worker processes.
+ARTIFACT_SCRATCH_ENV = "UNIPIPE_ARTIFACT_SCRATCH"
+CHUNK_SIZE = 1024 * 1024
+
+
+class Artifact(str):
+    """Path to a file or directory that is output by a component.  When a local
+    executor is given a 'pipeline_root', artifacts are moved into a content-addressed
+    store under 'pipeline_root', and downstream components receive the stored path
+    (instead of the file contents).
+
+    Usage:
+        @dsl.component
+        def download(url: str) -> dsl.Artifact:
+            path = dsl.new_artifact_path("data.csv")
+            urllib.request.urlretrieve(url, path)
+            return dsl.Artifact(path)
+    """
+
+
+def new_artifact_path(name: str = "") -> str:
+    """Returns a new, unique path for creating an artifact.  Artifacts created here
+    are moved into the artifact store (not copied), and they are visible to the
+    executor when the component runs in a container.
+
+    Args:
+        name: (str) File or directory name for the artifact.  If empty, returns the
+            path for a new directory (which is not created yet).
+    """
+    scratch_dir = os.environ.get(ARTIFACT_SCRATCH_ENV) or os.path.join(
+        tempfile.gettempdir(), "unipipe-artifacts"
+    )
+    path = os.path.join(scratch_dir, uuid4().hex)
+    if not name:
+        return path
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, name)
+
+
+def has_artifacts(_type: Any) -> bool:
+    """Whether outputs of type '_type' contain artifacts (including in the fields of
+    'NamedTuple' types).
+    """
+    if not isclass(_type):
+        return False
+    elif issubclass(_type, Artifact):
+        return True
+    elif is_named_tuple_type(_type):
+        return any(has_artifacts(t) for t in get_field_types(_type).values())
+    return False
+
+
+def _update_file_digest(sha: Any, path: str) -> None:
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+
+
+def get_artifact_digest(path: str) -> str:
+    """Content hash of a file or directory.  Directories are hashed by the relative
+    paths and contents of all files inside them.
+    """
+    sha = hashlib.sha256()
+    if not os.path.isdir(path):
+        _update_file_digest(sha, path)
+        return sha.hexdigest()
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            relpath = os.path.relpath(file_path, path).replace(os.sep, "/")
+            sha.update(relpath.encode("utf-8") + b"\0")
+            file_sha = hashlib.sha256()
+            _update_file_digest(file_sha, file_path)
+            sha.update(file_sha.digest())
+    return sha.hexdigest()
+
+
+def _is_inside(path: str, directory: str) -> bool:
+    return os.path.commonpath([path, directory]) == directory
+
+
+class ArtifactStore:
+    def __init__(self, pipeline_root: str) -> None:
+        """Content-addressed storage for artifacts, under 'pipeline_root'.  Each
+        artifact is stored at '<pipeline_root>/artifacts/<sha256>/<name>', so
+        identical artifacts (with the same name) are only stored once.
+
+        Args:
+            pipeline_root: (str) Local directory for storing artifacts.
+        """
+        self.root = os.path.realpath(os.path.expanduser(pipeline_root))
+        self.artifacts_dir = os.path.join(self.root, "artifacts")
+        # Each run gets its own scratch directory, which is removed when it finishes.
+        self.scratch_dir = os.path.join(self.root, "scratch", uuid4().hex)
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        os.makedirs(self.scratch_dir, exist_ok=True)
+
+    def put(self, path: str) -> Artifact:
+        """Adds the file or directory at 'path' to the store, and returns its stored
+        path.  Artifacts created in the scratch directory are moved into the store.
+        Anything else (e.g. an existing dataset on disk) is copied.
+        """
+        path = os.path.realpath(path)
+        if _is_inside(path, self.artifacts_dir):
+            return Artifact(path)
+        elif not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Artifact '{path}' does not exist.  Components running in containers "
+                "should create artifacts with 'dsl.new_artifact_path()'."
+            )
+
+        name = os.path.basename(path)
+        artifact_dir = os.path.join(self.artifacts_dir, get_artifact_digest(path))
+        target = os.path.join(artifact_dir, name)
+        move = _is_inside(path, self.scratch_dir)
+        if not os.path.exists(target):
+            # Stage the artifact next to its final location, then rename it into
+            # place.  Concurrent writers of the same artifact can't collide.
+            os.makedirs(artifact_dir, exist_ok=True)
+            staging = os.path.join(artifact_dir, f".{uuid4().hex}.tmp")
+            if move:
+                shutil.move(path, staging)
+            elif os.path.isdir(path):
+                shutil.copytree(path, staging)
+            else:
+                shutil.copy2(path, staging)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # Another run stored the same artifact first.
+                _remove(staging)
+        elif move:
+            _remove(path)
+
+        return Artifact(target)
+
+    def store_outputs(self, value: Any, _type: Any) -> Any:
+        """Stores all artifacts in a component output, based on its annotated type
+        (including the fields of 'NamedTuple' outputs).  Only fields annotated as
+        artifacts are accessed, so other fields of a 'LazyRecord' are not loaded.
+        """
+        if value is None or not isclass(_type):
+            return value
+        elif issubclass(_type, Artifact):
+            return self.put(value)
+        elif is_named_tuple_type(_type):
+            if isinstance(value, tuple) and not hasattr(value, "_fields"):
+                value = _type(*value)
+            fields = {
+                k: self.store_outputs(getattr(value, k), t)
+                for k, t in get_field_types(_type).items()
+                if has_artifacts(t)
+            }
+            # Both 'NamedTuple' and 'LazyRecord' support '_replace'.
+            return value._replace(**fields) if fields else value
+        return value
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        os.remove(path)
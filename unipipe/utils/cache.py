@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from typing import Any, Dict, Optional, Union
+
+from unipipe.dsl import Component
+from unipipe.utils.annotations import to_builtin
+from unipipe.utils.arrays import get_numpy, is_ndarray
+from unipipe.utils.files import atomic_write
+from unipipe.utils.resources import parse_memory
+from unipipe.utils.source import get_component_func_source
+from unipipe.utils.tables import get_table_digest, is_table
+
+# Sentinel for cache misses, since 'None' is a valid component result.
+MISSING: Any = object()
+
+
+def default_cache_root() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache"))
+    return os.path.join(os.path.expanduser(cache_home), "unipipe")
+
+
+def default_cache_dir() -> str:
+    return os.path.join(default_cache_root(), "results")
+
+
+def get_cache_key(component: Component, kwargs: Dict[str, Any]) -> Optional[str]:
+    """Returns a content hash for the result of running 'component' with the given
+    (resolved) input values.  Returns 'None' if the component function's source
+    code is not available (e.g. defined in an interactive session).
+    """
+    try:
+        source = get_component_func_source(component.func)
+    except (OSError, TypeError, ValueError):
+        return None
+
+    data = {
+        "source": source,
+        "inputs": to_builtin(kwargs),
+        "packages_to_install": component.packages_to_install,
+        "base_image": component.base_image,
+    }
+    encoded = json.dumps(data, sort_keys=True, default=_encode_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _encode_default(value: Any) -> Any:
+    if is_ndarray(value):
+        # The 'repr' of large arrays is truncated, so hash the contents instead.
+        numpy = get_numpy()
+        assert numpy is not None
+        if value.dtype.hasobject:
+            return repr(value.tolist())
+        data = numpy.ascontiguousarray(value).reshape(-1)
+        digest = hashlib.sha256(data.view(numpy.uint8)).hexdigest()
+        return {"ndarray": digest, "dtype": str(value.dtype), "shape": value.shape}
+    elif is_table(value):
+        return {"table": get_table_digest(value), "type": type(value).__name__}
+    return repr(value)
+
+
+class ResultCache:
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_size: Optional[Union[int, str]] = "10G",
+    ) -> None:
+        """On-disk cache of component results, keyed by 'get_cache_key'.  When the
+        cache grows larger than 'max_size', the least recently used results are
+        evicted first.
+
+        Args:
+            root: Optional(str) Directory for storing results.  Defaults to
+                '$XDG_CACHE_HOME/unipipe/results' (or '~/.cache/unipipe/results').
+            max_size: Optional(int | str) Maximum size of the cache, in bytes.  Can
+                be a string with units, like '512M' or '10G'.  If None, the cache
+                is never evicted.
+        """
+        self.root = os.path.expanduser(root or default_cache_dir())
+        self.max_size = parse_memory(max_size)
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            # Update the access time, which is used for LRU eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            return MISSING
+        except (EOFError, pickle.UnpicklingError):
+            logging.warning(f"Ignoring corrupted cache entry: '{path}'")
+            return MISSING
+
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        with atomic_write(self._path(key)) as f:
+            pickle.dump(to_builtin(value), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += os.path.getsize(self._path(key))
+            if self.max_size is not None and (
+                self._size is None or self._size > self.max_size
+            ):
+                self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.root):
+            if not entry.name.endswith(".pkl"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if self.max_size is None or size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+        self._size = size
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".pkl"):
+                os.remove(entry.path)
+        self._size = 0
@@ -5,10 +5,13 @@ At the time of writing, 'unipipe' supports back to Python 3.7.
 
 from __future__ import annotations
 
+import ast
 import functools
+import io
 import sys
+import tokenize
 import types
-from typing import Callable, Optional, Type, Union
+from typing import Callable, List, Optional, Type, Union
 
 
 def removeprefix(string: str, prefix: str) -> str:
@@ -23,6 +26,75 @@ def removesuffix(string: str, suffix: str) -> str:
     return string
 
 
+def get_package_version(name: str) -> Optional[str]:
+    """Returns the installed version of a package, or None if it's not installed.
+    'importlib.metadata' is only available in Python>=3.8.
+    """
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        return None
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def get_source_segment(source: str, node: ast.AST) -> str:
+    """Returns the source code for an AST node (like 'ast.get_source_segment').
+
+    In Python 3.7, AST nodes don't have end positions.  In that case, the source is
+    read from the start of the node, up to the next delimiter that isn't nested in
+    brackets (or a lambda).  That's enough for function parameters, default values
+    and return annotations, which is what it's used for.
+    """
+    if getattr(node, "end_lineno", None) is not None:
+        return ast.get_source_segment(source, node) or ""
+    if isinstance(node, ast.arg):
+        if node.annotation is None:
+            return node.arg
+        return f"{node.arg}: {get_source_segment(source, node.annotation)}"
+
+    lines = source.splitlines(True)
+    offsets: List[int] = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    def position(lineno: int, col: int) -> int:
+        return offsets[lineno - 1] + col
+
+    # 'col_offset' is in bytes, but 'tokenize' columns are in characters.
+    line = lines[node.lineno - 1]  # type: ignore
+    col = len(line.encode("utf-8")[: node.col_offset].decode("utf-8"))  # type: ignore
+    start = (node.lineno, col)  # type: ignore
+
+    depth, lambdas = 0, 0
+    end = len(source)
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.start < start:
+            continue
+        if token.type == tokenize.OP and token.string in ("(", "[", "{"):
+            depth += 1
+        elif token.type == tokenize.OP and token.string in (")", "]", "}"):
+            depth -= 1
+            if depth < 0:
+                end = position(*token.start)
+                break
+        elif depth == 0 and token.string == "lambda":
+            lambdas += 1
+        elif depth == 0 and token.string == ":" and lambdas:
+            lambdas -= 1
+        elif depth == 0 and (
+            token.string in (",", "=", ":")
+            or token.type in (tokenize.NEWLINE, tokenize.ENDMARKER)
+        ):
+            end = position(*token.start)
+            break
+
+    return source[position(*start) : end].strip()
+
+
 def get_annotations(obj, *, globals=None, locals=None, eval_str=False):  # noqa: C901
     """Copy-pasta from the 'inspect' module in Python>=3.10.
 
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Iterator
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "wb") -> Iterator[IO[Any]]:
+    """Opens a temporary file next to 'path' for writing, and moves it to 'path'
+    once it's closed.  Concurrent readers (and other processes) never see a
+    partially written file.  If writing fails, 'path' is left unchanged.
+
+    Args:
+        path: (str) File to write.  Its directory must already exist.
+        mode: (str) Mode for opening the file: 'wb' (default) or 'w'.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
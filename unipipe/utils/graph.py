@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Collection, Dict, Iterator, List, Sequence, Set, Union
+
+from unipipe.dsl import (
+    Component,
+    ConditionalPipeline,
+    LazyAttribute,
+    LazyItem,
+    Pipeline,
+)
+
+
+def get_references(value: Any) -> Set[str]:
+    """Returns the names of all pipeline objects that 'value' reads at runtime."""
+    if isinstance(value, (LazyAttribute, LazyItem)):
+        return get_references(value.parent)
+    elif isinstance(value, Component):
+        return {value.name}
+    elif isinstance(value, Pipeline):
+        return {value.name, *get_references(value.return_value)}
+    elif isinstance(value, (tuple, list)):
+        return {ref for x in value for ref in get_references(x)}
+    else:
+        return set()
+
+
+def get_external_references(component: Union[Component, Pipeline]) -> Set[str]:
+    """Returns the names of all pipeline objects that must be resolved before
+    'component' can run.  For nested pipelines, this includes references made by any
+    of their (nested) components, minus those defined inside the pipeline itself.
+    """
+    refs = {ref for v in component.inputs.values() for ref in get_references(v)}
+    if isinstance(component, Pipeline):
+        if isinstance(component, ConditionalPipeline):
+            refs |= get_references(component.condition.operand1)
+            refs |= get_references(component.condition.operand2)
+
+        internal = set()
+        for c in component.components:
+            refs |= get_external_references(c)
+            internal.add(c.name)
+        refs |= get_references(component.return_value)
+        refs -= internal
+
+    return refs
+
+
+def get_dependencies(
+    components: Sequence[Union[Component, Pipeline]],
+) -> List[Set[int]]:
+    """For each component in a pipeline (listed in trace order), returns the indices
+    of earlier components that must finish before it can start.
+
+    Components are stored by name in the executor's locals, so a component that
+    re-uses the name of an earlier one also waits for that component and all of
+    its readers.  This preserves the results of sequential execution.
+    """
+    writers: Dict[str, int] = {}
+    readers: Dict[str, List[int]] = {}
+    dependencies: List[Set[int]] = []
+
+    for idx, component in enumerate(components):
+        refs = get_external_references(component)
+        deps = {writers[ref] for ref in refs if ref in writers}
+        if component.name in writers:
+            deps.add(writers[component.name])
+            deps.update(readers[component.name])
+
+        for ref in refs:
+            if ref in writers:
+                readers[ref].append(idx)
+        writers[component.name] = idx
+        readers[component.name] = []
+        dependencies.append(deps)
+
+    return dependencies
+
+
+class Liveness:
+    def __init__(self, pipeline: Pipeline, pinned: Collection[str] = ()) -> None:
+        """Tracks which results in a pipeline's locals are still needed, so that
+        executors can release them as soon as their last reader finishes.  Results
+        that are part of the pipeline's return value (or pinned) are never released.
+
+        Args:
+            pipeline: (Pipeline) Pipeline whose components are being run.
+            pinned: (Collection[str]) Names of results that should never be released.
+        """
+        self.components = pipeline.components
+        self.references = [get_external_references(c) for c in self.components]
+        self.readers = Counter(ref for refs in self.references for ref in refs)
+        self.keep = {*get_references(pipeline.return_value), *pinned}
+
+    def finish(self, idx: int) -> Set[str]:
+        """Marks the component at 'idx' as finished, and returns the names of all
+        results that are no longer needed (possibly including its own result, if
+        nothing reads it).
+        """
+        released = set()
+        for ref in self.references[idx]:
+            self.readers[ref] -= 1
+            if self.readers[ref] == 0:
+                released.add(ref)
+        name = self.components[idx].name
+        if self.readers[name] == 0:
+            released.add(name)
+        return released - self.keep
+
+
+def iter_components(pipeline: Pipeline) -> Iterator[Component]:
+    """Yields all components in 'pipeline', including those in nested (and
+    conditional) pipelines.
+    """
+    for component in pipeline.components:
+        if isinstance(component, Pipeline):
+            yield from iter_components(component)
+        else:
+            yield component
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from unipipe.utils.annotations import to_builtin
+from unipipe.utils.cache import MISSING
+from unipipe.utils.files import atomic_write
+
+JOURNAL_FILE = "journal.jsonl"
+
+
+def new_run_id() -> str:
+    # Sorts by start time, which makes it easy to find the latest run.
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid4().hex[:8]}"
+
+
+class RunJournal:
+    def __init__(self, runs_dir: str, run_id: Optional[str] = None) -> None:
+        """Append-only record of the components that finished during a run.  Each
+        line of the journal has the component name, the fingerprint of its inputs
+        (see 'get_cache_key'), and the location of its pickled result.  Resuming a
+        run replays finished components from the journal, instead of running them
+        again.
+
+        Args:
+            runs_dir: (str) Directory containing all runs.
+            run_id: Optional(str) ID of an existing run to resume.  If None, starts
+                a new run.
+        """
+        resume = run_id is not None
+        self.run_id = run_id or new_run_id()
+        self.run_dir = os.path.join(runs_dir, self.run_id)
+        self.results_dir = os.path.join(self.run_dir, "results")
+        self.path = os.path.join(self.run_dir, JOURNAL_FILE)
+        if resume and not os.path.exists(self.path):
+            raise FileNotFoundError(
+                f"Cannot resume run '{self.run_id}', because its journal was not "
+                f"found at '{self.path}'."
+            )
+
+        os.makedirs(self.results_dir, exist_ok=True)
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if resume:
+            self._entries = self._read_entries()
+        else:
+            open(self.path, "w").close()
+
+    def _read_entries(self) -> Dict[str, str]:
+        entries = {}
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The previous run may have crashed while appending this line.
+                    logging.warning(f"Ignoring incomplete journal entry: {line!r}")
+                    continue
+                entries[entry["key"]] = entry["result"]
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Any:
+        result_file = self._entries.get(key)
+        if result_file is None:
+            return MISSING
+        try:
+            with open(os.path.join(self.results_dir, result_file), "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            logging.warning(f"Ignoring missing result for journal entry '{key}'")
+            return MISSING
+
+    def record(self, name: str, key: str, result: Any) -> None:
+        # Results are written before the journal entry, so every entry in the
+        # journal points to a complete result.
+        result_file = f"{key}.pkl"
+        with atomic_write(os.path.join(self.results_dir, result_file)) as f:
+            pickle.dump(to_builtin(result), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        entry = {"name": name, "key": key, "result": result_file}
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._entries[key] = result_file
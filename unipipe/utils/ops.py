@@ -2,7 +2,7 @@ from collections import defaultdict
 from typing import Any, Callable, Dict, List, Optional
 
 from unipipe.utils.annotations import infer_input_types
-from unipipe.utils.compat import get_annotations
+from unipipe.utils.signatures import get_signature
 
 
 class MultipleDispatch:
@@ -12,7 +12,7 @@ class MultipleDispatch:
 
     def add(self, func: Callable, signature: Optional[Dict] = None):
         if not signature:
-            signature = get_annotations(func, eval_str=True)
+            signature = dict(get_signature(func).input_types)
         assert signature is not None
         if "return" in signature:
             signature.pop("return")
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Type
+
+# Placeholder for multi-output ('NamedTuple') results that were written one field
+# per file, when component values are serialized (e.g. returned from containers).
+RECORD_MARKER = "__unipipe_record__"
+RECORD_FIELDS = "fields"
+
+
+class LazyRecord:
+    """Multi-output ('NamedTuple') component result, where each field is stored in
+    its own file.  Fields are only loaded when they're accessed (e.g. through a
+    'LazyAttribute' in a downstream component), so consumers that only need small
+    fields never load the large ones.  Iterating or indexing loads fields in order,
+    like a tuple.
+    """
+
+    __slots__ = ("_names", "_load", "_values", "_type")
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        load: Callable[[str], Any],
+        _type: Optional[Type[tuple]] = None,
+    ) -> None:
+        self._names = tuple(names)
+        self._load = load
+        self._values: Dict[str, Any] = {}
+        self._type = _type
+
+    def __getattr__(self, name: str) -> Any:
+        # Slots are only missing before '__init__' (e.g. while unpickling).
+        if name in LazyRecord.__slots__ or name not in self._names:
+            raise AttributeError(f"'{type(self).__name__}' has no field '{name}'")
+        if name not in self._values:
+            self._values[name] = self._load(name)
+        return self._values[name]
+
+    def __getitem__(self, idx: int) -> Any:
+        return getattr(self, self._names[idx])
+
+    def __iter__(self) -> Iterator[Any]:
+        return (getattr(self, name) for name in self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{k}={self._values[k]!r}" if k in self._values else f"{k}=..."
+            for k in self._names
+        )
+        return f"{type(self).__name__}({fields})"
+
+    def _replace(self, **fields: Any) -> LazyRecord:
+        """Returns a new record with some fields replaced (like 'NamedTuple').  The
+        other fields are still loaded lazily.
+        """
+        unknown = set(fields) - set(self._names)
+        if unknown:
+            raise ValueError(f"Got unexpected field names: {sorted(unknown)}")
+        record = LazyRecord(self._names, load=self._load, _type=self._type)
+        record._values = {**self._values, **fields}
+        return record
+
+    def bind(self, _type: Type[tuple]) -> LazyRecord:
+        """Sets the 'NamedTuple' type that this record is materialized as."""
+        self._type = _type
+        return self
+
+    def materialize(self) -> tuple:
+        """Loads all fields, and returns them as a (named) tuple."""
+        if self._type is None:
+            return tuple(self)
+        return self._type(*self)
+
+
+def materialize_records(value: Any) -> Any:
+    """Replaces every 'LazyRecord' in 'value' (including inside tuples, lists and
+    dicts) with its materialized tuple.
+    """
+    if isinstance(value, LazyRecord):
+        return value.materialize()
+    elif isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*[materialize_records(x) for x in value])
+    elif isinstance(value, tuple):
+        return tuple(materialize_records(x) for x in value)
+    elif isinstance(value, list):
+        return [materialize_records(x) for x in value]
+    elif isinstance(value, dict):
+        return {k: materialize_records(v) for k, v in value.items()}
+    else:
+        return value
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from pydantic import parse_obj_as
+
+from unipipe.dsl import Accelerator, Hardware
+
+MEMORY_UNITS = {
+    "": 1,
+    "K": 10**3,
+    "M": 10**6,
+    "G": 10**9,
+    "T": 10**12,
+    "KI": 2**10,
+    "MI": 2**20,
+    "GI": 2**30,
+    "TI": 2**40,
+}
+
+
+def parse_cpus(cpus: Optional[Union[str, int, float]]) -> Optional[float]:
+    """Parses a CPU request like '4', '0.5' or '500m' (milli-CPUs)."""
+    if cpus is None:
+        return None
+
+    _cpus = str(cpus).strip().lower()
+    if _cpus.endswith("m"):
+        return float(_cpus[:-1]) / 1000
+    return float(_cpus)
+
+
+def parse_memory(memory: Optional[Union[str, int]]) -> Optional[int]:
+    """Parses a memory request like '512M', '16G' or '1Gi' into a number of bytes."""
+    if memory is None:
+        return None
+
+    _memory = str(memory).strip().upper().rstrip("B")
+    number = _memory.rstrip("KMGTI")
+    unit = _memory[len(number) :]
+    if unit not in MEMORY_UNITS:
+        raise ValueError(
+            f"Could not parse memory value '{memory}'. Expected a number with an "
+            f"optional unit suffix: {[u for u in MEMORY_UNITS.keys() if u]}."
+        )
+    return int(float(number) * MEMORY_UNITS[unit])
+
+
+def count_host_gpus() -> int:
+    visible_devices = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible_devices is not None:
+        return len([d for d in visible_devices.split(",") if d.strip()])
+    elif shutil.which("nvidia-smi") is None:
+        return 0
+
+    try:
+        output = subprocess.check_output(["nvidia-smi", "-L"], text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return 0
+    return len([line for line in output.splitlines() if line.startswith("GPU")])
+
+
+def host_hardware() -> Hardware:
+    """Returns the hardware available on this machine, for use as the capacity of a
+    'ResourcePool'.
+    """
+    memory: Optional[int] = None
+    if hasattr(os, "sysconf"):
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+    return Hardware(
+        cpus=str(os.cpu_count() or 1),
+        memory=None if memory is None else str(memory),
+        accelerator=Accelerator(count=count_host_gpus()),
+    )
+
+
+class Resources(NamedTuple):
+    cpus: float
+    memory: int
+    gpus: int
+
+    @classmethod
+    def from_hardware(cls, hardware: Hardware, default_cpus: float = 1.0) -> Resources:
+        cpus = parse_cpus(hardware.cpus)
+        accelerator = hardware.accelerator
+        return cls(
+            cpus=default_cpus if cpus is None else cpus,
+            memory=parse_memory(hardware.memory) or 0,
+            gpus=int(accelerator.count or 0) if accelerator is not None else 0,
+        )
+
+
+class Allocation(NamedTuple):
+    resources: Resources
+    # Specific GPUs assigned to the component.  Empty if GPUs are not tracked.
+    gpu_ids: Tuple[int, ...] = ()
+
+
+class ResourcePool:
+    def __init__(self, capacity: Union[Dict, Hardware]) -> None:
+        """Tracks the CPUs, memory and GPUs that are still available on the host.
+        Components are only admitted when their declared 'Hardware' fits.
+
+        Components that don't specify 'cpus' are assumed to need a single CPU.
+        Components that request more than the total capacity are limited to the
+        total capacity, so that they can still run (alone) instead of deadlocking.
+
+        Args:
+            capacity: (Dict | Hardware) Total hardware available for components.
+                Unspecified fields (e.g. 'memory=None') are treated as unlimited.
+        """
+        capacity = parse_obj_as(Hardware, capacity)
+        accelerator = capacity.accelerator
+        self.unlimited_cpus = capacity.cpus is None
+        self.unlimited_memory = capacity.memory is None
+        self.unlimited_gpus = accelerator is None or accelerator.count is None
+        self.capacity = Resources.from_hardware(capacity, default_cpus=0.0)
+        self.available = self.capacity
+        self.free_gpu_ids: List[int] = list(range(self.capacity.gpus))
+
+    def request(self, hardware: Hardware) -> Resources:
+        request = Resources.from_hardware(hardware)
+        limited = Resources(
+            cpus=(
+                request.cpus
+                if self.unlimited_cpus
+                else min(request.cpus, self.capacity.cpus)
+            ),
+            memory=(
+                request.memory
+                if self.unlimited_memory
+                else min(request.memory, self.capacity.memory)
+            ),
+            gpus=(
+                request.gpus
+                if self.unlimited_gpus
+                else min(request.gpus, self.capacity.gpus)
+            ),
+        )
+        if limited != request:
+            logging.warning(
+                f"Requested resources {request} exceed the total capacity "
+                f"{self.capacity}. Limiting the request to {limited}."
+            )
+        return limited
+
+    def fits(self, request: Resources) -> bool:
+        # Small tolerance for fractional CPUs (e.g. '100m'), which are not exactly
+        # representable as floats.
+        return (
+            (self.unlimited_cpus or request.cpus <= self.available.cpus + 1e-9)
+            and (self.unlimited_memory or request.memory <= self.available.memory)
+            and (self.unlimited_gpus or request.gpus <= self.available.gpus)
+        )
+
+    def acquire(self, request: Resources) -> Optional[Allocation]:
+        if not self.fits(request):
+            return None
+
+        gpu_ids: Tuple[int, ...] = ()
+        if not self.unlimited_gpus:
+            gpu_ids = tuple(self.free_gpu_ids[: request.gpus])
+            del self.free_gpu_ids[: request.gpus]
+
+        self.available = Resources(
+            cpus=self.available.cpus - request.cpus,
+            memory=self.available.memory - request.memory,
+            gpus=self.available.gpus - request.gpus,
+        )
+        return Allocation(resources=request, gpu_ids=gpu_ids)
+
+    def release(self, allocation: Allocation) -> None:
+        request = allocation.resources
+        self.free_gpu_ids = sorted([*self.free_gpu_ids, *allocation.gpu_ids])
+        self.available = Resources(
+            cpus=self.available.cpus + request.cpus,
+            memory=self.available.memory + request.memory,
+            gpus=self.available.gpus + request.gpus,
+        )
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import ast
+import asyncio
 import importlib
 import os
 import random
+import runpy
 import sys
 import tempfile
 from contextlib import ExitStack
+from inspect import iscoroutine
 from itertools import dropwhile
 from typing import Any, Callable, Dict, Optional, Sequence
 
@@ -134,22 +137,73 @@ def component_from_script(path: str, **manual_kwargs) -> Callable[..., dsl.Compo
     return dsl.component(func=func, **kwargs)
 
 
-def run_script(
-    path: str,
-    args: Sequence[str] = (),
-    executor: str = "python",
-    name: Optional[str] = None,
-    pipeline_root: Optional[str] = None,
-    **kwargs,
-):
+def pipeline_from_script(
+    path: str, args: Sequence[str] = (), name: Optional[str] = None, **kwargs
+) -> dsl.Pipeline:
     component_fn = component_from_script(path=path, **kwargs)
     # Component functions expect a 'List' object. It's easier to type-check a strict
     # 'List' annotation than 'Sequence', but we want the 'run_script' method to be as
     # user-friendly as possible.
-    args = list(args)
+    _args = list(args)
 
     @dsl.pipeline(name=name)
     def pipeline():
-        component_fn(args)
+        component_fn(_args)
+
+    return pipeline()
+
+
+def _parse_pipeline_argument(value: str) -> Any:
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+def pipeline_from_target(target: str, args: Sequence[str] = ()) -> dsl.Pipeline:
+    """Traces a pipeline from a command line target.  Targets can be:
+    * 'path/to/file.py:pipeline' or 'package.module:pipeline' -- a pipeline
+        function, called with 'args' formatted as 'key=value'
+    * 'path/to/script.py' -- a script, as in 'run_script'
+    """
+    if ":" not in target:
+        return pipeline_from_script(target)
 
-    unipipe.run(executor=executor, pipeline=pipeline(), pipeline_root=pipeline_root)
+    location, attr = target.rsplit(":", maxsplit=1)
+    if location.endswith(".py"):
+        namespace = runpy.run_path(location)
+        pipeline_fn = namespace[attr]
+    else:
+        pipeline_fn = getattr(importlib.import_module(location), attr)
+
+    kwargs = {}
+    for arg in args:
+        key, sep, value = arg.partition("=")
+        if not sep:
+            raise ValueError(f"Expected pipeline argument 'key=value', found '{arg}'.")
+        kwargs[key] = _parse_pipeline_argument(value)
+
+    pipeline = pipeline_fn(**kwargs)
+    if not isinstance(pipeline, dsl.Pipeline):
+        raise TypeError(
+            f"Expected '{target}' to return a 'Pipeline', but found {type(pipeline)}."
+        )
+    return pipeline
+
+
+def run_script(
+    path: str,
+    args: Sequence[str] = (),
+    executor: str = "python",
+    name: Optional[str] = None,
+    pipeline_root: Optional[str] = None,
+    **kwargs,
+):
+    pipeline = pipeline_from_script(path=path, args=args, name=name, **kwargs)
+    result = unipipe.run(
+        executor=executor, pipeline=pipeline, pipeline_root=pipeline_root
+    )
+    # Some executors (e.g. 'async') return an awaitable, rather than running the
+    # pipeline immediately.
+    if iscoroutine(result):
+        asyncio.run(result)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, NamedTuple, Optional, Type
+from uuid import uuid4
+
+from unipipe.utils.annotations import to_builtin
+from unipipe.utils.arrays import decode_arrays, encode_arrays
+from unipipe.utils.records import RECORD_FIELDS, RECORD_MARKER, LazyRecord
+
+
+class Serializer(ABC):
+    """Encodes component inputs and outputs, when they are passed between processes
+    or containers through files.
+    """
+
+    name: str = ""
+    extension: str = ""
+
+    @abstractmethod
+    def dump(self, value: Any, f: BinaryIO) -> None:
+        pass
+
+    @abstractmethod
+    def load(self, f: BinaryIO) -> Any:
+        pass
+
+    def dump_file(self, value: Any, path: str) -> None:
+        with open(path, "wb") as f:
+            self.dump(value, f)
+
+    def load_file(self, path: str) -> Any:
+        with open(path, "rb") as f:
+            return self.load(f)
+
+    # Lists can be encoded one item at a time, so that very large lists (e.g. file
+    # manifests) are never held in memory as a single encoded string.  By default,
+    # the list is encoded as a single value.
+    def dump_items(self, items: Iterable[Any], f: BinaryIO) -> None:
+        self.dump(list(items), f)
+
+    def load_items(self, f: BinaryIO) -> Iterator[Any]:
+        yield from self.load(f)
+
+
+class JSONSerializer(Serializer):
+    name = "json"
+    extension = ".json"
+
+    def dump(self, value: Any, f: BinaryIO) -> None:
+        for chunk in json.JSONEncoder().iterencode(value):
+            f.write(chunk.encode("utf-8"))
+
+    def load(self, f: BinaryIO) -> Any:
+        return json.load(f)
+
+    def dump_items(self, items: Iterable[Any], f: BinaryIO) -> None:
+        # JSON Lines: one item per line.
+        for item in items:
+            f.write(json.dumps(item).encode("utf-8"))
+            f.write(b"\n")
+
+    def load_items(self, f: BinaryIO) -> Iterator[Any]:
+        for line in f:
+            yield json.loads(line)
+
+
+class MsgpackSerializer(Serializer):
+    name = "msgpack"
+    extension = ".msgpack"
+
+    def dump(self, value: Any, f: BinaryIO) -> None:
+        import msgpack
+
+        msgpack.pack(value, f, use_bin_type=True)
+
+    def load(self, f: BinaryIO) -> Any:
+        import msgpack
+
+        return msgpack.unpack(f, raw=False, strict_map_key=False)
+
+    def dump_items(self, items: Iterable[Any], f: BinaryIO) -> None:
+        import msgpack
+
+        packer = msgpack.Packer(use_bin_type=True)
+        for item in items:
+            f.write(packer.pack(item))
+
+    def load_items(self, f: BinaryIO) -> Iterator[Any]:
+        import msgpack
+
+        yield from msgpack.Unpacker(f, raw=False, strict_map_key=False)
+
+
+class PickleSerializer(Serializer):
+    name = "pickle"
+    extension = ".pkl"
+    # Protocol 5 supports out-of-band buffers, and is much faster for large binary
+    # payloads.  It requires Python 3.8+ on both ends.
+    protocol = min(5, pickle.HIGHEST_PROTOCOL)
+
+    def dump(self, value: Any, f: BinaryIO) -> None:
+        # 'NamedTuple' types are usually defined inline, so they cannot be unpickled
+        # in another process.  Convert them to plain tuples first.
+        pickle.dump(to_builtin(value), f, protocol=self.protocol)
+
+    def load(self, f: BinaryIO) -> Any:
+        return pickle.load(f)
+
+
+SERIALIZERS: Dict[str, Type[Serializer]] = {
+    JSONSerializer.name: JSONSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+    PickleSerializer.name: PickleSerializer,
+}
+DEFAULT_SERIALIZER = JSONSerializer.name
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """Returns a serializer by name.  Names (not instances) are used to configure
+    executors and components, so that containers can create the same serializer.
+    """
+    if name is None:
+        name = DEFAULT_SERIALIZER
+    elif name not in SERIALIZERS:
+        raise ValueError(
+            f"Unknown serializer '{name}'. "
+            f"Available serializers: {list(SERIALIZERS.keys())}"
+        )
+    return SERIALIZERS[name]()
+
+
+ITEMS_SUFFIX = ".items"
+
+
+def dump_values(values: Dict[str, Any], directory: str, serializer: Serializer):
+    """Writes each value to its own file in 'directory'.  Lists and tuples are
+    written item by item (see 'Serializer.dump_items').
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, value in values.items():
+        if isinstance(value, (list, tuple)):
+            path = os.path.join(
+                directory, f"{name}{ITEMS_SUFFIX}{serializer.extension}"
+            )
+            with open(path, "wb") as f:
+                serializer.dump_items(value, f)
+        else:
+            serializer.dump_file(
+                value, os.path.join(directory, name + serializer.extension)
+            )
+
+
+def load_values(directory: str, serializer: Serializer) -> Dict[str, Any]:
+    """Reads values written by 'dump_values'.  Lists are decoded item by item."""
+    values: Dict[str, Any] = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(serializer.extension):
+            continue
+        name = filename[: -len(serializer.extension)]
+        if name.endswith(ITEMS_SUFFIX):
+            name = name[: -len(ITEMS_SUFFIX)]
+        values[name] = load_value(directory, name, serializer)
+    return values
+
+
+def load_value(directory: str, name: str, serializer: Serializer) -> Any:
+    """Reads a single value written by 'dump_values'."""
+    path = os.path.join(directory, f"{name}{ITEMS_SUFFIX}{serializer.extension}")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return list(serializer.load_items(f))
+    return serializer.load_file(os.path.join(directory, name + serializer.extension))
+
+
+# Subdirectory (of the shared arrays directory) for records written by 'dump_record'.
+RECORDS_DIR = "records"
+
+
+def dump_record(record: NamedTuple, directory: str, serializer: Serializer) -> Dict:
+    """Writes each field of a 'NamedTuple' to its own file, in a new subdirectory of
+    'directory', and returns a reference to it.  See 'load_record'.
+    """
+    name = uuid4().hex
+    fields = {k: encode_arrays(v, directory) for k, v in zip(record._fields, record)}
+    dump_values(fields, os.path.join(directory, RECORDS_DIR, name), serializer)
+    return {RECORD_MARKER: name, RECORD_FIELDS: list(record._fields)}
+
+
+def is_encoded_record(value: Any) -> bool:
+    return isinstance(value, dict) and set(value.keys()) == {
+        RECORD_MARKER,
+        RECORD_FIELDS,
+    }
+
+
+def load_record(value: Dict, directory: str, serializer: Serializer) -> LazyRecord:
+    """Inverse of 'dump_record'.  Fields are only read (and decoded) from their files
+    when they are accessed.
+    """
+    record_dir = os.path.join(directory, RECORDS_DIR, value[RECORD_MARKER])
+
+    def load(name: str) -> Any:
+        return decode_arrays(load_value(record_dir, name, serializer), directory)
+
+    return LazyRecord(value[RECORD_FIELDS], load)
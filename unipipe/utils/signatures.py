@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import weakref
+from inspect import Parameter, isclass, signature, unwrap
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from unipipe.utils.compat import get_annotations
+
+# Resolving annotations calls 'eval' on stringified types, and unwraps decorated
+# functions.  Results are cached for each function (and 'NamedTuple' type), and
+# dropped when it is garbage collected.
+_SIGNATURES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_FIELD_TYPES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class ComponentSignature:
+    """Resolved type annotations for a component (or pipeline) function.  Use
+    'get_signature' to get the cached signature for a function.  Treat all of the
+    attributes as read-only, since they are shared by every caller.
+    """
+
+    __slots__ = (
+        "annotations",
+        "parameters",
+        "input_types",
+        "return_type",
+        "has_return",
+        "fields",
+    )
+
+    def __init__(self, func: Callable) -> None:
+        self.annotations: Dict[str, Any] = get_annotations(func, eval_str=True)
+        self.parameters: Mapping[str, Parameter] = signature(func).parameters
+        self.input_types = {k: v for k, v in self.annotations.items() if k != "return"}
+        self.return_type: Any = self.annotations.get("return")
+        self.has_return = "return" in self.annotations
+        # Field types of 'NamedTuple' return types (None for other return types).
+        self.fields: Optional[Dict[str, Any]] = None
+        if is_named_tuple_type(self.return_type):
+            self.fields = get_field_types(self.return_type)
+
+
+def is_named_tuple_type(_type: Any) -> bool:
+    return isclass(_type) and issubclass(_type, tuple) and hasattr(_type, "_fields")
+
+
+def _get_cached(cache: weakref.WeakKeyDictionary, key: Any, build: Callable) -> Any:
+    try:
+        value = cache.get(key)
+    except TypeError:
+        # Not hashable, or doesn't support weak references
+        return build(key)
+    if value is None:
+        value = build(key)
+        cache[key] = value
+    return value
+
+
+def _build_signature(func: Callable) -> ComponentSignature:
+    # Components wrap their function again every time they're traced.  Wrappers
+    # from 'functools.wraps' share the annotations of the wrapped function, so
+    # they can share its signature too.
+    inner = unwrap(func)
+    annotations = getattr(func, "__annotations__", None)
+    if inner is not func and annotations is not None:
+        if getattr(inner, "__annotations__", None) is annotations:
+            return get_signature(inner)
+    return ComponentSignature(func)
+
+
+def get_signature(func: Callable) -> ComponentSignature:
+    return _get_cached(_SIGNATURES, func, _build_signature)
+
+
+def get_field_types(_type: Any) -> Dict[str, Any]:
+    """Resolved annotations for the fields of a class (e.g. a 'NamedTuple' type).
+    The returned dict is shared, so don't modify it.
+    """
+    return _get_cached(_FIELD_TYPES, _type, lambda t: get_annotations(t, eval_str=True))
@@ -0,0 +1,23 @@
+import textwrap
+from inspect import getsource
+from itertools import dropwhile
+from typing import Callable
+
+
+def get_component_func_source(func: Callable) -> str:
+    """Largely copy-pasta from 'kfp.v2'.  De-indents the function source code, and
+    removes any decorators or other code preceding the 'def' statement.  Then,
+    decorate the function with just '@dsl.component', so we can utilize type
+    checking/casting, logging, etc. from the Component class.
+    """
+    # Function may be defined in another function/class. Dedent the source code.
+    lines = textwrap.dedent(getsource(func)).split("\n")
+    lines = list(dropwhile(lambda x: not x.startswith(("def", "async def")), lines))
+
+    if not lines:
+        raise ValueError(
+            'Failed to dedent and clean up the source of function "{}". '
+            "It is probably not properly indented.".format(func.__name__)
+        )
+
+    return "\n".join(["@dsl.component", *lines])
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple, Type
+from uuid import uuid4
+
+from unipipe.utils.annotations import to_builtin
+from unipipe.utils.arrays import is_memory_mapped_array, is_ndarray
+from unipipe.utils.records import LazyRecord
+from unipipe.utils.tables import is_dataframe_type, is_memory_mapped_table, is_table
+
+
+def is_disk_backed(value: Any) -> bool:
+    """Whether 'value' (or any item in it) is already stored on disk: memory-mapped
+    arrays and tables, and 'LazyRecord' results (whose fields are loaded from files
+    when accessed).  Those values use (almost) no memory, and spilling them would
+    read everything from disk.
+    """
+    if isinstance(value, LazyRecord):
+        return True
+    elif is_ndarray(value):
+        return is_memory_mapped_array(value)
+    elif is_table(value):
+        return is_memory_mapped_table(value)
+    elif isinstance(value, (tuple, list, set, frozenset)):
+        return any(is_disk_backed(x) for x in value)
+    elif isinstance(value, dict):
+        return any(is_disk_backed(x) for x in value.values())
+    return False
+
+
+def get_size(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """Estimates the memory used by 'value', in bytes.  Array and table buffers are
+    counted in full (unless they are memory-mapped), and containers include the
+    sizes of their items.  'LazyRecord' fields are not counted, since they are
+    stored on disk.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, LazyRecord):
+        return 0
+    elif is_ndarray(value):
+        return 0 if is_memory_mapped_array(value) else int(value.nbytes)
+    elif is_table(value) and is_memory_mapped_table(value):
+        return 0
+    elif is_table(value):
+        if is_dataframe_type(type(value)):
+            return int(value.memory_usage(deep=True).sum())
+        return int(value.nbytes)
+    elif isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(get_size(x, _seen) for x in value)
+    elif isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            get_size(k, _seen) + get_size(v, _seen) for k, v in value.items()
+        )
+    else:
+        return sys.getsizeof(value)
+
+
+class SpilledValue:
+    """Placeholder for a result that was written to disk by 'Spiller'."""
+
+    __slots__ = ("path", "size", "_type")
+
+    def __init__(self, path: str, size: int, _type: Optional[Type] = None) -> None:
+        self.path = path
+        self.size = size
+        # 'NamedTuple' types are usually defined inline, so they can't be pickled.
+        # Keep the type in memory, and pickle the values as a plain tuple.
+        self._type = _type
+
+    def load(self) -> Any:
+        with open(self.path, "rb") as f:
+            value = pickle.load(f)
+        return value if self._type is None else self._type(*value)
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+_Key = Tuple[int, str]
+
+
+class Spiller:
+    def __init__(self, budget: int, directory: str) -> None:
+        """Keeps the total size of results held in 'SpillingLocals' under 'budget'
+        bytes.  When the budget is exceeded, the least recently used results are
+        pickled to 'directory', and loaded again whenever they're read.
+
+        Args:
+            budget: (int) Maximum size of results kept in memory, in bytes.
+            directory: (str) Directory for spilled results.
+        """
+        self.budget = budget
+        self.directory = directory
+        self.size = 0
+        # Results that are still in memory, from least to most recently used.
+        self._entries: OrderedDict[_Key, Tuple[SpillingLocals, int]] = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, _locals: SpillingLocals, name: str, value: Any) -> None:
+        self.remove(_locals, name)
+        if is_disk_backed(value):
+            # Never spilled, and not counted towards the budget.
+            return
+        size = get_size(value)
+        self._entries[(id(_locals), name)] = (_locals, size)
+        self.size += size
+        self._spill()
+
+    def touch(self, _locals: SpillingLocals, name: str) -> None:
+        key = (id(_locals), name)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+    def remove(self, _locals: SpillingLocals, name: str) -> None:
+        entry = self._entries.pop((id(_locals), name), None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def _spill(self) -> None:
+        unspillable = []
+        while self.size > self.budget and self._entries:
+            key, (_locals, size) = self._entries.popitem(last=False)
+            name = key[1]
+            value = dict.__getitem__(_locals, name)
+            path = os.path.join(self.directory, f"{uuid4().hex}.pkl")
+            _type = type(value) if hasattr(value, "_fields") else None
+            try:
+                with open(path, "wb") as f:
+                    pickle.dump(to_builtin(value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logging.debug(f"Could not spill result '{name}' to disk: {e}")
+                if os.path.exists(path):
+                    os.remove(path)
+                unspillable.append((key, (_locals, size)))
+                continue
+
+            dict.__setitem__(_locals, name, SpilledValue(path, size, _type=_type))
+            self.size -= size
+            logging.debug(f"Spilled result '{name}' ({size} bytes) to '{path}'")
+
+        for key, entry in unspillable:
+            self._entries[key] = entry
+            self._entries.move_to_end(key, last=False)
+
+
+class SpillingLocals(dict):
+    """Executor locals that are kept under a memory budget by 'Spiller'.  Spilled
+    results are replaced by 'SpilledValue' placeholders, and loaded from disk
+    (without being kept in memory again) whenever they are read.
+    """
+
+    def __init__(self, values: Dict[str, Any], spiller: Spiller) -> None:
+        super().__init__(values)
+        self.spiller = spiller
+
+    def __getitem__(self, name: str) -> Any:
+        value = super().__getitem__(name)
+        if isinstance(value, SpilledValue):
+            return value.load()
+        self.spiller.touch(self, name)
+        return value
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._discard(name)
+        super().__setitem__(name, value)
+        self.spiller.add(self, name, value)
+
+    def __delitem__(self, name: str) -> None:
+        # Unlike 'pop', this never loads spilled results.
+        self._discard(name)
+        super().__delitem__(name)
+
+    def clear(self) -> None:
+        """Removes all results, including spilled ones, without loading them.
+        Called when a nested pipeline finishes, so its results are no longer
+        counted towards the budget.
+        """
+        for name in list(super().keys()):
+            self._discard(name)
+        super().clear()
+
+    def pop(self, name: str, *default: Any) -> Any:
+        if name not in self:
+            return super().pop(name, *default)
+        value = self[name]
+        del self[name]
+        return value
+
+    def _discard(self, name: str) -> None:
+        value = super().get(name)
+        if isinstance(value, SpilledValue):
+            value.remove()
+        self.spiller.remove(self, name)
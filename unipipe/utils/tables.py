@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import weakref
+from inspect import isclass
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
+# Placeholder for tables that were written to Arrow IPC files, when component values
+# are serialized (e.g. passed to or from Docker containers).
+TABLE_MARKER = "__unipipe_table__"
+TABLE_FORMAT = "format"
+
+# Arrow tables are immutable, so tables that were read from an IPC file can be passed
+# to other containers without writing them again.  Unlike 'numpy.memmap', Arrow
+# tables don't remember which file they came from, so keep track of them here.
+_TABLE_FILES: Dict[int, Tuple[weakref.ref, str]] = {}
+
+
+def get_pyarrow() -> Optional[Any]:
+    """Returns the 'pyarrow' module, if it has already been imported.  (See
+    'unipipe.utils.arrays.get_numpy' for why it's not imported here.)
+    """
+    return sys.modules.get("pyarrow")
+
+
+def get_pandas() -> Optional[Any]:
+    return sys.modules.get("pandas")
+
+
+def is_arrow_table_type(_type: Any) -> bool:
+    pyarrow = get_pyarrow()
+    return pyarrow is not None and isclass(_type) and issubclass(_type, pyarrow.Table)
+
+
+def is_dataframe_type(_type: Any) -> bool:
+    pandas = get_pandas()
+    return pandas is not None and isclass(_type) and issubclass(_type, pandas.DataFrame)
+
+
+def is_table_type(_type: Any) -> bool:
+    return is_arrow_table_type(_type) or is_dataframe_type(_type)
+
+
+def is_table(value: Any) -> bool:
+    return is_table_type(type(value))
+
+
+def to_arrow(table: Any) -> Any:
+    """Converts a 'pandas.DataFrame' to a 'pyarrow.Table'.  Arrow tables are
+    returned as-is.
+    """
+    if is_dataframe_type(type(table)):
+        import pyarrow
+
+        return pyarrow.Table.from_pandas(table)
+    return table
+
+
+def cast_table(table: Any, _type: Any) -> Any:
+    """Converts between Arrow tables and DataFrames, depending on the annotated
+    type.  Tables that already have the right type are never copied.
+    """
+    if isinstance(table, _type):
+        return table
+    elif is_dataframe_type(_type):
+        return to_arrow(table).to_pandas()
+    return to_arrow(table)
+
+
+def write_table(table: Any, path: str) -> None:
+    import pyarrow
+
+    table = to_arrow(table)
+    with pyarrow.OSFile(path, "wb") as sink:
+        with pyarrow.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_table(path: str) -> Any:
+    """Reads a table from an Arrow IPC file.  The file is memory-mapped, so column
+    buffers are not copied into memory until they are actually read.
+    """
+    import pyarrow
+
+    with pyarrow.memory_map(path, "r") as source:
+        table = pyarrow.ipc.open_file(source).read_all()
+
+    key = id(table)
+    _TABLE_FILES[key] = (
+        weakref.ref(table, lambda _: _TABLE_FILES.pop(key, None)),
+        path,
+    )
+    return table
+
+
+def _get_table_file(table: Any) -> Optional[str]:
+    entry = _TABLE_FILES.get(id(table))
+    if entry is not None and entry[0]() is table:
+        return entry[1]
+    return None
+
+
+def is_memory_mapped_table(table: Any) -> bool:
+    """Whether 'table' was memory-mapped from an Arrow IPC file (see 'read_table')."""
+    return _get_table_file(table) is not None
+
+
+def encode_table(table: Any, directory: str) -> Dict[str, str]:
+    """Writes 'table' to an Arrow IPC file in 'directory', and returns a reference
+    to it.  Arrow tables that were read from 'directory' are not written again.
+    """
+    path = _get_table_file(table)
+    if path is not None and os.path.dirname(path) == os.path.realpath(directory):
+        name = os.path.basename(path)
+    else:
+        name = f"{uuid4().hex}.arrow"
+        write_table(table, os.path.join(directory, name))
+
+    _format = "pandas" if is_dataframe_type(type(table)) else "arrow"
+    return {TABLE_MARKER: name, TABLE_FORMAT: _format}
+
+
+def is_encoded_table(value: Dict) -> bool:
+    return set(value.keys()) == {TABLE_MARKER, TABLE_FORMAT}
+
+
+def decode_table(value: Dict[str, str], directory: str) -> Any:
+    table = read_table(os.path.join(os.path.realpath(directory), value[TABLE_MARKER]))
+    if value[TABLE_FORMAT] == "pandas":
+        return table.to_pandas()
+    return table
+
+
+def get_table_digest(table: Any) -> str:
+    """Content hash of a table, for caching component results."""
+    import pyarrow
+
+    table = to_arrow(table)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return hashlib.sha256(sink.getvalue()).hexdigest()
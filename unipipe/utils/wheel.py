@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import threading
+import zipfile
+from functools import lru_cache
+from typing import List, Tuple
+
+import unipipe
+from unipipe.utils.compat import get_package_version
+from unipipe.utils.files import atomic_write
+
+# Keep in sync with 'install_requires' in 'setup.py'.
+REQUIREMENTS = ["click", "pydantic", "typing_extensions"]
+WHEEL_TAG = "py3-none-any"
+
+_BUILD_LOCK = threading.Lock()
+
+
+def _get_source_files() -> List[Tuple[str, str]]:
+    """Returns (path, archive name) pairs for all Python files in the 'unipipe'
+    package.  Compiled files and caches are excluded.
+    """
+    package_dir = os.path.dirname(os.path.abspath(unipipe.__file__))
+    root = os.path.dirname(package_dir)
+    files = []
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                path = os.path.join(dirpath, filename)
+                arcname = os.path.relpath(path, root).replace(os.sep, "/")
+                files.append((path, arcname))
+    return files
+
+
+@lru_cache()
+def get_source_digest() -> str:
+    """Hash of the 'unipipe' source code, so that images are rebuilt whenever the
+    local copy of 'unipipe' changes (e.g. during development).
+    """
+    sha = hashlib.sha256()
+    for path, arcname in _get_source_files():
+        sha.update(arcname.encode("utf-8"))
+        with open(path, "rb") as f:
+            sha.update(hashlib.sha256(f.read()).digest())
+    return sha.hexdigest()
+
+
+def _record_hash(data: bytes) -> str:
+    digest = hashlib.sha256(data).digest()
+    return "sha256=" + base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def _get_version() -> str:
+    # Local version labels keep wheels for different source trees apart.
+    version = get_package_version("unipipe") or "0.0.0"
+    return f"{version.split('+')[0]}+{get_source_digest()[:12]}"
+
+
+def build_unipipe_wheel(output_dir: str) -> str:
+    """Builds a pure-Python wheel from the 'unipipe' package that is currently
+    imported, and returns its path.  Wheels are only built once for each version of
+    the source code.  This does not require 'setup.py', 'git' or a build backend,
+    so it also works when 'unipipe' was installed from a wheel.
+    """
+    version = _get_version()
+    dist_info = f"unipipe-{version}.dist-info"
+    path = os.path.join(output_dir, f"unipipe-{version}-{WHEEL_TAG}.whl")
+
+    with _BUILD_LOCK:
+        if os.path.exists(path):
+            return path
+
+        metadata = "\n".join(
+            [
+                "Metadata-Version: 2.1",
+                "Name: unipipe",
+                f"Version: {version}",
+                "Requires-Python: >=3.7",
+                *[f"Requires-Dist: {r}" for r in REQUIREMENTS],
+                "",
+            ]
+        )
+        wheel = "\n".join(
+            [
+                "Wheel-Version: 1.0",
+                "Generator: unipipe",
+                "Root-Is-Purelib: true",
+                f"Tag: {WHEEL_TAG}",
+                "",
+            ]
+        )
+        entry_points = "[console_scripts]\nunipipe = unipipe.cli:unipipe\n"
+
+        contents = []
+        for source_path, arcname in _get_source_files():
+            with open(source_path, "rb") as f:
+                contents.append((arcname, f.read()))
+        contents.append((f"{dist_info}/METADATA", metadata.encode("utf-8")))
+        contents.append((f"{dist_info}/WHEEL", wheel.encode("utf-8")))
+        contents.append((f"{dist_info}/entry_points.txt", entry_points.encode("utf-8")))
+
+        records = [
+            f"{name},{_record_hash(data)},{len(data)}" for name, data in contents
+        ]
+        records.append(f"{dist_info}/RECORD,,")
+        contents.append((f"{dist_info}/RECORD", "\n".join(records).encode("utf-8")))
+
+        # Concurrent processes never install a partially written wheel.
+        os.makedirs(output_dir, exist_ok=True)
+        with atomic_write(path) as f:
+            with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for name, data in contents:
+                    archive.writestr(name, data)
+
+    return path